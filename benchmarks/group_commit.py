@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from typer import Typer
+
+from core.product import Product
+from core.receipt import Receipt
+from core.unit import Unit
+from infra.constants import GROUP_COMMIT_BATCH_SIZE, MIGRATIONS_DIR, SQL_FILE
+from infra.sqlite.database_connect import Database
+from infra.sqlite.group_commit import GroupCommitter
+from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.profiles import PROFILES
+from infra.sqlite.receipts import ReceiptsDatabase
+from infra.sqlite.units import UnitsDatabase
+
+cli = Typer(add_completion=False)
+
+
+def add_products(
+    database_name: str,
+    profile: str,
+    window: float | None,
+    batch_size: int,
+    threads: int,
+    requests: int,
+) -> str:
+    db = Database(
+        database_name,
+        os.path.abspath(SQL_FILE),
+        os.path.abspath(MIGRATIONS_DIR),
+        threads,
+        PROFILES[profile],
+    )
+    db.initial()
+    committer = None
+    if window is not None:
+        committer = GroupCommitter(db.get_pool(), window, batch_size)
+    units = UnitsDatabase(db.get_pool(), committer)
+    products = ProductsDatabase(db.get_pool(), committer)
+    receipts = ReceiptsDatabase(db.get_pool(), committer)
+
+    unit = Unit("kg")
+    units.create(unit)
+    product = Product(unit.id, "Apple", "123", 1.5)
+    products.create(product)
+    receipt_ids = []
+    for _ in range(threads):
+        receipt = Receipt()
+        receipts.create(receipt)
+        receipt_ids.append(receipt.id)
+
+    def cashier(index: int) -> None:
+        for _ in range(requests // threads):
+            receipts.add_product(receipt_ids[index], product.id, 1)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(cashier, range(threads)))
+    elapsed = perf_counter() - start
+
+    line = f"{requests / elapsed:>12.1f}"
+    if committer is not None:
+        stats = committer.stats()
+        committer.close()
+        line += f" {stats.commits_per_second:>10.1f} {stats.mean_batch_size:>10.1f}"
+        line += f" {stats.largest_batch:>8}"
+    db.close_database()
+    return line
+
+
+@cli.command()
+def run(
+    windows: list[float] = [0.5, 1, 2, 5],
+    profile: str = "durable",
+    batch_size: int = GROUP_COMMIT_BATCH_SIZE,
+    threads: int = 16,
+    requests: int = 2_000,
+) -> None:
+    print(
+        f"{'window ms':>10} {'requests/s':>12} {'commits/s':>10}"
+        f" {'mean batch':>10} {'largest':>8}"
+    )
+    with TemporaryDirectory() as directory:
+        for index, window in enumerate([None, *windows]):
+            database_name = os.path.join(directory, f"pos-{index}.db")
+            line = add_products(
+                database_name,
+                profile,
+                None if window is None else window / 1000,
+                batch_size,
+                threads,
+                requests,
+            )
+            label = "off" if window is None else f"{window:g}"
+            print(f"{label:>10} {line}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,91 @@
+import gc
+import tracemalloc
+from dataclasses import MISSING, Field, field, fields, make_dataclass
+from typing import Any, Callable
+from uuid import uuid4
+
+from typer import Typer
+
+from core.product import Product
+from core.receipt import ProductInReceipt, Receipt
+from core.unit import Unit
+from infra.in_memory.columnar import ColumnarProductsInMemory
+from infra.in_memory.products import ProductsInMemory
+from infra.in_memory.units import UnitsInMemory
+
+cli = Typer(add_completion=False)
+
+
+def copy_field(original: Field[Any]) -> Any:
+    if original.default_factory is not MISSING:
+        return field(default_factory=original.default_factory)
+    return field(default=original.default)
+
+
+def unslotted(cls: type) -> Callable[..., Any]:
+    return make_dataclass(
+        f"Unslotted{cls.__name__}",
+        [(f.name, f.type, copy_field(f)) for f in fields(cls)],
+    )
+
+
+def allocated(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def products_in_memory(product: Callable[..., Any], n: int) -> ProductsInMemory:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+    products = ProductsInMemory(units)
+    products.create_many(
+        [product(unit.id, "Apple", str(barcode), 1.5) for barcode in range(n)]
+    )
+    return products
+
+
+def columnar_products(n: int) -> ColumnarProductsInMemory:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+    products = ColumnarProductsInMemory(units)
+    products.create_many(
+        [Product(unit.id, "Apple", str(barcode), 1.5) for barcode in range(n)]
+    )
+    return products
+
+
+def receipt_lines(line: Callable[..., Any], n: int) -> Receipt:
+    product_id = uuid4()
+    return Receipt(products=[line(product_id, 1, 1.5, 1.5) for _ in range(n)])
+
+
+@cli.command()
+def run(products: int = 1_000_000, lines: int = 1_000_000) -> None:
+    print(f"{'object':>28} {'dict bytes':>12} {'slotted bytes':>14}")
+    product_bytes = [
+        allocated(lambda: products_in_memory(cls, products)) / products
+        for cls in [unslotted(Product), Product]
+    ]
+    print(
+        f"{'ProductsInMemory per product':>28}"
+        f" {product_bytes[0]:>12.1f} {product_bytes[1]:>14.1f}"
+    )
+    columnar_bytes = allocated(lambda: columnar_products(products)) / products
+    print(f"{'columnar per product':>28} {'':>12} {columnar_bytes:>14.1f}")
+    line_bytes = [
+        allocated(lambda: receipt_lines(cls, lines)) / lines
+        for cls in [unslotted(ProductInReceipt), ProductInReceipt]
+    ]
+    print(f"{'receipt line':>28} {line_bytes[0]:>12.1f} {line_bytes[1]:>14.1f}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from starlette.types import Message, Receive, Scope, Send
+from typer import Typer
+
+from benchmarks.timing import best_of
+from core.unit import Unit
+from infra.fastapi.metrics import MetricsMiddleware
+from infra.in_memory.units import UnitsInMemory
+from infra.metrics import Metrics, instrument
+from runner.setup import init_app
+
+cli = Typer(add_completion=False)
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> Message:
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+async def call_asgi(app: Any, calls: int) -> None:
+    scope = {"type": "http", "method": "GET", "path": f"/units/{uuid4()}"}
+    for _ in range(calls):
+        await app(scope, receive, send)
+
+
+def bare_app() -> FastAPI:
+    app = init_app()
+    app.user_middleware.clear()
+    app.state.units.units = app.state.units.units.repository
+    app.state.products.products = app.state.products.products.repository
+    app.state.receipts.receipts = app.state.receipts.receipts.repository
+    return app
+
+
+async def call_routes(app: FastAPI, calls: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://pos") as client:
+        response = await client.post("/units", json={"name": "kg"})
+        url = f"/units/{response.json()['unit']['id']}"
+        for _ in range(calls):
+            (await client.get(url)).raise_for_status()
+
+
+def per_call(seconds: float, calls: int) -> float:
+    return seconds / calls * 1e6
+
+
+@cli.command()
+def run(calls: int = 100_000, requests: int = 5_000, repeat: int = 5) -> None:
+    middleware = MetricsMiddleware(endpoint, Metrics(), init_app().openapi)
+    bare = best_of(lambda: asyncio.run(call_asgi(endpoint, calls)), repeat)
+    measured = best_of(lambda: asyncio.run(call_asgi(middleware, calls)), repeat)
+    print(f"middleware overhead:     {per_call(measured - bare, calls):>8.2f} us")
+
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+    instrumented = instrument(units, "UnitRepository", Metrics())
+    bare = best_of(lambda: [units.read(unit.id) for _ in range(calls)], repeat)
+    measured = best_of(
+        lambda: [instrumented.read(unit.id) for _ in range(calls)], repeat
+    )
+    print(f"repository call timing:  {per_call(measured - bare, calls):>8.2f} us")
+
+    bare = best_of(lambda: asyncio.run(call_routes(bare_app(), requests)), repeat)
+    measured = best_of(lambda: asyncio.run(call_routes(init_app(), requests)), repeat)
+    print(
+        f"GET /units/{{id}} total:   {per_call(measured - bare, requests):>8.2f} us"
+        f" ({per_call(bare, requests):.1f} -> {per_call(measured, requests):.1f} us)"
+    )
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,61 @@
+import os
+from contextlib import contextmanager
+from tempfile import TemporaryDirectory
+from typing import Iterator
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from typer import Typer
+
+from benchmarks.timing import best_of
+from infra.sqlite.profiles import PROFILES
+from runner.setup import init_app
+
+cli = Typer(add_completion=False)
+
+
+@contextmanager
+def sqlite_client(database_name: str, profile: str) -> Iterator[TestClient]:
+    with patch.dict(
+        os.environ,
+        {
+            "POS_REPOSITORY_KIND": "sqlite",
+            "POS_DATABASE_NAME": database_name,
+            "POS_SQLITE_PROFILE": profile,
+        },
+    ):
+        yield TestClient(init_app())
+
+
+def add_products(client: TestClient, n_requests: int, lines: int) -> None:
+    unit = client.post("/units", json={"name": os.urandom(8).hex()}).json()
+    product = client.post(
+        "/products",
+        json={
+            "unit_id": unit["unit"]["id"],
+            "name": "Apple",
+            "barcode": os.urandom(8).hex(),
+            "price": 1.5,
+        },
+    ).json()
+    line = {"id": product["product"]["id"], "quantity": 1}
+    url = ""
+    for index in range(n_requests):
+        if index % lines == 0:
+            receipt = client.post("/receipts").json()
+            url = f"/receipts/{receipt['receipt']['id']}/products"
+        client.post(url, json=line).raise_for_status()
+
+
+@cli.command()
+def run(requests: int = 500, repeat: int = 3, lines: int = 10) -> None:
+    print(f"{'profile':>10} {'requests/s':>12}")
+    for profile in PROFILES:
+        with TemporaryDirectory() as directory:
+            with sqlite_client(os.path.join(directory, "pos.db"), profile) as client:
+                elapsed = best_of(lambda: add_products(client, requests, lines), repeat)
+        print(f"{profile:>10} {requests / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,100 @@
+import os
+from sqlite3 import Connection
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+from typer import Typer
+
+from benchmarks.timing import best_of
+from core.receipt import Sales
+from infra.constants import MIGRATIONS_DIR, SQL_FILE
+from infra.sqlite.database_connect import Database
+from infra.sqlite.receipts import ReceiptsDatabase
+
+LINES_PER_RECEIPT = 10
+N_PRODUCTS = 1000
+
+cli = Typer(add_completion=False)
+
+
+def seed(con: Connection, n_lines: int) -> None:
+    unit_id = str(uuid4())
+    product_ids = [str(uuid4()) for _ in range(N_PRODUCTS)]
+    receipt_ids = [str(uuid4()) for _ in range(n_lines // LINES_PER_RECEIPT)]
+
+    con.execute("insert into units(id, name) values (?,?)", (unit_id, "kg"))
+    con.executemany(
+        "insert into products(id, unit_id, name, barcode, price) values (?,?,?,?,?)",
+        [(id, unit_id, id, id, 1.5) for id in product_ids],
+    )
+    con.executemany(
+        "insert into receipts(id, status) values (?,?)",
+        [(id, "closed") for id in receipt_ids],
+    )
+    con.executemany(
+        "insert into products_in_receipts"
+        "(receipt_id, product_id, quantity, price, total) values (?,?,?,?,?)",
+        [
+            (
+                receipt_ids[i // LINES_PER_RECEIPT],
+                product_ids[i % N_PRODUCTS],
+                2,
+                1.5,
+                3.0,
+            )
+            for i in range(len(receipt_ids) * LINES_PER_RECEIPT)
+        ],
+    )
+    con.commit()
+
+
+def read_sales_per_receipt(con: Connection) -> Sales:
+    n_receipts = 0
+    revenue = 0.0
+    for (receipt_id,) in con.execute(
+        "select id from receipts where status = 'closed'"
+    ).fetchall():
+        n_receipts += 1
+        for product_id, quantity in con.execute(
+            "select product_id, quantity from products_in_receipts"
+            " where receipt_id = ?",
+            [receipt_id],
+        ).fetchall():
+            (price,) = con.execute(
+                "select price from products where id = ?", [product_id]
+            ).fetchone()
+            revenue += price * quantity
+    return Sales(n_receipts, revenue)
+
+
+@cli.command()
+def run(
+    sizes: list[int] = [10_000, 100_000, 1_000_000],
+    repeat: int = 3,
+    per_receipt_limit: int = 100_000,
+) -> None:
+    print(f"{'lines':>10} {'per receipt (s)':>16} {'aggregate (s)':>14} {'speedup':>8}")
+    for n_lines in sizes:
+        with TemporaryDirectory() as directory:
+            db = Database(
+                os.path.join(directory, "sales.db"),
+                os.path.abspath(SQL_FILE),
+                os.path.abspath(MIGRATIONS_DIR),
+            )
+            db.initial()
+            with db.get_pool().connection() as con:
+                seed(con, n_lines)
+            receipts = ReceiptsDatabase(db.get_pool())
+
+            new = best_of(receipts.read_sales, repeat)
+            if n_lines > per_receipt_limit:
+                print(f"{n_lines:>10} {'skipped':>16} {new:>14.4f} {'-':>8}")
+            else:
+                with db.get_pool().connection() as con:
+                    old = best_of(lambda: read_sales_per_receipt(con), repeat)
+                print(f"{n_lines:>10} {old:>16.4f} {new:>14.4f} {old / new:>7.1f}x")
+            db.close_database()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,156 @@
+import json
+from typing import Any, Callable
+from uuid import uuid4
+
+from pydantic import BaseModel, TypeAdapter
+from typer import Typer
+
+from benchmarks.timing import best_of
+from core.errors import AlreadyExistError
+from core.product import Product
+from core.receipt import ProductInReceipt, Receipt, Sales
+from core.unit import Unit
+from infra.fastapi.products import (
+    ProductBatchEnvelope,
+    ProductItemEnvelope,
+    ProductListEnvelope,
+    batch_result,
+)
+from infra.fastapi.receipts import ReceiptItemEnvelope
+from infra.fastapi.sales import SalesItemEnvelope
+from infra.fastapi.serialization import (
+    ProductBatch,
+    ProductPage,
+    UnitPage,
+    product_batch,
+    product_envelope,
+    product_page,
+    receipt_envelope,
+    sales_envelope,
+    unit_envelope,
+    unit_page,
+)
+from infra.fastapi.units import UnitItemEnvelope, UnitListEnvelope
+
+cli = Typer(add_completion=False)
+
+
+def validated(model: type[BaseModel], content: Any) -> Callable[[], bytes]:
+    adapter = TypeAdapter(model)
+    return lambda: adapter.dump_json(
+        adapter.validate_python(content, from_attributes=True)
+    )
+
+
+def endpoints(page_size: int, receipt_lines: int) -> dict[str, tuple[Any, ...]]:
+    unit = Unit("kg")
+    products = [
+        Product(unit.id, "Apple", str(barcode), 1.5) for barcode in range(page_size)
+    ]
+    units = [Unit(str(name)) for name in range(page_size)]
+    receipt = Receipt(
+        total=1.5 * receipt_lines,
+        products=[ProductInReceipt(uuid4(), 1, 1.5, 1.5)] * receipt_lines,
+    )
+    empty = Receipt()
+    conflict = AlreadyExistError("Product", "barcode", "0")
+    batch = ProductBatch(
+        [
+            batch_result(product, conflict if i % 2 else None)
+            for i, product in enumerate(products)
+        ]
+    )
+    sales = Sales(page_size, 1.5 * page_size)
+    return {
+        "POST /units": (
+            UnitItemEnvelope,
+            {"unit": unit},
+            unit_envelope,
+            {"unit": unit},
+        ),
+        "GET /units/{id}": (
+            UnitItemEnvelope,
+            {"unit": unit},
+            unit_envelope,
+            {"unit": unit},
+        ),
+        "GET /units": (
+            UnitListEnvelope,
+            {"units": units, "next": None},
+            unit_page,
+            UnitPage(units),
+        ),
+        "POST /products": (
+            ProductItemEnvelope,
+            {"product": products[0]},
+            product_envelope,
+            {"product": products[0]},
+        ),
+        "POST /products/batch": (ProductBatchEnvelope, batch, product_batch, batch),
+        "GET /products": (
+            ProductListEnvelope,
+            {"products": products, "next": None},
+            product_page,
+            ProductPage(products),
+        ),
+        "GET /products/{id}": (
+            ProductItemEnvelope,
+            {"product": products[0]},
+            product_envelope,
+            {"product": products[0]},
+        ),
+        "POST /receipts": (
+            ReceiptItemEnvelope,
+            {"receipt": empty},
+            receipt_envelope,
+            {"receipt": empty},
+        ),
+        "POST /receipts/{id}/products": (
+            ReceiptItemEnvelope,
+            {"receipt": receipt},
+            receipt_envelope,
+            {"receipt": receipt},
+        ),
+        "POST /receipts/{id}/products/batch": (
+            ReceiptItemEnvelope,
+            {"receipt": receipt},
+            receipt_envelope,
+            {"receipt": receipt},
+        ),
+        "GET /receipts/{id}": (
+            ReceiptItemEnvelope,
+            {"receipt": receipt},
+            receipt_envelope,
+            {"receipt": receipt},
+        ),
+        "GET /sales": (
+            SalesItemEnvelope,
+            {"sales": sales},
+            sales_envelope,
+            {"sales": sales},
+        ),
+    }
+
+
+@cli.command()
+def run(
+    page_size: int = 100, receipt_lines: int = 20, calls: int = 2000, repeat: int = 5
+) -> None:
+    print(f"{'endpoint':>36} {'validated us':>14} {'direct us':>12} {'speedup':>9}")
+    for name, (model, content, adapter, fast_content) in endpoints(
+        page_size, receipt_lines
+    ).items():
+        slow = validated(model, content)
+        fast: Callable[[], bytes] = lambda: adapter.dump_json(fast_content)
+        assert json.loads(slow()) == json.loads(fast())
+
+        slow_time = best_of(lambda: [slow() for _ in range(calls)], repeat) / calls
+        fast_time = best_of(lambda: [fast() for _ in range(calls)], repeat) / calls
+        print(
+            f"{name:>36} {slow_time * 1e6:>14.1f} {fast_time * 1e6:>12.1f}"
+            f" {slow_time / fast_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    cli()
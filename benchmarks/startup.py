@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from typer import Typer
+
+from core.product import Product
+from core.receipt import ProductInReceipt, Receipt
+from core.unit import Unit
+from infra.constants import SNAPSHOT_INTERVAL
+from infra.in_memory.persistence import SNAPSHOT_FILE, MemoryStore, journaled
+from infra.in_memory.products import ProductsInMemory
+from infra.in_memory.receipts import ReceiptsInMemory
+from infra.in_memory.units import UnitsInMemory
+
+cli = Typer(add_completion=False)
+
+
+def open_store(directory: str, snapshot_every: int) -> MemoryStore:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    return MemoryStore(
+        directory, units, products, ReceiptsInMemory(products), snapshot_every
+    )
+
+
+def fill(store: MemoryStore, n_products: int, n_receipts: int, lines: int) -> None:
+    rng = Random(0)
+    unit = Unit("kg")
+    store.units.create(unit)
+    products = [
+        Product(unit.id, f"product-{i}", f"{i:013d}", 1 + i % 100)
+        for i in range(n_products)
+    ]
+    store.products.create_many(products)
+    for _ in range(n_receipts):
+        receipt = Receipt("closed" if rng.random() < 0.9 else "open")
+        for product in rng.choices(products, k=rng.randint(1, 2 * lines - 1)):
+            quantity = rng.randint(1, 5)
+            total = product.price * quantity
+            receipt.products.append(
+                ProductInReceipt(product.id, quantity, product.price, total)
+            )
+            receipt.total += total
+        store.receipts.create(receipt)
+
+
+def append_tail(store: MemoryStore, n_operations: int) -> float:
+    receipts = journaled(store.receipts, "receipts", store)
+    product_id = next(store.products.iterate()).id
+    receipt = Receipt()
+    worst = 0.0
+    for index in range(n_operations):
+        start = perf_counter()
+        if index % 10 == 0:
+            receipt = Receipt()
+            receipts.create(receipt)
+        else:
+            receipts.add_product(receipt.id, product_id, 1)
+        worst = max(worst, perf_counter() - start)
+    return worst
+
+
+@cli.command()
+def run(
+    receipts: int = 1_000_000,
+    products: int = 10_000,
+    lines: int = 3,
+    tail: int = 100_000,
+) -> None:
+    with TemporaryDirectory() as directory:
+        store = open_store(directory, tail // 2)
+        store.load()
+        fill(store, products, receipts, lines)
+
+        start = perf_counter()
+        store.snapshot()
+        size = os.path.getsize(os.path.join(directory, SNAPSHOT_FILE))
+        print(
+            f"snapshot of {receipts} receipts: {perf_counter() - start:.2f}s,"
+            f" {size / 1e6:.1f} MB"
+        )
+
+        start = perf_counter()
+        worst = append_tail(store, tail)
+        elapsed = perf_counter() - start
+        print(
+            f"journal append: {elapsed / tail * 1e6:.1f} us per operation,"
+            f" worst {worst * 1e3:.1f} ms with a background snapshot"
+        )
+        store.close()
+
+        del store
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "restart", directory],
+            check=True,
+        )
+
+
+@cli.command()
+def restart(directory: str) -> None:
+    start = perf_counter()
+    store = open_store(directory, SNAPSHOT_INTERVAL)
+    store.load()
+    elapsed = perf_counter() - start
+    print(
+        f"startup with {store.pending} journaled operations: {elapsed:.2f}s"
+        f" ({len(store.receipts.receipts)} receipts)"
+    )
+    store.close()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,389 @@
+import json
+import os
+import platform
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Iterable, Iterator
+from unittest.mock import patch
+
+import typer
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from typer import Typer
+
+from benchmarks.timing import Summary, measure
+from core.product import Product, ProductRepository
+from core.receipt import Receipt, ReceiptRepository
+from core.unit import Unit, UnitRepository
+from infra.constants import MIGRATIONS_DIR, SQL_FILE
+from infra.in_memory.products import ProductsInMemory
+from infra.in_memory.receipts import ReceiptsInMemory
+from infra.in_memory.units import UnitsInMemory
+from infra.sqlite.database_connect import Database
+from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.receipts import ReceiptsDatabase
+from infra.sqlite.units import UnitsDatabase
+from runner.setup import init_app
+
+BACKENDS = ["memory", "sqlite"]
+LAYERS = ["repository", "route"]
+LINES_PER_RECEIPT = 10
+PAGE_SIZE = 100
+BATCH_SIZE = 100
+
+Operation = Callable[[int], object]
+
+cli = Typer(add_completion=False)
+
+
+@dataclass
+class Repositories:
+    units: UnitRepository
+    products: ProductRepository
+    receipts: ReceiptRepository
+
+
+@dataclass
+class Seeded:
+    units: list[Unit]
+    products: list[Product]
+    receipts: list[Receipt]
+    to_close: list[Receipt]
+    to_delete: list[Receipt]
+
+
+@dataclass
+class Result:
+    name: str
+    backend: str
+    size: int
+    layer: str
+    operation: str
+    summary: Summary
+
+
+def database(directory: str) -> Database:
+    db = Database(
+        os.path.join(directory, "pos.db"),
+        os.path.abspath(SQL_FILE),
+        os.path.abspath(MIGRATIONS_DIR),
+    )
+    db.initial()
+    return db
+
+
+@contextmanager
+def repositories(backend: str) -> Iterator[Repositories]:
+    if backend == "sqlite":
+        with TemporaryDirectory() as directory:
+            db = database(directory)
+            pool = db.get_pool()
+            yield Repositories(
+                UnitsDatabase(pool), ProductsDatabase(pool), ReceiptsDatabase(pool)
+            )
+            db.close_database()
+    else:
+        units = UnitsInMemory()
+        products = ProductsInMemory(units)
+        yield Repositories(units, products, ReceiptsInMemory(products))
+
+
+@contextmanager
+def application(backend: str) -> Iterator[FastAPI]:
+    with TemporaryDirectory() as directory:
+        with patch.dict(
+            os.environ,
+            {
+                "POS_REPOSITORY_KIND": backend,
+                "POS_DATABASE_NAME": os.path.join(directory, "pos.db"),
+            },
+        ):
+            yield init_app()
+
+
+def repositories_of(app: FastAPI) -> Repositories:
+    return Repositories(
+        app.state.units.units, app.state.products.products, app.state.receipts.receipts
+    )
+
+
+def drain(items: Iterable[object]) -> None:
+    deque(items, maxlen=0)
+
+
+def seed(repositories: Repositories, size: int, spare: int) -> Seeded:
+    units = [Unit(f"unit-{i}") for i in range(max(size // PAGE_SIZE, 1))]
+    for unit in units:
+        repositories.units.create(unit)
+
+    products = [
+        Product(units[0].id, f"product-{i}", f"barcode-{i}", 1.5) for i in range(size)
+    ]
+    repositories.products.create_many(products)
+
+    receipts = [Receipt() for _ in range(max(size // LINES_PER_RECEIPT, 1))]
+    for i, receipt in enumerate(receipts):
+        repositories.receipts.create(receipt)
+        first = i * LINES_PER_RECEIPT
+        repositories.receipts.add_products(
+            receipt.id,
+            [
+                (products[line % size].id, 1)
+                for line in range(first, first + LINES_PER_RECEIPT)
+            ],
+        )
+
+    to_close = [Receipt() for _ in range(spare)]
+    to_delete = [Receipt() for _ in range(spare)]
+    for receipt in to_close + to_delete:
+        repositories.receipts.create(receipt)
+    return Seeded(units, products, receipts, to_close, to_delete)
+
+
+def repository_operations(
+    repositories: Repositories, seeded: Seeded
+) -> dict[str, Operation]:
+    units, products, receipts = (
+        repositories.units,
+        repositories.products,
+        repositories.receipts,
+    )
+    unit_id = seeded.units[0].id
+    middle = seeded.products[len(seeded.products) // 2].id
+
+    def unit(i: int) -> Unit:
+        return seeded.units[i % len(seeded.units)]
+
+    def product(i: int) -> Product:
+        return seeded.products[i % len(seeded.products)]
+
+    def receipt(i: int) -> Receipt:
+        return seeded.receipts[i % len(seeded.receipts)]
+
+    return {
+        "units.create": lambda i: units.create(Unit(f"new-unit-{i}")),
+        "units.read": lambda i: units.read(unit(i).id),
+        "units.read_by_name": lambda i: units.read_by_name(unit(i).name),
+        "units.read_all": lambda i: units.read_all(),
+        "units.read_page": lambda i: units.read_page(PAGE_SIZE),
+        "units.version": lambda i: units.version(),
+        "products.create": lambda i: products.create(
+            Product(unit_id, "new", f"new-{i}", 1.5)
+        ),
+        "products.create_many": lambda i: products.create_many(
+            [Product(unit_id, "new", f"batch-{i}-{j}", 1.5) for j in range(BATCH_SIZE)]
+        ),
+        "products.read": lambda i: products.read(product(i).id),
+        "products.read_by_barcode": lambda i: products.read_by_barcode(
+            product(i).barcode
+        ),
+        "products.read_all": lambda i: products.read_all(),
+        "products.read_page": lambda i: products.read_page(PAGE_SIZE, middle),
+        "products.iterate": lambda i: drain(products.iterate()),
+        "products.update_price": lambda i: products.update_price(
+            product(i).id, 1 + i % 100
+        ),
+        "products.version": lambda i: products.version(),
+        "receipts.create": lambda i: receipts.create(Receipt()),
+        "receipts.add_product": lambda i: receipts.add_product(
+            receipt(i).id, product(i).id, 1
+        ),
+        "receipts.add_products": lambda i: receipts.add_products(
+            receipt(i).id, [(product(i + j).id, 1) for j in range(LINES_PER_RECEIPT)]
+        ),
+        "receipts.read": lambda i: receipts.read(receipt(i).id),
+        "receipts.iterate": lambda i: drain(receipts.iterate()),
+        "receipts.update_status": lambda i: receipts.update_status(
+            seeded.to_close[i].id, "closed"
+        ),
+        "receipts.delete": lambda i: receipts.delete(seeded.to_delete[i].id),
+        "receipts.read_sales": lambda i: receipts.read_sales(),
+    }
+
+
+def route_operations(client: TestClient, seeded: Seeded) -> dict[str, Operation]:
+    unit_id = str(seeded.units[0].id)
+    middle = seeded.products[len(seeded.products) // 2].id
+
+    def unit(i: int) -> Unit:
+        return seeded.units[i % len(seeded.units)]
+
+    def product(i: int) -> Product:
+        return seeded.products[i % len(seeded.products)]
+
+    def receipt(i: int) -> Receipt:
+        return seeded.receipts[i % len(seeded.receipts)]
+
+    def new_product(barcode: str) -> dict[str, Any]:
+        return {"unit_id": unit_id, "name": "new", "barcode": barcode, "price": 1.5}
+
+    return {
+        "POST /units": lambda i: client.post(
+            "/units", json={"name": f"new-unit-{i}"}
+        ).raise_for_status(),
+        "GET /units/{id}": lambda i: client.get(
+            f"/units/{unit(i).id}"
+        ).raise_for_status(),
+        "GET /units?name=": lambda i: client.get(
+            "/units", params={"name": unit(i).name}
+        ).raise_for_status(),
+        "GET /units": lambda i: client.get(
+            "/units", params={"limit": PAGE_SIZE}
+        ).raise_for_status(),
+        "POST /products": lambda i: client.post(
+            "/products", json=new_product(f"new-{i}")
+        ).raise_for_status(),
+        "POST /products/batch": lambda i: client.post(
+            "/products/batch",
+            json={
+                "products": [new_product(f"batch-{i}-{j}") for j in range(BATCH_SIZE)]
+            },
+        ).raise_for_status(),
+        "GET /products/{id}": lambda i: client.get(
+            f"/products/{product(i).id}"
+        ).raise_for_status(),
+        "GET /products?barcode=": lambda i: client.get(
+            "/products", params={"barcode": product(i).barcode}
+        ).raise_for_status(),
+        "GET /products": lambda i: client.get(
+            "/products", params={"limit": PAGE_SIZE, "after": str(middle)}
+        ).raise_for_status(),
+        "PATCH /products/{id}/{price}": lambda i: client.patch(
+            f"/products/{product(i).id}/{1 + i % 100}"
+        ).raise_for_status(),
+        "POST /receipts": lambda i: client.post("/receipts").raise_for_status(),
+        "POST /receipts/{id}/products": lambda i: client.post(
+            f"/receipts/{receipt(i).id}/products",
+            json={"id": str(product(i).id), "quantity": 1},
+        ).raise_for_status(),
+        "POST /receipts/{id}/products/batch": lambda i: client.post(
+            f"/receipts/{receipt(i).id}/products/batch",
+            json={"products": [{"id": str(product(i).id), "quantity": 1}]},
+        ).raise_for_status(),
+        "GET /receipts/{id}": lambda i: client.get(
+            f"/receipts/{receipt(i).id}"
+        ).raise_for_status(),
+        "PATCH /receipts/{id}": lambda i: client.patch(
+            f"/receipts/{seeded.to_close[i].id}", json={"status": "closed"}
+        ).raise_for_status(),
+        "DELETE /receipts/{id}": lambda i: client.delete(
+            f"/receipts/{seeded.to_delete[i].id}"
+        ).raise_for_status(),
+        "GET /sales": lambda i: client.get("/sales").raise_for_status(),
+        "GET /export/products.ndjson": lambda i: client.get(
+            "/export/products.ndjson"
+        ).raise_for_status(),
+        "GET /export/receipts.ndjson": lambda i: client.get(
+            "/export/receipts.ndjson"
+        ).raise_for_status(),
+        "GET /metrics": lambda i: client.get("/metrics").raise_for_status(),
+    }
+
+
+def run_operations(
+    backend: str,
+    size: int,
+    layer: str,
+    operations: dict[str, Operation],
+    calls: int,
+    warmup: int,
+) -> Iterator[Result]:
+    for operation, run in operations.items():
+        summary = measure(run, calls, warmup)
+        name = f"{backend}/{size}/{layer}/{operation}"
+        print(
+            f"{name:<52} {summary.ops_per_second:>12.1f}"
+            f" {summary.p50 * 1e6:>10.1f} {summary.p95 * 1e6:>10.1f}"
+            f" {summary.p99 * 1e6:>10.1f}"
+        )
+        yield Result(name, backend, size, layer, operation, summary)
+
+
+def run_backend(
+    backend: str, size: int, layers: list[str], calls: int, warmup: int
+) -> Iterator[Result]:
+    spare = calls + warmup
+    if "repository" in layers:
+        with repositories(backend) as repos:
+            seeded = seed(repos, size, spare)
+            operations = repository_operations(repos, seeded)
+            yield from run_operations(
+                backend, size, "repository", operations, calls, warmup
+            )
+    if "route" in layers:
+        with application(backend) as app:
+            seeded = seed(repositories_of(app), size, spare)
+            with TestClient(app) as client:
+                operations = route_operations(client, seeded)
+                yield from run_operations(
+                    backend, size, "route", operations, calls, warmup
+                )
+
+
+@cli.command()
+def run(
+    sizes: list[int] = [1_000, 10_000],
+    backends: list[str] = BACKENDS,
+    layers: list[str] = LAYERS,
+    calls: int = 500,
+    warmup: int = 20,
+    output: str = "benchmark.json",
+) -> None:
+    print(
+        f"{'benchmark':<52} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}"
+    )
+    results = [
+        asdict(result)
+        for size in sizes
+        for backend in backends
+        for result in run_backend(backend, size, layers, calls, warmup)
+    ]
+    with open(output, "w") as file:
+        json.dump(
+            {
+                "created": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "calls": calls,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"wrote {len(results)} results to {output}")
+
+
+def load_results(path: str) -> dict[str, Summary]:
+    with open(path) as file:
+        report = json.load(file)
+    return {
+        result["name"]: Summary(**result["summary"]) for result in report["results"]
+    }
+
+
+@cli.command()
+def compare(baseline: str, candidate: str, threshold: float = 0.10) -> None:
+    before = load_results(baseline)
+    after = load_results(candidate)
+    regressions = 0
+    print(f"{'benchmark':<52} {'ops/s':>9} {'p95':>9}")
+    for name in sorted(before.keys() & after.keys()):
+        throughput = after[name].ops_per_second / before[name].ops_per_second - 1
+        tail = after[name].p95 / before[name].p95 - 1
+        regressed = throughput < -threshold or tail > threshold
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<52} {throughput:>+9.1%} {tail:>+9.1%}{flag}")
+
+    for name in sorted(before.keys() - after.keys()):
+        print(f"{name:<52} missing from {candidate}")
+    print(f"{regressions} regression(s) beyond {threshold:.0%}")
+    if regressions:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    cli()
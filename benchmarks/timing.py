@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from math import ceil
+from time import perf_counter
+from typing import Callable
+
+
+def best_of(operation: Callable[[], object], repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        operation()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+@dataclass
+class Summary:
+    calls: int
+    ops_per_second: float
+    p50: float
+    p95: float
+    p99: float
+
+
+def percentile(timings: list[float], fraction: float) -> float:
+    ordered = sorted(timings)
+    rank = max(ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def measure(operation: Callable[[int], object], calls: int, warmup: int) -> Summary:
+    for i in range(warmup):
+        operation(i)
+
+    timings = []
+    for i in range(warmup, warmup + calls):
+        start = perf_counter()
+        operation(i)
+        timings.append(perf_counter() - start)
+    return Summary(
+        calls,
+        calls / sum(timings),
+        percentile(timings, 0.50),
+        percentile(timings, 0.95),
+        percentile(timings, 0.99),
+    )
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import httpx
+from typer import Typer
+
+cli = Typer(add_completion=False)
+
+STARTUP_TIMEOUT = 30.0
+
+
+def start_server(
+    port: int, workers: int, database_name: str, profile: str
+) -> subprocess.Popen[bytes]:
+    env = dict(
+        os.environ,
+        POS_REPOSITORY_KIND="sqlite",
+        POS_DATABASE_NAME=database_name,
+        POS_SQLITE_PROFILE=profile,
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "runner",
+            "run",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(base_url: str) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/metrics").raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise TimeoutError(f"server at {base_url} did not start")
+
+
+def seed_product(base_url: str) -> str:
+    with httpx.Client(base_url=base_url) as client:
+        unit = client.post("/units", json={"name": os.urandom(8).hex()})
+        unit.raise_for_status()
+        product = client.post(
+            "/products",
+            json={
+                "unit_id": unit.json()["unit"]["id"],
+                "name": "Apple",
+                "barcode": os.urandom(8).hex(),
+                "price": 1.5,
+            },
+        )
+        product.raise_for_status()
+        return str(product.json()["product"]["id"])
+
+
+async def cashier(
+    client: httpx.AsyncClient, product_id: str, lines: int, deadline: float
+) -> int:
+    line = {"id": product_id, "quantity": 1}
+    added = 0
+    while perf_counter() < deadline:
+        receipt = await client.post("/receipts")
+        receipt.raise_for_status()
+        url = f"/receipts/{receipt.json()['receipt']['id']}/products"
+        for _ in range(lines):
+            (await client.post(url, json=line)).raise_for_status()
+            added += 1
+    return added
+
+
+async def drive(
+    base_url: str, product_id: str, concurrency: int, lines: int, duration: float
+) -> int:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        deadline = perf_counter() + duration
+        added = await asyncio.gather(
+            *(cashier(client, product_id, lines, deadline) for _ in range(concurrency))
+        )
+    return sum(added)
+
+
+def drive_process(
+    base_url: str, product_id: str, concurrency: int, lines: int, duration: float
+) -> int:
+    return asyncio.run(drive(base_url, product_id, concurrency, lines, duration))
+
+
+def measure(
+    workers: int,
+    port: int,
+    profile: str,
+    clients: int,
+    concurrency: int,
+    lines: int,
+    duration: float,
+) -> float:
+    base_url = f"http://127.0.0.1:{port}"
+    with TemporaryDirectory() as directory:
+        server = start_server(port, workers, os.path.join(directory, "pos.db"), profile)
+        try:
+            wait_until_ready(base_url)
+            product_id = seed_product(base_url)
+            with ProcessPoolExecutor(clients) as pool:
+                futures = [
+                    pool.submit(
+                        drive_process,
+                        base_url,
+                        product_id,
+                        concurrency,
+                        lines,
+                        duration,
+                    )
+                    for _ in range(clients)
+                ]
+                return sum(future.result() for future in futures) / duration
+        finally:
+            server.terminate()
+            server.wait()
+
+
+@cli.command()
+def run(
+    workers: list[int] = [1, 2, 4, 8],
+    port: int = 8765,
+    profile: str = "balanced",
+    clients: int = 4,
+    concurrency: int = 16,
+    lines: int = 20,
+    duration: float = 10.0,
+) -> None:
+    print(f"cpus: {os.cpu_count()}, client processes: {clients} x {concurrency}")
+    print(f"{'workers':>8} {'requests/s':>12} {'speedup':>8}")
+    baseline = None
+    for n in workers:
+        throughput = measure(n, port, profile, clients, concurrency, lines, duration)
+        baseline = baseline or throughput
+        print(f"{n:>8} {throughput:>12.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    cli()
@@ -18,15 +18,13 @@ class AlreadyExistError(Exception):
     field: str
     value: str
 
+    def message(self) -> str:
+        return f"{self.name} with {self.field}<{self.value}> already exists."
+
     def get_error_json_response(self, code: int = 409) -> JSONResponse:
         return JSONResponse(
             status_code=code,
-            content={
-                "error": {
-                    "message": f"{self.name} with {self.field}<{self.value}>"
-                    f" already exists."
-                }
-            },
+            content={"error": {"message": self.message()}},
         )
 
 
@@ -36,15 +34,13 @@ class DoesNotExistError(Exception):
     field: str
     value: str
 
+    def message(self) -> str:
+        return f"{self.name} with {self.field}<{self.value}> does not exist."
+
     def get_error_json_response(self, code: int = 404) -> JSONResponse:
         return JSONResponse(
             status_code=code,
-            content={
-                "error": {
-                    "message": f"{self.name} with {self.field}<{self.value}>"
-                    f" does not exist."
-                }
-            },
+            content={"error": {"message": self.message()}},
         )
 
 
@@ -54,12 +50,27 @@ class ClosedReceiptError(Exception):
     field: str
     value: str
 
+    def message(self) -> str:
+        return f"{self.name} with {self.field}<{self.value}> is closed."
+
     def get_error_json_response(self, code: int = 403) -> JSONResponse:
         return JSONResponse(
             status_code=code,
-            content={
-                "error": {
-                    "message": f"{self.name} with {self.field}<{self.value}> is closed."
-                }
-            },
+            content={"error": {"message": self.message()}},
+        )
+
+
+@dataclass
+class InvalidValueError(Exception):
+    name: str
+    field: str
+    value: str
+
+    def message(self) -> str:
+        return f"{self.name} with {self.field}<{self.value}> is not valid."
+
+    def get_error_json_response(self, code: int = 422) -> JSONResponse:
+        return JSONResponse(
+            status_code=code,
+            content={"error": {"message": self.message()}},
         )
@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Protocol
+from typing import AsyncIterator, Iterator, Protocol
 from uuid import UUID, uuid4
 
+from core.errors import AlreadyExistError, DoesNotExistError, InvalidValueError
 
-@dataclass
+
+@dataclass(slots=True)
 class Product:
     unit_id: UUID
     name: str
@@ -12,15 +14,80 @@ class Product:
     id: UUID = field(default_factory=uuid4)
 
 
+ProductError = AlreadyExistError | DoesNotExistError | InvalidValueError
+
+
+def check_new_products(
+    products: list[Product], missing_units: set[UUID], taken_barcodes: set[str]
+) -> list[ProductError | None]:
+    errors: list[ProductError | None] = []
+    barcodes = set(taken_barcodes)
+    for product in products:
+        if product.price <= 0:
+            errors.append(InvalidValueError("Product", "price", str(product.price)))
+        elif product.unit_id in missing_units:
+            errors.append(DoesNotExistError("Unit", "id", str(product.unit_id)))
+        elif product.barcode in barcodes:
+            errors.append(AlreadyExistError("Product", "barcode", product.barcode))
+        else:
+            barcodes.add(product.barcode)
+            errors.append(None)
+    return errors
+
+
 class ProductRepository(Protocol):
     def create(self, product: Product) -> None:
         pass
 
+    def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        pass
+
     def read(self, product_id: UUID) -> Product:
         pass
 
+    def read_by_barcode(self, barcode: str) -> Product:
+        pass
+
     def read_all(self) -> list[Product]:
         pass
 
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        pass
+
+    def iterate(self) -> Iterator[Product]:
+        pass
+
     def update_price(self, product_id: UUID, new_price: float) -> None:
         pass
+
+    def version(self) -> int:
+        pass
+
+
+class AsyncProductRepository(Protocol):
+    async def create(self, product: Product) -> None:
+        pass
+
+    async def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        pass
+
+    async def read(self, product_id: UUID) -> Product:
+        pass
+
+    async def read_by_barcode(self, barcode: str) -> Product:
+        pass
+
+    async def read_all(self) -> list[Product]:
+        pass
+
+    async def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        pass
+
+    def iterate(self) -> AsyncIterator[Product]:
+        pass
+
+    async def update_price(self, product_id: UUID, new_price: float) -> None:
+        pass
+
+    async def version(self) -> int:
+        pass
@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Protocol
+from typing import AsyncIterator, Iterator, Protocol
 from uuid import UUID, uuid4
 
+from core.errors import InvalidValueError
 
-@dataclass
+
+@dataclass(slots=True)
 class ProductInReceipt:
     id: UUID
     quantity: int
@@ -11,7 +13,7 @@ class ProductInReceipt:
     total: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Receipt:
     status: str = "open"
     total: float = 0
@@ -19,12 +21,18 @@ class Receipt:
     id: UUID = field(default_factory=uuid4)
 
 
-@dataclass
+@dataclass(slots=True)
 class Sales:
     n_receipts: int = 0
     revenue: float = 0
 
 
+def check_quantities(products: list[tuple[UUID, int]]) -> None:
+    for _, quantity in products:
+        if quantity <= 0:
+            raise InvalidValueError("Product", "quantity", str(quantity))
+
+
 class ReceiptRepository(Protocol):
     def create(self, receipt: Receipt) -> None:
         pass
@@ -32,9 +40,17 @@ class ReceiptRepository(Protocol):
     def add_product(self, receipt_id: UUID, product_id: UUID, quantity: int) -> Receipt:
         pass
 
+    def add_products(
+        self, receipt_id: UUID, products: list[tuple[UUID, int]]
+    ) -> Receipt:
+        pass
+
     def read(self, receipt_id: UUID) -> Receipt:
         pass
 
+    def iterate(self) -> Iterator[Receipt]:
+        pass
+
     def update_status(self, receipt_id: UUID, new_status: str) -> None:
         pass
 
@@ -43,3 +59,33 @@ class ReceiptRepository(Protocol):
 
     def read_sales(self) -> Sales:
         pass
+
+
+class AsyncReceiptRepository(Protocol):
+    async def create(self, receipt: Receipt) -> None:
+        pass
+
+    async def add_product(
+        self, receipt_id: UUID, product_id: UUID, quantity: int
+    ) -> Receipt:
+        pass
+
+    async def add_products(
+        self, receipt_id: UUID, products: list[tuple[UUID, int]]
+    ) -> Receipt:
+        pass
+
+    async def read(self, receipt_id: UUID) -> Receipt:
+        pass
+
+    def iterate(self) -> AsyncIterator[Receipt]:
+        pass
+
+    async def update_status(self, receipt_id: UUID, new_status: str) -> None:
+        pass
+
+    async def delete(self, receipt_id: UUID) -> None:
+        pass
+
+    async def read_sales(self) -> Sales:
+        pass
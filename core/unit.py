@@ -3,7 +3,7 @@ from typing import Protocol
 from uuid import UUID, uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class Unit:
     name: str
     id: UUID = field(default_factory=uuid4)
@@ -16,5 +16,34 @@ class UnitRepository(Protocol):
     def read(self, unit_id: UUID) -> Unit:
         pass
 
+    def read_by_name(self, name: str) -> Unit:
+        pass
+
     def read_all(self) -> list[Unit]:
         pass
+
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Unit]:
+        pass
+
+    def version(self) -> int:
+        pass
+
+
+class AsyncUnitRepository(Protocol):
+    async def create(self, unit: Unit) -> None:
+        pass
+
+    async def read(self, unit_id: UUID) -> Unit:
+        pass
+
+    async def read_by_name(self, name: str) -> Unit:
+        pass
+
+    async def read_all(self) -> list[Unit]:
+        pass
+
+    async def read_page(self, limit: int, after: UUID | None = None) -> list[Unit]:
+        pass
+
+    async def version(self) -> int:
+        pass
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+from uuid import UUID
+
+from core.product import Product, ProductError, ProductRepository
+from infra.asynchronous.runners import Runner, iterate_in_chunks
+
+
+@dataclass
+class AsyncProducts:
+    products: ProductRepository
+    run: Runner
+
+    async def create(self, product: Product) -> None:
+        await self.run(lambda: self.products.create(product))
+
+    async def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        return await self.run(lambda: self.products.create_many(products))
+
+    async def read(self, product_id: UUID) -> Product:
+        return await self.run(lambda: self.products.read(product_id))
+
+    async def read_by_barcode(self, barcode: str) -> Product:
+        return await self.run(lambda: self.products.read_by_barcode(barcode))
+
+    async def read_all(self) -> list[Product]:
+        return await self.run(self.products.read_all)
+
+    async def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        return await self.run(lambda: self.products.read_page(limit, after))
+
+    async def iterate(self) -> AsyncIterator[Product]:
+        async for product in iterate_in_chunks(self.run, self.products.iterate()):
+            yield product
+
+    async def update_price(self, product_id: UUID, new_price: float) -> None:
+        await self.run(lambda: self.products.update_price(product_id, new_price))
+
+    async def version(self) -> int:
+        return await self.run(self.products.version)
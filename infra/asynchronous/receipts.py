@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+from uuid import UUID
+
+from core.receipt import Receipt, ReceiptRepository, Sales
+from infra.asynchronous.runners import Runner, iterate_in_chunks
+
+
+@dataclass
+class AsyncReceipts:
+    receipts: ReceiptRepository
+    run: Runner
+
+    async def create(self, receipt: Receipt) -> None:
+        await self.run(lambda: self.receipts.create(receipt))
+
+    async def add_product(
+        self, receipt_id: UUID, product_id: UUID, quantity: int
+    ) -> Receipt:
+        return await self.run(
+            lambda: self.receipts.add_product(receipt_id, product_id, quantity)
+        )
+
+    async def add_products(
+        self, receipt_id: UUID, products: list[tuple[UUID, int]]
+    ) -> Receipt:
+        return await self.run(lambda: self.receipts.add_products(receipt_id, products))
+
+    async def read(self, receipt_id: UUID) -> Receipt:
+        return await self.run(lambda: self.receipts.read(receipt_id))
+
+    async def iterate(self) -> AsyncIterator[Receipt]:
+        async for receipt in iterate_in_chunks(self.run, self.receipts.iterate()):
+            yield receipt
+
+    async def update_status(self, receipt_id: UUID, new_status: str) -> None:
+        await self.run(lambda: self.receipts.update_status(receipt_id, new_status))
+
+    async def delete(self, receipt_id: UUID) -> None:
+        await self.run(lambda: self.receipts.delete(receipt_id))
+
+    async def read_sales(self) -> Sales:
+        return await self.run(self.receipts.read_sales)
@@ -0,0 +1,38 @@
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterator, Protocol, TypeVar
+
+from starlette.concurrency import run_in_threadpool as starlette_run_in_threadpool
+
+from infra.constants import ITERATE_BATCH_SIZE
+
+T = TypeVar("T")
+
+
+class Runner(Protocol):
+    async def __call__(self, call: Callable[[], T]) -> T:
+        pass
+
+
+async def run_inline(call: Callable[[], T]) -> T:
+    return call()
+
+
+async def run_in_threadpool(call: Callable[[], T]) -> T:
+    return await starlette_run_in_threadpool(call)
+
+
+@dataclass
+class ExecutorRunner:
+    executor: Executor
+
+    async def __call__(self, call: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+
+async def iterate_in_chunks(run: Runner, items: Iterator[T]) -> AsyncIterator[T]:
+    while chunk := await run(lambda: list(islice(items, ITERATE_BATCH_SIZE))):
+        for item in chunk:
+            yield item
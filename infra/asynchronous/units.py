@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from core.unit import Unit, UnitRepository
+from infra.asynchronous.runners import Runner
+
+
+@dataclass
+class AsyncUnits:
+    units: UnitRepository
+    run: Runner
+
+    async def create(self, unit: Unit) -> None:
+        await self.run(lambda: self.units.create(unit))
+
+    async def read(self, unit_id: UUID) -> Unit:
+        return await self.run(lambda: self.units.read(unit_id))
+
+    async def read_by_name(self, name: str) -> Unit:
+        return await self.run(lambda: self.units.read_by_name(name))
+
+    async def read_all(self) -> list[Unit]:
+        return await self.run(self.units.read_all)
+
+    async def read_page(self, limit: int, after: UUID | None = None) -> list[Unit]:
+        return await self.run(lambda: self.units.read_page(limit, after))
+
+    async def version(self) -> int:
+        return await self.run(self.units.version)
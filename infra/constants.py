@@ -1,3 +1,10 @@
 DATABASE_NAME = "infra/sqlite/main.db"
 SQL_FILE = "./infra/sqlite/start_up.sql"
 SQL_FILE_TEST = "../infra/sqlite/start_up.sql"
+MIGRATIONS_DIR = "./infra/sqlite/migrations"
+MIGRATIONS_DIR_TEST = "../infra/sqlite/migrations"
+ITERATE_BATCH_SIZE = 500
+READ_CACHE_SIZE = 10_000
+GROUP_COMMIT_WINDOW = 0.002
+GROUP_COMMIT_BATCH_SIZE = 64
+SNAPSHOT_INTERVAL = 100_000
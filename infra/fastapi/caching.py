@@ -0,0 +1,20 @@
+from typing import Annotated
+
+from fastapi import Header, Response
+
+IfNoneMatch = Annotated[str | None, Header()]
+
+
+def entity_tag(version: int) -> str:
+    return f'"{version}"'
+
+
+def is_fresh(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -3,31 +3,39 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.requests import Request
 
-from core.product import ProductRepository
-from core.receipt import ReceiptRepository
-from core.unit import UnitRepository
+from core.product import AsyncProductRepository
+from core.receipt import AsyncReceiptRepository
+from core.unit import AsyncUnitRepository
+from infra.metrics import Metrics
 
 
-def get_unit_repository(request: Request) -> UnitRepository:
+def get_unit_repository(request: Request) -> AsyncUnitRepository:
     return request.app.state.units  # type: ignore
 
 
-UnitRepositoryDependable = Annotated[UnitRepository, Depends(get_unit_repository)]
+UnitRepositoryDependable = Annotated[AsyncUnitRepository, Depends(get_unit_repository)]
 
 
-def get_product_repository(request: Request) -> ProductRepository:
+def get_product_repository(request: Request) -> AsyncProductRepository:
     return request.app.state.products  # type: ignore
 
 
 ProductRepositoryDependable = Annotated[
-    ProductRepository, Depends(get_product_repository)
+    AsyncProductRepository, Depends(get_product_repository)
 ]
 
 
-def get_receipt_repository(request: Request) -> ReceiptRepository:
+def get_receipt_repository(request: Request) -> AsyncReceiptRepository:
     return request.app.state.receipts  # type: ignore
 
 
 ReceiptRepositoryDependable = Annotated[
-    ReceiptRepository, Depends(get_receipt_repository)
+    AsyncReceiptRepository, Depends(get_receipt_repository)
 ]
+
+
+def get_metrics(request: Request) -> Metrics:
+    return request.app.state.metrics  # type: ignore
+
+
+MetricsDependable = Annotated[Metrics, Depends(get_metrics)]
@@ -0,0 +1,50 @@
+from typing import AsyncIterator, TypeVar
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from core.product import Product
+from core.receipt import Receipt
+from infra.fastapi.dependables import (
+    ProductRepositoryDependable,
+    ReceiptRepositoryDependable,
+)
+
+export_api = APIRouter(tags=["Export"])
+
+T = TypeVar("T")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+FLUSH_SIZE = 64 * 1024
+
+product_adapter = TypeAdapter(Product)
+receipt_adapter = TypeAdapter(Receipt)
+
+
+async def ndjson(
+    items: AsyncIterator[T], adapter: TypeAdapter[T]
+) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for item in items:
+        buffer += adapter.dump_json(item)
+        buffer += b"\n"
+        if len(buffer) >= FLUSH_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+@export_api.get("/export/products.ndjson", response_class=StreamingResponse)
+async def export_products(products: ProductRepositoryDependable) -> StreamingResponse:
+    return StreamingResponse(
+        ndjson(products.iterate(), product_adapter), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@export_api.get("/export/receipts.ndjson", response_class=StreamingResponse)
+async def export_receipts(receipts: ReceiptRepositoryDependable) -> StreamingResponse:
+    return StreamingResponse(
+        ndjson(receipts.iterate(), receipt_adapter), media_type=NDJSON_MEDIA_TYPE
+    )
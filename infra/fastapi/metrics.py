@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Pattern
+
+from fastapi import APIRouter, Response
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infra.fastapi.dependables import MetricsDependable
+from infra.metrics import Metrics
+
+metrics_api = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RouteTemplate:
+    path: str
+    pattern: Pattern[str]
+    methods: set[str]
+
+
+class MetricsMiddleware:
+    def __init__(
+        self, app: ASGIApp, metrics: Metrics, schema: Callable[[], dict[str, Any]]
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.schema = schema
+        self.templates: list[RouteTemplate] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route(method, scope["path"])
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.request_started(method, route)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.request_finished(method, route, status, perf_counter() - start)
+
+    def route(self, method: str, path: str) -> str:
+        if self.templates is None:
+            self.templates = [
+                RouteTemplate(template, compile_path(template)[0], set(operations))
+                for template, operations in self.schema()["paths"].items()
+            ]
+
+        partial = UNMATCHED_ROUTE
+        for template in self.templates:
+            if template.pattern.match(path):
+                if method.lower() in template.methods:
+                    return template.path
+                if partial == UNMATCHED_ROUTE:
+                    partial = template.path
+        return partial
+
+
+@metrics_api.get("/metrics", response_class=Response)
+async def read_metrics(metrics: MetricsDependable) -> Response:
+    return Response(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
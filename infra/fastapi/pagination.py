@@ -0,0 +1,21 @@
+from typing import Annotated, Protocol, Sequence
+from uuid import UUID
+
+from fastapi import Query
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+PageLimit = Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)]
+
+
+class Identified(Protocol):
+    @property
+    def id(self) -> UUID:
+        pass
+
+
+def next_cursor(page: Sequence[Identified], limit: int) -> UUID | None:
+    if len(page) > limit:
+        return page[limit - 1].id
+    return None
@@ -1,12 +1,29 @@
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from starlette.responses import JSONResponse
 
-from core.errors import AlreadyExistError, DoesNotExistError, ErrorMessageEnvelope
-from core.product import Product
+from core.errors import (
+    AlreadyExistError,
+    DoesNotExistError,
+    ErrorMessageEnvelope,
+    ErrorMessageResponse,
+    InvalidValueError,
+)
+from core.product import Product, ProductError
+from infra.fastapi.caching import IfNoneMatch, entity_tag, is_fresh, not_modified
 from infra.fastapi.dependables import ProductRepositoryDependable
+from infra.fastapi.pagination import DEFAULT_PAGE_SIZE, PageLimit, next_cursor
+from infra.fastapi.serialization import (
+    ProductBatch,
+    ProductPage,
+    ProductResult,
+    json_response,
+    product_batch,
+    product_envelope,
+    product_page,
+)
 
 product_api = APIRouter(tags=["Products"])
 
@@ -32,6 +49,21 @@ class ProductItemEnvelope(BaseModel):
 
 class ProductListEnvelope(BaseModel):
     products: list[ProductItem]
+    next: UUID | None = None
+
+
+class CreateProductBatch(BaseModel):
+    products: list[CreateProductItem]
+
+
+class ProductBatchResult(BaseModel):
+    status: int
+    product: ProductItem | None = None
+    error: ErrorMessageResponse | None = None
+
+
+class ProductBatchEnvelope(BaseModel):
+    results: list[ProductBatchResult]
 
 
 class EmptyResponse(BaseModel):
@@ -47,37 +79,103 @@ class EmptyResponse(BaseModel):
         404: {"model": ErrorMessageEnvelope},
     },
 )
-def create_product(
+async def create_product(
     request: CreateProductItem, products: ProductRepositoryDependable
-) -> dict[str, Product] | JSONResponse:
+) -> Response:
     product = Product(**request.model_dump())
     try:
-        products.create(product)
-        return {"product": product}
+        await products.create(product)
+        return json_response(product_envelope, {"product": product}, 201)
     except AlreadyExistError as e:
         return e.get_error_json_response(409)
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
 
 
+@product_api.post(
+    "/products/batch", status_code=200, response_model=ProductBatchEnvelope
+)
+async def create_product_batch(
+    request: CreateProductBatch, products: ProductRepositoryDependable
+) -> Response:
+    new_products = [Product(**item.model_dump()) for item in request.products]
+    errors = await products.create_many(new_products)
+    return json_response(
+        product_batch,
+        ProductBatch(
+            [
+                batch_result(product, error)
+                for product, error in zip(new_products, errors)
+            ]
+        ),
+    )
+
+
+def batch_result(product: Product, error: ProductError | None) -> ProductResult:
+    if error is None:
+        return ProductResult(201, product)
+    if isinstance(error, AlreadyExistError):
+        status = 409
+    elif isinstance(error, InvalidValueError):
+        status = 422
+    else:
+        status = 404
+    return ProductResult(status, error={"message": error.message()})
+
+
 @product_api.get(
     "/products/{product_id}",
     status_code=200,
     response_model=ProductItemEnvelope,
-    responses={404: {"model": ErrorMessageEnvelope}},
+    responses={
+        304: {"description": "Not Modified"},
+        404: {"model": ErrorMessageEnvelope},
+    },
 )
-def read_product(
-    product_id: UUID, products: ProductRepositoryDependable
-) -> dict[str, Product] | JSONResponse:
+async def read_product(
+    product_id: UUID,
+    products: ProductRepositoryDependable,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    etag = entity_tag(await products.version())
+    if is_fresh(if_none_match, etag):
+        return not_modified(etag)
+
     try:
-        return {"product": products.read(product_id)}
+        product = await products.read(product_id)
+        return json_response(
+            product_envelope, {"product": product}, headers={"ETag": etag}
+        )
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
 
 
-@product_api.get("/products", status_code=200, response_model=ProductListEnvelope)
-def read_all_product(products: ProductRepositoryDependable) -> dict[str, list[Product]]:
-    return {"products": products.read_all()}
+@product_api.get(
+    "/products",
+    status_code=200,
+    response_model=ProductListEnvelope,
+    responses={304: {"description": "Not Modified"}},
+)
+async def read_all_product(
+    products: ProductRepositoryDependable,
+    barcode: str | None = None,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    after: UUID | None = None,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    etag = entity_tag(await products.version())
+    if is_fresh(if_none_match, etag):
+        return not_modified(etag)
+
+    if barcode is not None:
+        try:
+            content = ProductPage([await products.read_by_barcode(barcode)])
+        except DoesNotExistError:
+            content = ProductPage([])
+    else:
+        page = await products.read_page(limit + 1, after)
+        content = ProductPage(page[:limit], next_cursor(page, limit))
+    return json_response(product_page, content, headers={"ETag": etag})
 
 
 @product_api.patch(
@@ -86,11 +184,11 @@ def read_all_product(products: ProductRepositoryDependable) -> dict[str, list[Pr
     response_model=EmptyResponse,
     responses={404: {"model": ErrorMessageEnvelope}},
 )
-def update_product(
+async def update_product(
     product_id: UUID, product_price: float, products: ProductRepositoryDependable
 ) -> dict[str, str] | JSONResponse:
     try:
-        products.update_price(product_id, product_price)
+        await products.update_price(product_id, product_price)
         return {}
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
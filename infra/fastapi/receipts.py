@@ -1,12 +1,18 @@
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from starlette.responses import JSONResponse
 
-from core.errors import ClosedReceiptError, DoesNotExistError, ErrorMessageEnvelope
+from core.errors import (
+    ClosedReceiptError,
+    DoesNotExistError,
+    ErrorMessageEnvelope,
+    InvalidValueError,
+)
 from core.receipt import Receipt
 from infra.fastapi.dependables import ReceiptRepositoryDependable
+from infra.fastapi.serialization import json_response, receipt_envelope
 
 receipt_api = APIRouter(tags=["Receipts"])
 
@@ -16,6 +22,10 @@ class AddProductItem(BaseModel):
     quantity: int
 
 
+class AddProductBatch(BaseModel):
+    products: list[AddProductItem]
+
+
 class ProductInReceiptItem(BaseModel):
     id: UUID
     quantity: int
@@ -43,25 +53,54 @@ class EmptyResponse(BaseModel):
 
 
 @receipt_api.post("/receipts", status_code=201, response_model=ReceiptItemEnvelope)
-def create_receipt(receipts: ReceiptRepositoryDependable) -> dict[str, Receipt]:
+async def create_receipt(receipts: ReceiptRepositoryDependable) -> Response:
     receipt = Receipt()
-    receipts.create(receipt)
-    return {"receipt": receipt}
+    await receipts.create(receipt)
+    return json_response(receipt_envelope, {"receipt": receipt}, 201)
 
 
 @receipt_api.post(
     "/receipts/{receipt_id}/products",
     status_code=201,
     response_model=ReceiptItemEnvelope,
-    responses={404: {"model": ErrorMessageEnvelope}},
+    responses={
+        404: {"model": ErrorMessageEnvelope},
+        422: {"model": ErrorMessageEnvelope},
+    },
 )
-def add_product(
+async def add_product(
     receipt_id: UUID, req: AddProductItem, receipts: ReceiptRepositoryDependable
-) -> dict[str, Receipt] | JSONResponse:
+) -> Response:
+    try:
+        receipt = await receipts.add_product(receipt_id, req.id, req.quantity)
+        return json_response(receipt_envelope, {"receipt": receipt}, 201)
+    except DoesNotExistError as e:
+        return e.get_error_json_response(404)
+    except InvalidValueError as e:
+        return e.get_error_json_response(422)
+
+
+@receipt_api.post(
+    "/receipts/{receipt_id}/products/batch",
+    status_code=201,
+    response_model=ReceiptItemEnvelope,
+    responses={
+        404: {"model": ErrorMessageEnvelope},
+        422: {"model": ErrorMessageEnvelope},
+    },
+)
+async def add_product_batch(
+    receipt_id: UUID, req: AddProductBatch, receipts: ReceiptRepositoryDependable
+) -> Response:
     try:
-        return {"receipt": receipts.add_product(receipt_id, req.id, req.quantity)}
+        receipt = await receipts.add_products(
+            receipt_id, [(item.id, item.quantity) for item in req.products]
+        )
+        return json_response(receipt_envelope, {"receipt": receipt}, 201)
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
+    except InvalidValueError as e:
+        return e.get_error_json_response(422)
 
 
 @receipt_api.get(
@@ -70,11 +109,12 @@ def add_product(
     response_model=ReceiptItemEnvelope,
     responses={404: {"model": ErrorMessageEnvelope}},
 )
-def read_receipt(
+async def read_receipt(
     receipt_id: UUID, receipts: ReceiptRepositoryDependable
-) -> dict[str, Receipt] | JSONResponse:
+) -> Response:
     try:
-        return {"receipt": receipts.read(receipt_id)}
+        receipt = await receipts.read(receipt_id)
+        return json_response(receipt_envelope, {"receipt": receipt})
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
 
@@ -85,13 +125,13 @@ def read_receipt(
     response_model=EmptyResponse,
     responses={404: {"model": ErrorMessageEnvelope}},
 )
-def update_receipt(
+async def update_receipt(
     receipt_id: UUID,
     req: UpdateReceiptStatusItem,
     receipts: ReceiptRepositoryDependable,
 ) -> dict[str, str] | JSONResponse:
     try:
-        receipts.update_status(receipt_id, req.status)
+        await receipts.update_status(receipt_id, req.status)
         return {}
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
@@ -106,11 +146,11 @@ def update_receipt(
         404: {"model": ErrorMessageEnvelope},
     },
 )
-def delete_receipt(
+async def delete_receipt(
     receipt_id: UUID, receipts: ReceiptRepositoryDependable
 ) -> dict[str, str] | JSONResponse:
     try:
-        receipts.delete(receipt_id)
+        await receipts.delete(receipt_id)
         return {}
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
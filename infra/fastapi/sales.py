@@ -1,8 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
-from core.receipt import Sales
 from infra.fastapi.dependables import ReceiptRepositoryDependable
+from infra.fastapi.serialization import json_response, sales_envelope
 
 sales_api = APIRouter(tags=["Sales"])
 
@@ -17,5 +17,5 @@ class SalesItemEnvelope(BaseModel):
 
 
 @sales_api.get("/sales", status_code=200, response_model=SalesItemEnvelope)
-def read_sales(receipts: ReceiptRepositoryDependable) -> dict[str, Sales]:
-    return {"sales": receipts.read_sales()}
+async def read_sales(receipts: ReceiptRepositoryDependable) -> Response:
+    return json_response(sales_envelope, {"sales": await receipts.read_sales()})
@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from typing import Mapping, TypeVar
+from uuid import UUID
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from core.product import Product
+from core.receipt import Receipt, Sales
+from core.unit import Unit
+
+T = TypeVar("T")
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@dataclass
+class UnitPage:
+    units: list[Unit]
+    next: UUID | None = None
+
+
+@dataclass
+class ProductPage:
+    products: list[Product]
+    next: UUID | None = None
+
+
+@dataclass
+class ProductResult:
+    status: int
+    product: Product | None = None
+    error: dict[str, str] | None = None
+
+
+@dataclass
+class ProductBatch:
+    results: list[ProductResult]
+
+
+unit_envelope = TypeAdapter(dict[str, Unit])
+unit_page = TypeAdapter(UnitPage)
+product_envelope = TypeAdapter(dict[str, Product])
+product_page = TypeAdapter(ProductPage)
+product_batch = TypeAdapter(ProductBatch)
+receipt_envelope = TypeAdapter(dict[str, Receipt])
+sales_envelope = TypeAdapter(dict[str, Sales])
+
+
+def json_response(
+    adapter: TypeAdapter[T],
+    content: T,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    return Response(adapter.dump_json(content), status_code, headers, JSON_MEDIA_TYPE)
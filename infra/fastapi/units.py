@@ -1,12 +1,19 @@
 from uuid import UUID
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
 from core.errors import AlreadyExistError, DoesNotExistError, ErrorMessageEnvelope
 from core.unit import Unit
+from infra.fastapi.caching import IfNoneMatch, entity_tag, is_fresh, not_modified
 from infra.fastapi.dependables import UnitRepositoryDependable
+from infra.fastapi.pagination import DEFAULT_PAGE_SIZE, PageLimit, next_cursor
+from infra.fastapi.serialization import (
+    UnitPage,
+    json_response,
+    unit_envelope,
+    unit_page,
+)
 
 unit_api = APIRouter(tags=["Units"])
 
@@ -26,6 +33,7 @@ class UnitItemEnvelope(BaseModel):
 
 class UnitListEnvelope(BaseModel):
     units: list[UnitItem]
+    next: UUID | None = None
 
 
 @unit_api.post(
@@ -34,13 +42,13 @@ class UnitListEnvelope(BaseModel):
     response_model=UnitItemEnvelope,
     responses={409: {"model": ErrorMessageEnvelope}},
 )
-def create_unit(
+async def create_unit(
     request: CreateUnitItem, units: UnitRepositoryDependable
-) -> dict[str, Unit] | JSONResponse:
+) -> Response:
     unit = Unit(**request.model_dump())
     try:
-        units.create(unit)
-        return {"unit": unit}
+        await units.create(unit)
+        return json_response(unit_envelope, {"unit": unit}, 201)
     except AlreadyExistError as e:
         return e.get_error_json_response(409)
 
@@ -49,13 +57,23 @@ def create_unit(
     "/units/{unit_id}",
     status_code=200,
     response_model=UnitItemEnvelope,
-    responses={404: {"model": ErrorMessageEnvelope}},
+    responses={
+        304: {"description": "Not Modified"},
+        404: {"model": ErrorMessageEnvelope},
+    },
 )
-def read_unit(
-    unit_id: UUID, units: UnitRepositoryDependable
-) -> dict[str, Unit] | JSONResponse:
+async def read_unit(
+    unit_id: UUID,
+    units: UnitRepositoryDependable,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    etag = entity_tag(await units.version())
+    if is_fresh(if_none_match, etag):
+        return not_modified(etag)
+
     try:
-        return {"unit": units.read(unit_id)}
+        unit = await units.read(unit_id)
+        return json_response(unit_envelope, {"unit": unit}, headers={"ETag": etag})
     except DoesNotExistError as e:
         return e.get_error_json_response(404)
 
@@ -64,6 +82,25 @@ def read_unit(
     "/units",
     status_code=200,
     response_model=UnitListEnvelope,
+    responses={304: {"description": "Not Modified"}},
 )
-def read_all_unit(units: UnitRepositoryDependable) -> dict[str, list[Unit]]:
-    return {"units": units.read_all()}
+async def read_all_unit(
+    units: UnitRepositoryDependable,
+    name: str | None = None,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    after: UUID | None = None,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    etag = entity_tag(await units.version())
+    if is_fresh(if_none_match, etag):
+        return not_modified(etag)
+
+    if name is not None:
+        try:
+            content = UnitPage([await units.read_by_name(name)])
+        except DoesNotExistError:
+            content = UnitPage([])
+    else:
+        page = await units.read_page(limit + 1, after)
+        content = UnitPage(page[:limit], next_cursor(page, limit))
+    return json_response(unit_page, content, headers={"ETag": etag})
@@ -0,0 +1,201 @@
+from array import array
+from dataclasses import dataclass, field
+from time import time_ns
+from typing import Callable, Generic, Hashable, Iterable, Iterator, TypeVar
+from uuid import UUID
+
+from core.errors import AlreadyExistError, DoesNotExistError
+from core.product import Product, ProductError, check_new_products
+from infra.constants import ITERATE_BATCH_SIZE
+from infra.in_memory.ordering import SortedBlocks
+from infra.in_memory.units import UnitsInMemory
+
+K = TypeVar("K", bound=Hashable)
+
+EMPTY = -1
+ID_SIZE = 16
+
+
+def new_row_block(rows: Iterable[int]) -> "array[int]":
+    return array("q", rows)
+
+
+@dataclass
+class RowIndex(Generic[K]):
+    key_of: Callable[[int], K]
+    slots: "array[int]" = field(default_factory=lambda: array("q", [EMPTY] * 8))
+    size: int = 0
+
+    def find(self, key: K) -> int:
+        mask = len(self.slots) - 1
+        slot = hash(key) & mask
+        while (row := self.slots[slot]) != EMPTY:
+            if self.key_of(row) == key:
+                return row
+            slot = (slot + 1) & mask
+        return EMPTY
+
+    def add(self, row: int) -> None:
+        self.reserve(1)
+        self._place(row)
+        self.size += 1
+
+    def reserve(self, count: int) -> None:
+        capacity = len(self.slots)
+        while (self.size + count) * 3 > capacity * 2:
+            capacity *= 2
+        if capacity != len(self.slots):
+            self._grow(capacity)
+
+    def _place(self, row: int) -> None:
+        mask = len(self.slots) - 1
+        slot = hash(self.key_of(row)) & mask
+        while self.slots[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        self.slots[slot] = row
+
+    def _grow(self, capacity: int) -> None:
+        rows = [row for row in self.slots if row != EMPTY]
+        self.slots = array("q", [EMPTY]) * capacity
+        for row in rows:
+            self._place(row)
+
+
+@dataclass
+class StringColumn:
+    data: bytearray = field(default_factory=bytearray)
+    offsets: "array[int]" = field(default_factory=lambda: array("Q", [0]))
+
+    def append(self, value: str) -> None:
+        self.data += value.encode()
+        self.offsets.append(len(self.data))
+
+    def raw(self, row: int) -> bytes:
+        start = self.offsets[row]
+        end = self.offsets[row + 1]
+        return bytes(self.data[start:end])
+
+    def __getitem__(self, row: int) -> str:
+        return self.raw(row).decode()
+
+
+@dataclass
+class ColumnarProductsInMemory:
+    units: UnitsInMemory
+    ids: bytearray = field(default_factory=bytearray)
+    unit_codes: "array[int]" = field(default_factory=lambda: array("I"))
+    names: StringColumn = field(default_factory=StringColumn)
+    barcodes: StringColumn = field(default_factory=StringColumn)
+    prices: "array[float]" = field(default_factory=lambda: array("d"))
+    unit_ids: list[UUID] = field(default_factory=list)
+    unit_code_of: dict[UUID, int] = field(default_factory=dict)
+    catalog_version: int = field(default_factory=time_ns)
+    by_id: RowIndex[bytes] = field(init=False)
+    by_barcode: RowIndex[bytes] = field(init=False)
+    order: SortedBlocks[int] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.by_id = RowIndex(self._id_at)
+        self.by_barcode = RowIndex(self.barcodes.raw)
+        self.order = SortedBlocks(self._id_key, new_row_block)
+
+    def create(self, product: Product) -> None:
+        self.units.read(product.unit_id)
+
+        if self.by_barcode.find(product.barcode.encode()) != EMPTY:
+            raise AlreadyExistError("Product", "barcode", product.barcode)
+        self.order.add(self._append(product))
+        self.catalog_version += 1
+
+    def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        missing_units = {product.unit_id for product in products} - (
+            self.units.units.keys()
+        )
+        taken_barcodes = {
+            product.barcode
+            for product in products
+            if self.by_barcode.find(product.barcode.encode()) != EMPTY
+        }
+        errors = check_new_products(products, missing_units, taken_barcodes)
+
+        added = errors.count(None)
+        self.by_id.reserve(added)
+        self.by_barcode.reserve(added)
+        rows = [
+            self._append(product)
+            for product, error in zip(products, errors)
+            if error is None
+        ]
+        self.order.update(rows)
+        self.catalog_version += len(rows)
+        return errors
+
+    def read(self, product_id: UUID) -> Product:
+        row = self.by_id.find(product_id.bytes)
+        if row == EMPTY:
+            raise DoesNotExistError("Product", "id", str(product_id))
+        return self._product_at(row)
+
+    def read_by_barcode(self, barcode: str) -> Product:
+        row = self.by_barcode.find(barcode.encode())
+        if row == EMPTY:
+            raise DoesNotExistError("Product", "barcode", barcode)
+        return self._product_at(row)
+
+    def read_all(self) -> list[Product]:
+        return [self._product_at(row) for row in range(len(self.prices))]
+
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        rows = self.order.page(limit, after.bytes if after is not None else None)
+        return [self._product_at(row) for row in rows]
+
+    def iterate(self) -> Iterator[Product]:
+        after = None
+        while page := self.read_page(ITERATE_BATCH_SIZE, after):
+            yield from page
+            after = page[-1].id
+
+    def update_price(self, product_id: UUID, new_price: float) -> None:
+        row = self.by_id.find(product_id.bytes)
+        if row == EMPTY:
+            raise DoesNotExistError("Product", "id", str(product_id))
+
+        self.prices[row] = new_price
+        self.catalog_version += 1
+
+    def version(self) -> int:
+        return self.catalog_version
+
+    def _append(self, product: Product) -> int:
+        row = len(self.prices)
+        self.ids += product.id.bytes
+        self.unit_codes.append(self._unit_code(product.unit_id))
+        self.names.append(product.name)
+        self.barcodes.append(product.barcode)
+        self.prices.append(product.price)
+        self.by_id.add(row)
+        self.by_barcode.add(row)
+        return row
+
+    def _unit_code(self, unit_id: UUID) -> int:
+        if unit_id not in self.unit_code_of:
+            self.unit_code_of[unit_id] = len(self.unit_ids)
+            self.unit_ids.append(unit_id)
+        return self.unit_code_of[unit_id]
+
+    def _id_at(self, row: int) -> bytes:
+        return bytes(self._id_key(row))
+
+    def _id_key(self, row: int) -> bytearray:
+        start = row * ID_SIZE
+        end = start + ID_SIZE
+        return self.ids[start:end]
+
+    def _product_at(self, row: int) -> Product:
+        return Product(
+            self.unit_ids[self.unit_codes[row]],
+            self.names[row],
+            self.barcodes[row],
+            self.prices[row],
+            UUID(bytes=self._id_at(row)),
+        )
@@ -0,0 +1,86 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Callable, Generic, Iterable, Iterator, MutableSequence, TypeVar
+
+V = TypeVar("V")
+
+BLOCK_SIZE = 1_000
+REBUILD_RATIO = 8
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+@dataclass
+class SortedBlocks(Generic[V]):
+    key: Callable[[V], Any] = identity
+    new_block: Callable[[Iterable[V]], MutableSequence[V]] = list
+    blocks: list[MutableSequence[V]] = field(default_factory=list)
+    maxes: list[Any] = field(default_factory=list)
+    size: int = 0
+
+    def add(self, value: V) -> None:
+        key = self.key(value)
+        if not self.blocks:
+            self.blocks.append(self.new_block([value]))
+            self.maxes.append(key)
+            self.size += 1
+            return
+
+        index = min(bisect_left(self.maxes, key), len(self.blocks) - 1)
+        block = self.blocks[index]
+        block.insert(bisect_right(block, key, key=self.key), value)
+        if key > self.maxes[index]:
+            self.maxes[index] = key
+        self.size += 1
+        if len(block) > 2 * BLOCK_SIZE:
+            self._split(index)
+
+    def update(self, values: list[V]) -> None:
+        if len(values) * REBUILD_RATIO < self.size:
+            for value in values:
+                self.add(value)
+            return
+
+        ordered = sorted(chain(self, values), key=self.key)
+        self.blocks = []
+        for start in range(0, len(ordered), BLOCK_SIZE):
+            end = start + BLOCK_SIZE
+            self.blocks.append(self.new_block(ordered[start:end]))
+        self.maxes = [self.key(block[-1]) for block in self.blocks]
+        self.size = len(ordered)
+
+    def page(self, limit: int, after: Any = None) -> list[V]:
+        index = 0
+        position = 0
+        if after is not None:
+            index = bisect_right(self.maxes, after)
+            if index == len(self.blocks):
+                return []
+            position = bisect_right(self.blocks[index], after, key=self.key)
+
+        values: list[V] = []
+        while index < len(self.blocks) and len(values) < limit:
+            end = position + limit - len(values)
+            values.extend(self.blocks[index][position:end])
+            index += 1
+            position = 0
+        return values
+
+    def __iter__(self) -> Iterator[V]:
+        for block in self.blocks:
+            yield from block
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _split(self, index: int) -> None:
+        block = self.blocks[index]
+        head = self.new_block(block[:BLOCK_SIZE])
+        tail = self.new_block(block[BLOCK_SIZE:])
+        self.blocks[index] = head
+        self.blocks.insert(index + 1, tail)
+        self.maxes[index] = self.key(head[-1])
+        self.maxes.insert(index + 1, self.key(tail[-1]))
@@ -0,0 +1,533 @@
+import gc
+import os
+import traceback
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from inspect import signature
+from itertools import islice
+from threading import Lock
+from typing import Any, BinaryIO, Iterator, TypeVar, cast
+from uuid import UUID
+from zlib import crc32
+
+from core.product import Product, ProductRepository
+from core.receipt import ProductInReceipt, Receipt, Sales
+from core.unit import Unit
+from infra.constants import SNAPSHOT_INTERVAL
+from infra.in_memory.receipts import ReceiptsInMemory
+from infra.in_memory.records import (
+    BLOB_LENGTH,
+    BY_METHOD,
+    BY_OPCODE,
+    CHECKSUM,
+    FILE_HEADER,
+    FORMAT_VERSION,
+    INTEGER,
+    JOURNAL_MAGIC,
+    OPERATIONS,
+    REAL,
+    RECORD_HEADER,
+    SNAPSHOT_MAGIC,
+    UUID_SIZE,
+    Args,
+    array_bytes,
+    array_from,
+    check_header,
+    iter_uuids,
+    texts_bytes,
+    texts_from,
+    uuid_from_bytes,
+)
+from infra.in_memory.units import UnitsInMemory
+
+T = TypeVar("T")
+
+SNAPSHOT_FILE = "snapshot.bin"
+JOURNAL_PREFIX = "journal-"
+JOURNAL_SUFFIX = ".bin"
+
+MUTATIONS: dict[str, set[str]] = {}
+for operation in OPERATIONS:
+    MUTATIONS.setdefault(operation.repository, set()).add(operation.method)
+
+Record = tuple[str, str, Args]
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+@dataclass
+class Snapshot:
+    generation: int
+    unit_ids: bytes
+    unit_names: list[str]
+    product_ids: bytes
+    product_unit_ids: bytes
+    product_names: list[str]
+    product_barcodes: list[str]
+    product_prices: "array[float]"
+    statuses: list[str]
+    receipt_ids: bytes
+    receipt_statuses: bytes
+    receipt_totals: "array[float]"
+    line_counts: "array[int]"
+    line_product_ids: bytes
+    line_quantities: "array[int]"
+    line_prices: "array[float]"
+    line_totals: "array[float]"
+    line_refs: "array[int]"
+    n_receipts: int
+    revenue: float
+
+    @classmethod
+    def capture(
+        cls,
+        generation: int,
+        units: UnitsInMemory,
+        products: ProductRepository,
+        receipts: ReceiptsInMemory,
+    ) -> "Snapshot":
+        statuses: dict[str, int] = {}
+        lines: dict[tuple[int, int, float, float], int] = {}
+        receipt_ids = bytearray()
+        receipt_statuses = bytearray()
+        receipt_totals = array("d")
+        line_counts = array("q")
+        line_refs = array("q")
+        for receipt in receipts.receipts.values():
+            receipt_ids += receipt.id.int.to_bytes(UUID_SIZE)
+            receipt_statuses.append(statuses.setdefault(receipt.status, len(statuses)))
+            receipt_totals.append(receipt.total)
+            line_counts.append(len(receipt.products))
+            for line in receipt.products:
+                key = (line.id.int, line.quantity, line.price, line.total)
+                line_refs.append(lines.setdefault(key, len(lines)))
+
+        product_ids = bytearray()
+        product_unit_ids = bytearray()
+        product_names = []
+        product_barcodes = []
+        product_prices = array("d")
+        for product in products.iterate():
+            product_ids += product.id.bytes
+            product_unit_ids += product.unit_id.bytes
+            product_names.append(product.name)
+            product_barcodes.append(product.barcode)
+            product_prices.append(product.price)
+
+        all_units = units.read_all()
+        return cls(
+            generation,
+            b"".join(unit.id.bytes for unit in all_units),
+            [unit.name for unit in all_units],
+            bytes(product_ids),
+            bytes(product_unit_ids),
+            product_names,
+            product_barcodes,
+            product_prices,
+            list(statuses),
+            bytes(receipt_ids),
+            bytes(receipt_statuses),
+            receipt_totals,
+            line_counts,
+            b"".join(product_id.to_bytes(UUID_SIZE) for product_id, _, _, _ in lines),
+            array("q", (quantity for _, quantity, _, _ in lines)),
+            array("d", (price for _, _, price, _ in lines)),
+            array("d", (total for _, _, _, total in lines)),
+            line_refs,
+            receipts.sales.n_receipts,
+            receipts.sales.revenue,
+        )
+
+    def write(self, file: BinaryIO) -> None:
+        unit_name_lengths, unit_names = texts_bytes(self.unit_names)
+        name_lengths, names = texts_bytes(self.product_names)
+        barcode_lengths, barcodes = texts_bytes(self.product_barcodes)
+        status_lengths, statuses = texts_bytes(self.statuses)
+        blobs = [
+            INTEGER.pack(self.generation),
+            self.unit_ids,
+            unit_name_lengths,
+            unit_names,
+            self.product_ids,
+            self.product_unit_ids,
+            name_lengths,
+            names,
+            barcode_lengths,
+            barcodes,
+            array_bytes(self.product_prices),
+            status_lengths,
+            statuses,
+            self.receipt_ids,
+            self.receipt_statuses,
+            array_bytes(self.receipt_totals),
+            array_bytes(self.line_counts),
+            self.line_product_ids,
+            array_bytes(self.line_quantities),
+            array_bytes(self.line_prices),
+            array_bytes(self.line_totals),
+            array_bytes(self.line_refs),
+            INTEGER.pack(self.n_receipts),
+            REAL.pack(self.revenue),
+        ]
+        checksum = 0
+        file.write(FILE_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION))
+        for blob in blobs:
+            length = BLOB_LENGTH.pack(len(blob))
+            checksum = crc32(blob, crc32(length, checksum))
+            file.write(length)
+            file.write(blob)
+        file.write(CHECKSUM.pack(checksum))
+
+    @classmethod
+    def read(cls, path: str) -> "Snapshot":
+        with open(path, "rb") as snapshot_file:
+            data = memoryview(snapshot_file.read())
+        if len(data) < FILE_HEADER.size + CHECKSUM.size:
+            raise ValueError(f"{path} is too short to be a snapshot.")
+        offset = FILE_HEADER.size
+        check_header(bytes(data[:offset]), SNAPSHOT_MAGIC, path)
+        end = len(data) - CHECKSUM.size
+        (checksum,) = CHECKSUM.unpack(data[end:])
+        if crc32(data[offset:end]) != checksum:
+            raise ValueError(f"{path} does not match its checksum.")
+
+        blobs = []
+        while offset < end:
+            start = offset + BLOB_LENGTH.size
+            (length,) = BLOB_LENGTH.unpack(data[offset:start])
+            offset = start + length
+            blobs.append(bytes(data[start:offset]))
+        if offset != end or len(blobs) != 24:
+            raise ValueError(f"{path} does not have the snapshot sections.")
+
+        (generation,) = INTEGER.unpack(blobs[0])
+        (n_receipts,) = INTEGER.unpack(blobs[22])
+        (revenue,) = REAL.unpack(blobs[23])
+        snapshot = cls(
+            generation,
+            blobs[1],
+            texts_from(blobs[2], blobs[3]),
+            blobs[4],
+            blobs[5],
+            texts_from(blobs[6], blobs[7]),
+            texts_from(blobs[8], blobs[9]),
+            array_from("d", blobs[10]),
+            texts_from(blobs[11], blobs[12]),
+            blobs[13],
+            blobs[14],
+            array_from("d", blobs[15]),
+            array_from("q", blobs[16]),
+            blobs[17],
+            array_from("q", blobs[18]),
+            array_from("d", blobs[19]),
+            array_from("d", blobs[20]),
+            array_from("q", blobs[21]),
+            n_receipts,
+            revenue,
+        )
+        snapshot.validate(path)
+        return snapshot
+
+    def validate(self, path: str) -> None:
+        n_units = len(self.unit_names)
+        n_products = len(self.product_prices)
+        n_receipts = len(self.receipt_totals)
+        n_lines = len(self.line_quantities)
+        if not (
+            len(self.unit_ids) == n_units * UUID_SIZE
+            and len(self.product_ids) == n_products * UUID_SIZE
+            and len(self.product_unit_ids) == n_products * UUID_SIZE
+            and len(self.product_names) == n_products
+            and len(self.product_barcodes) == n_products
+            and len(self.receipt_ids) == n_receipts * UUID_SIZE
+            and len(self.receipt_statuses) == n_receipts
+            and len(self.line_counts) == n_receipts
+            and len(self.line_product_ids) == n_lines * UUID_SIZE
+            and len(self.line_prices) == n_lines
+            and len(self.line_totals) == n_lines
+            and sum(self.line_counts) == len(self.line_refs)
+            and max(self.receipt_statuses, default=-1) < len(self.statuses)
+            and max(self.line_refs, default=-1) < n_lines
+            and min(self.line_refs, default=0) >= 0
+            and min(self.line_counts, default=0) >= 0
+        ):
+            raise ValueError(f"{path} has sections of inconsistent sizes.")
+
+    def restore(
+        self,
+        units: UnitsInMemory,
+        products: ProductRepository,
+        receipts: ReceiptsInMemory,
+    ) -> None:
+        for unit_id, name in zip(iter_uuids(self.unit_ids), self.unit_names):
+            units.create(Unit(name, uuid_from_bytes(unit_id)))
+        products.create_many(
+            [
+                Product(
+                    uuid_from_bytes(unit_id),
+                    name,
+                    barcode,
+                    price,
+                    uuid_from_bytes(id),
+                )
+                for id, unit_id, name, barcode, price in zip(
+                    iter_uuids(self.product_ids),
+                    iter_uuids(self.product_unit_ids),
+                    self.product_names,
+                    self.product_barcodes,
+                    self.product_prices,
+                )
+            ]
+        )
+
+        product_ids: dict[bytes, UUID] = {}
+        lines = [
+            ProductInReceipt(
+                product_ids.setdefault(product_id, uuid_from_bytes(product_id)),
+                quantity,
+                price,
+                total,
+            )
+            for product_id, quantity, price, total in zip(
+                iter_uuids(self.line_product_ids),
+                self.line_quantities,
+                self.line_prices,
+                self.line_totals,
+            )
+        ]
+        line_refs = iter(self.line_refs)
+        line_at = lines.__getitem__
+        by_id = receipts.receipts
+        for receipt_id, status, total, count in zip(
+            iter_uuids(self.receipt_ids),
+            self.receipt_statuses,
+            self.receipt_totals,
+            self.line_counts,
+        ):
+            receipt = Receipt(
+                self.statuses[status],
+                total,
+                list(map(line_at, islice(line_refs, count))),
+                uuid_from_bytes(receipt_id),
+            )
+            by_id[receipt.id] = receipt
+        receipts.order = list(by_id)
+        receipts.sales = Sales(self.n_receipts, self.revenue)
+
+
+@dataclass
+class Journal:
+    path: str
+    fsync: bool = False
+    file: BinaryIO = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.file = open(self.path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(JOURNAL_MAGIC, FORMAT_VERSION))
+
+    def append(self, record: Record) -> None:
+        name, method, args = record
+        operation = BY_METHOD[name, method]
+        payload = operation.encode(args)
+        self.file.write(
+            RECORD_HEADER.pack(operation.opcode, len(payload), crc32(payload)) + payload
+        )
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_journal(path: str) -> Iterator[Record]:
+    with open(path, "rb") as journal:
+        data = journal.read()
+    end = len(data)
+    offset = FILE_HEADER.size
+    if end < offset:
+        os.truncate(path, 0)
+        return
+    check_header(data[:offset], JOURNAL_MAGIC, path)
+
+    while offset + RECORD_HEADER.size <= end:
+        start = offset + RECORD_HEADER.size
+        opcode, length, checksum = RECORD_HEADER.unpack(data[offset:start])
+        stop = start + length
+        if stop > end:
+            break
+        payload = data[start:stop]
+        if crc32(payload) != checksum:
+            if stop == end:
+                break
+            raise ValueError(f"{path} has a corrupt record at byte {offset}.")
+        if opcode not in BY_OPCODE:
+            raise ValueError(f"{path} has unknown opcode {opcode} at byte {offset}.")
+        operation = BY_OPCODE[opcode]
+        offset = stop
+        yield operation.repository, operation.method, operation.decode(payload)
+
+    if offset < end:
+        os.truncate(path, offset)
+
+
+@dataclass
+class MemoryStore:
+    directory: str
+    units: UnitsInMemory
+    products: ProductRepository
+    receipts: ReceiptsInMemory
+    snapshot_every: int = SNAPSHOT_INTERVAL
+    fsync: bool = False
+    generation: int = field(init=False, default=0)
+    pending: int = field(init=False, default=0)
+    journal: Journal = field(init=False)
+    snapshotter: int | None = field(init=False, default=None)
+    _lock: Lock = field(init=False, default_factory=Lock)
+
+    def load(self) -> None:
+        with gc_paused():
+            self._load()
+        gc.freeze()
+
+    def _load(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            snapshot = Snapshot.read(snapshot_path)
+            snapshot.restore(self.units, self.products, self.receipts)
+            self.generation = snapshot.generation
+
+        repositories = self._repositories()
+        for generation in self._journal_generations():
+            if generation < self.generation:
+                continue
+            for name, method, args in read_journal(self._journal_path(generation)):
+                getattr(repositories[name], method)(*args)
+                self.pending += 1
+            self.generation = generation
+        self.journal = Journal(self._journal_path(self.generation), self.fsync)
+
+    def record(self, name: str, method: str, args: Args) -> None:
+        with self._lock:
+            self.journal.append((name, method, args))
+            self.pending += 1
+            if self.pending >= self.snapshot_every and not self._snapshotting():
+                self._snapshot()
+
+    def snapshot(self) -> None:
+        with self._lock:
+            self._wait()
+            self._snapshot()
+            self._wait()
+
+    def close(self) -> None:
+        with self._lock:
+            self._wait()
+            self.journal.close()
+
+    def _snapshot(self) -> None:
+        self.journal.close()
+        self.generation += 1
+        self.journal = Journal(self._journal_path(self.generation), self.fsync)
+        self.pending = 0
+        if not hasattr(os, "fork"):
+            self._write_snapshot()
+            return
+
+        pid = os.fork()
+        if pid != 0:
+            self.snapshotter = pid
+            return
+        gc.disable()
+        try:
+            self._write_snapshot()
+        except BaseException:
+            traceback.print_exc()
+            os._exit(1)
+        os._exit(0)
+
+    def _snapshotting(self) -> bool:
+        if self.snapshotter is None:
+            return False
+        pid, _ = os.waitpid(self.snapshotter, os.WNOHANG)
+        if pid == 0:
+            return True
+        self.snapshotter = None
+        return False
+
+    def _wait(self) -> None:
+        if self.snapshotter is not None:
+            os.waitpid(self.snapshotter, 0)
+            self.snapshotter = None
+
+    def _write_snapshot(self) -> None:
+        snapshot = Snapshot.capture(
+            self.generation, self.units, self.products, self.receipts
+        )
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        with open(snapshot_path + ".tmp", "wb") as snapshot_file:
+            snapshot.write(snapshot_file)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+
+        for generation in self._journal_generations():
+            if generation < self.generation:
+                os.remove(self._journal_path(generation))
+
+    def _repositories(self) -> dict[str, Any]:
+        return {
+            "units": self.units,
+            "products": self.products,
+            "receipts": self.receipts,
+        }
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(
+            self.directory, f"{JOURNAL_PREFIX}{generation:08d}{JOURNAL_SUFFIX}"
+        )
+
+    def _journal_generations(self) -> list[int]:
+        return sorted(
+            int(file_name.removeprefix(JOURNAL_PREFIX).removesuffix(JOURNAL_SUFFIX))
+            for file_name in os.listdir(self.directory)
+            if file_name.startswith(JOURNAL_PREFIX)
+            and file_name.endswith(JOURNAL_SUFFIX)
+        )
+
+
+@dataclass
+class JournaledRepository:
+    repository: object
+    name: str
+    store: MemoryStore
+
+    def __getattr__(self, attribute: str) -> Any:
+        target = getattr(self.repository, attribute)
+        if attribute not in MUTATIONS[self.name]:
+            return target
+        parameters = signature(target)
+
+        def journaled(*args: Any, **kwargs: Any) -> Any:
+            result = target(*args, **kwargs)
+            if kwargs:
+                args = tuple(parameters.bind(*args, **kwargs).arguments.values())
+            self.store.record(self.name, attribute, args)
+            return result
+
+        setattr(self, attribute, journaled)
+        return journaled
+
+
+def journaled(repository: T, name: str, store: MemoryStore) -> T:
+    return cast(T, JournaledRepository(repository, name, store))
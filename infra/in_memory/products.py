@@ -1,8 +1,12 @@
 from dataclasses import dataclass, field
+from time import time_ns
+from typing import Iterator
 from uuid import UUID
 
 from core.errors import AlreadyExistError, DoesNotExistError
-from core.product import Product
+from core.product import Product, ProductError, check_new_products
+from infra.constants import ITERATE_BATCH_SIZE
+from infra.in_memory.ordering import SortedBlocks
 from infra.in_memory.units import UnitsInMemory
 
 
@@ -10,14 +14,38 @@ from infra.in_memory.units import UnitsInMemory
 class ProductsInMemory:
     units: UnitsInMemory
     products: dict[UUID, Product] = field(default_factory=dict)
+    barcodes: dict[str, UUID] = field(default_factory=dict)
+    ids: SortedBlocks[UUID] = field(default_factory=SortedBlocks)
+    catalog_version: int = field(default_factory=time_ns)
 
     def create(self, product: Product) -> None:
         self.units.read(product.unit_id)
 
-        for curr_product in self.products.values():
-            if curr_product.barcode == product.barcode:
-                raise AlreadyExistError("Product", "barcode", product.barcode)
+        if product.barcode in self.barcodes:
+            raise AlreadyExistError("Product", "barcode", product.barcode)
         self.products[product.id] = product
+        self.barcodes[product.barcode] = product.id
+        self.ids.add(product.id)
+        self.catalog_version += 1
+
+    def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        missing_units = {product.unit_id for product in products} - (
+            self.units.units.keys()
+        )
+        taken_barcodes = {product.barcode for product in products} & (
+            self.barcodes.keys()
+        )
+        errors = check_new_products(products, missing_units, taken_barcodes)
+
+        created = []
+        for product, error in zip(products, errors):
+            if error is None:
+                self.products[product.id] = product
+                self.barcodes[product.barcode] = product.id
+                created.append(product.id)
+                self.catalog_version += 1
+        self.ids.update(created)
+        return errors
 
     def read(self, product_id: UUID) -> Product:
         try:
@@ -25,9 +53,24 @@ class ProductsInMemory:
         except KeyError:
             raise DoesNotExistError("Product", "id", str(product_id))
 
+    def read_by_barcode(self, barcode: str) -> Product:
+        try:
+            return self.products[self.barcodes[barcode]]
+        except KeyError:
+            raise DoesNotExistError("Product", "barcode", barcode)
+
     def read_all(self) -> list[Product]:
         return list(self.products.values())
 
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        return [self.products[product_id] for product_id in self.ids.page(limit, after)]
+
+    def iterate(self) -> Iterator[Product]:
+        after = None
+        while page := self.read_page(ITERATE_BATCH_SIZE, after):
+            yield from page
+            after = page[-1].id
+
     def update_price(self, product_id: UUID, new_price: float) -> None:
         try:
             self.products[product_id]
@@ -35,3 +78,7 @@ class ProductsInMemory:
             raise DoesNotExistError("Product", "id", str(product_id))
 
         self.products[product_id].price = new_price
+        self.catalog_version += 1
+
+    def version(self) -> int:
+        return self.catalog_version
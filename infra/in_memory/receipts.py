@@ -1,33 +1,54 @@
 from dataclasses import dataclass, field
+from math import isclose
+from typing import Iterator
 from uuid import UUID
 
 from core.errors import ClosedReceiptError, DoesNotExistError
-from core.receipt import ProductInReceipt, Receipt, Sales
-from infra.in_memory.products import ProductsInMemory
+from core.product import ProductRepository
+from core.receipt import ProductInReceipt, Receipt, Sales, check_quantities
 
 
 @dataclass
 class ReceiptsInMemory:
-    products: ProductsInMemory
+    products: ProductRepository
     receipts: dict[UUID, Receipt] = field(default_factory=dict)
+    order: list[UUID] = field(default_factory=list)
+    removed: int = 0
+    sales: Sales = field(default_factory=Sales)
+    verify_sales: bool = False
 
     def create(self, receipt: Receipt) -> None:
+        if receipt.id not in self.receipts:
+            self.order.append(receipt.id)
         self.receipts[receipt.id] = receipt
+        if receipt.status == "closed":
+            self._add_sale(1, receipt.total)
 
     def add_product(self, receipt_id: UUID, product_id: UUID, quantity: int) -> Receipt:
-        product = self.products.read(product_id)
+        return self.add_products(receipt_id, [(product_id, quantity)])
+
+    def add_products(
+        self, receipt_id: UUID, products: list[tuple[UUID, int]]
+    ) -> Receipt:
+        check_quantities(products)
+        lines = [
+            (self.products.read(product_id), quantity)
+            for product_id, quantity in products
+        ]
         try:
-            self.receipts[receipt_id]
+            receipt = self.receipts[receipt_id]
         except KeyError:
             raise DoesNotExistError("Receipt", "id", str(receipt_id))
 
-        self.receipts[receipt_id].products.append(
-            ProductInReceipt(
-                product_id, quantity, product.price, product.price * quantity
+        for product, quantity in lines:
+            total = product.price * quantity
+            receipt.products.append(
+                ProductInReceipt(product.id, quantity, product.price, total)
             )
-        )
-        self.receipts[receipt_id].total = product.price * quantity
-        return self.receipts[receipt_id]
+            receipt.total += total
+            if receipt.status == "closed":
+                self._add_sale(0, total)
+        return receipt
 
     def read(self, receipt_id: UUID) -> Receipt:
         try:
@@ -35,13 +56,24 @@ class ReceiptsInMemory:
         except KeyError:
             raise DoesNotExistError("Receipt", "id", str(receipt_id))
 
+    def iterate(self) -> Iterator[Receipt]:
+        for receipt_id in self.order:
+            receipt = self.receipts.get(receipt_id)
+            if receipt is not None:
+                yield receipt
+
     def update_status(self, receipt_id: UUID, new_status: str) -> None:
         try:
-            self.receipts[receipt_id]
+            receipt = self.receipts[receipt_id]
         except KeyError:
             raise DoesNotExistError("Receipt", "id", str(receipt_id))
 
-        self.receipts[receipt_id].status = new_status
+        was_closed = receipt.status == "closed"
+        receipt.status = new_status
+        if not was_closed and new_status == "closed":
+            self._add_sale(1, receipt.total)
+        elif was_closed and new_status != "closed":
+            self._add_sale(-1, -receipt.total)
 
     def delete(self, receipt_id: UUID) -> None:
         try:
@@ -53,8 +85,22 @@ class ReceiptsInMemory:
             raise ClosedReceiptError("Receipt", "id", str(receipt_id))
 
         self.receipts.pop(receipt_id)
+        self.removed += 1
+        if self.removed * 2 > len(self.order):
+            self.order = list(self.receipts)
+            self.removed = 0
 
     def read_sales(self) -> Sales:
+        if self.verify_sales:
+            self._verify_sales()
+
+        return Sales(self.sales.n_receipts, self.sales.revenue)
+
+    def _add_sale(self, n_receipts: int, revenue: float) -> None:
+        self.sales.n_receipts += n_receipts
+        self.sales.revenue += revenue
+
+    def _scan_sales(self) -> Sales:
         n_receipts = 0
         revenue = 0.0
 
@@ -64,3 +110,12 @@ class ReceiptsInMemory:
                 revenue += receipt.total
 
         return Sales(n_receipts, revenue)
+
+    def _verify_sales(self) -> None:
+        scanned = self._scan_sales()
+        if scanned.n_receipts != self.sales.n_receipts or not isclose(
+            scanned.revenue, self.sales.revenue, abs_tol=1e-6
+        ):
+            raise AssertionError(
+                f"Sales counters {self.sales} do not match rescan {scanned}."
+            )
@@ -0,0 +1,310 @@
+import sys
+from array import array
+from dataclasses import dataclass, field
+from struct import Struct, iter_unpack
+from typing import Any, Callable, Iterator
+from uuid import UUID, SafeUUID
+
+from core.product import Product
+from core.receipt import ProductInReceipt, Receipt
+from core.unit import Unit
+
+JOURNAL_MAGIC = b"POSJRNL\0"
+SNAPSHOT_MAGIC = b"POSSNAP\0"
+FORMAT_VERSION = 1
+UUID_SIZE = 16
+UUID_SAFETY = SafeUUID.unknown
+
+FILE_HEADER = Struct("<8sH")
+RECORD_HEADER = Struct("<BII")
+LENGTH = Struct("<I")
+BLOB_LENGTH = Struct("<Q")
+INTEGER = Struct("<q")
+REAL = Struct("<d")
+CHECKSUM = Struct("<I")
+
+Args = tuple[Any, ...]
+
+
+def uuid_from_bytes(raw: bytes) -> UUID:
+    value = object.__new__(UUID)
+    object.__setattr__(value, "int", int.from_bytes(raw))
+    object.__setattr__(value, "is_safe", UUID_SAFETY)
+    return value
+
+
+def iter_uuids(raw: bytes) -> Iterator[bytes]:
+    return (value for (value,) in iter_unpack(f"{UUID_SIZE}s", raw))
+
+
+def array_bytes(values: "array[Any]") -> bytes:
+    if sys.byteorder == "little":
+        return values.tobytes()
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def array_from(typecode: str, raw: bytes) -> "array[Any]":
+    values = array(typecode)
+    if len(raw) % values.itemsize:
+        raise ValueError(f"Array of {typecode!r} items has {len(raw)} bytes.")
+    values.frombytes(raw)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def texts_bytes(values: list[str]) -> tuple[bytes, bytes]:
+    encoded = [value.encode() for value in values]
+    return array_bytes(array("I", map(len, encoded))), b"".join(encoded)
+
+
+def texts_from(lengths: bytes, joined: bytes) -> list[str]:
+    values = []
+    start = 0
+    for length in array_from("I", lengths):
+        end = start + length
+        values.append(joined[start:end].decode())
+        start = end
+    if start != len(joined):
+        raise ValueError("Text lengths do not match the text data.")
+    return values
+
+
+def check_header(header: bytes, magic: bytes, path: str) -> None:
+    found, version = FILE_HEADER.unpack(header)
+    if found != magic:
+        raise ValueError(f"{path} is not a {magic.rstrip(bytes(1)).decode()} file.")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"{path} has format version {version}, expected {FORMAT_VERSION}."
+        )
+
+
+@dataclass
+class RecordWriter:
+    buffer: bytearray = field(default_factory=bytearray)
+
+    def uuid(self, value: UUID) -> None:
+        self.buffer += value.bytes
+
+    def text(self, value: str) -> None:
+        raw = value.encode()
+        self.buffer += LENGTH.pack(len(raw))
+        self.buffer += raw
+
+    def count(self, value: int) -> None:
+        self.buffer += LENGTH.pack(value)
+
+    def integer(self, value: int) -> None:
+        self.buffer += INTEGER.pack(value)
+
+    def real(self, value: float) -> None:
+        self.buffer += REAL.pack(value)
+
+
+@dataclass
+class RecordReader:
+    data: bytes
+    offset: int = 0
+
+    def take(self, size: int) -> bytes:
+        start = self.offset
+        end = start + size
+        if end > len(self.data):
+            raise ValueError("Record is shorter than its fields.")
+        self.offset = end
+        return self.data[start:end]
+
+    def uuid(self) -> UUID:
+        return uuid_from_bytes(self.take(UUID_SIZE))
+
+    def text(self) -> str:
+        return self.take(self.count()).decode()
+
+    def count(self) -> int:
+        (value,) = LENGTH.unpack(self.take(LENGTH.size))
+        return int(value)
+
+    def integer(self) -> int:
+        (value,) = INTEGER.unpack(self.take(INTEGER.size))
+        return int(value)
+
+    def real(self) -> float:
+        (value,) = REAL.unpack(self.take(REAL.size))
+        return float(value)
+
+    def finish(self) -> None:
+        if self.offset != len(self.data):
+            raise ValueError("Record has bytes after its last field.")
+
+
+def write_product(writer: RecordWriter, product: Product) -> None:
+    writer.uuid(product.id)
+    writer.uuid(product.unit_id)
+    writer.text(product.name)
+    writer.text(product.barcode)
+    writer.real(product.price)
+
+
+def read_product(reader: RecordReader) -> Product:
+    id = reader.uuid()
+    unit_id = reader.uuid()
+    name = reader.text()
+    barcode = reader.text()
+    return Product(unit_id, name, barcode, reader.real(), id)
+
+
+def write_unit_create(writer: RecordWriter, args: Args) -> None:
+    (unit,) = args
+    writer.uuid(unit.id)
+    writer.text(unit.name)
+
+
+def read_unit_create(reader: RecordReader) -> Args:
+    id = reader.uuid()
+    return (Unit(reader.text(), id),)
+
+
+def write_product_create(writer: RecordWriter, args: Args) -> None:
+    (product,) = args
+    write_product(writer, product)
+
+
+def read_product_create(reader: RecordReader) -> Args:
+    return (read_product(reader),)
+
+
+def write_product_create_many(writer: RecordWriter, args: Args) -> None:
+    (products,) = args
+    writer.count(len(products))
+    for product in products:
+        write_product(writer, product)
+
+
+def read_product_create_many(reader: RecordReader) -> Args:
+    return ([read_product(reader) for _ in range(reader.count())],)
+
+
+def write_price_update(writer: RecordWriter, args: Args) -> None:
+    product_id, new_price = args
+    writer.uuid(product_id)
+    writer.real(new_price)
+
+
+def read_price_update(reader: RecordReader) -> Args:
+    return reader.uuid(), reader.real()
+
+
+def write_receipt_create(writer: RecordWriter, args: Args) -> None:
+    (receipt,) = args
+    writer.uuid(receipt.id)
+    writer.text(receipt.status)
+    writer.real(receipt.total)
+    writer.count(len(receipt.products))
+    for line in receipt.products:
+        writer.uuid(line.id)
+        writer.integer(line.quantity)
+        writer.real(line.price)
+        writer.real(line.total)
+
+
+def read_receipt_create(reader: RecordReader) -> Args:
+    id = reader.uuid()
+    status = reader.text()
+    total = reader.real()
+    lines = [
+        ProductInReceipt(reader.uuid(), reader.integer(), reader.real(), reader.real())
+        for _ in range(reader.count())
+    ]
+    return (Receipt(status, total, lines, id),)
+
+
+def write_add_product(writer: RecordWriter, args: Args) -> None:
+    receipt_id, product_id, quantity = args
+    writer.uuid(receipt_id)
+    writer.uuid(product_id)
+    writer.integer(quantity)
+
+
+def read_add_product(reader: RecordReader) -> Args:
+    return reader.uuid(), reader.uuid(), reader.integer()
+
+
+def write_add_products(writer: RecordWriter, args: Args) -> None:
+    receipt_id, products = args
+    writer.uuid(receipt_id)
+    writer.count(len(products))
+    for product_id, quantity in products:
+        writer.uuid(product_id)
+        writer.integer(quantity)
+
+
+def read_add_products(reader: RecordReader) -> Args:
+    receipt_id = reader.uuid()
+    return receipt_id, [
+        (reader.uuid(), reader.integer()) for _ in range(reader.count())
+    ]
+
+
+def write_status_update(writer: RecordWriter, args: Args) -> None:
+    receipt_id, new_status = args
+    writer.uuid(receipt_id)
+    writer.text(new_status)
+
+
+def read_status_update(reader: RecordReader) -> Args:
+    return reader.uuid(), reader.text()
+
+
+def write_receipt_delete(writer: RecordWriter, args: Args) -> None:
+    (receipt_id,) = args
+    writer.uuid(receipt_id)
+
+
+def read_receipt_delete(reader: RecordReader) -> Args:
+    return (reader.uuid(),)
+
+
+@dataclass(frozen=True)
+class Operation:
+    opcode: int
+    repository: str
+    method: str
+    write: Callable[[RecordWriter, Args], None]
+    read: Callable[[RecordReader], Args]
+
+    def encode(self, args: Args) -> bytes:
+        writer = RecordWriter()
+        self.write(writer, args)
+        return bytes(writer.buffer)
+
+    def decode(self, payload: bytes) -> Args:
+        reader = RecordReader(payload)
+        args = self.read(reader)
+        reader.finish()
+        return args
+
+
+OPERATIONS = [
+    Operation(1, "units", "create", write_unit_create, read_unit_create),
+    Operation(2, "products", "create", write_product_create, read_product_create),
+    Operation(
+        3,
+        "products",
+        "create_many",
+        write_product_create_many,
+        read_product_create_many,
+    ),
+    Operation(4, "products", "update_price", write_price_update, read_price_update),
+    Operation(5, "receipts", "create", write_receipt_create, read_receipt_create),
+    Operation(6, "receipts", "add_product", write_add_product, read_add_product),
+    Operation(7, "receipts", "add_products", write_add_products, read_add_products),
+    Operation(8, "receipts", "update_status", write_status_update, read_status_update),
+    Operation(9, "receipts", "delete", write_receipt_delete, read_receipt_delete),
+]
+BY_OPCODE = {operation.opcode: operation for operation in OPERATIONS}
+BY_METHOD = {
+    (operation.repository, operation.method): operation for operation in OPERATIONS
+}
@@ -1,19 +1,26 @@
 from dataclasses import dataclass, field
+from time import time_ns
 from uuid import UUID
 
 from core.errors import AlreadyExistError, DoesNotExistError
 from core.unit import Unit
+from infra.in_memory.ordering import SortedBlocks
 
 
 @dataclass
 class UnitsInMemory:
     units: dict[UUID, Unit] = field(default_factory=dict)
+    names: dict[str, Unit] = field(default_factory=dict)
+    ids: SortedBlocks[UUID] = field(default_factory=SortedBlocks)
+    catalog_version: int = field(default_factory=time_ns)
 
     def create(self, unit: Unit) -> None:
-        for curr_unit in self.units.values():
-            if curr_unit.name == unit.name:
-                raise AlreadyExistError("Unit", "name", unit.name)
+        if unit.name in self.names:
+            raise AlreadyExistError("Unit", "name", unit.name)
         self.units[unit.id] = unit
+        self.names[unit.name] = unit
+        self.ids.add(unit.id)
+        self.catalog_version += 1
 
     def read(self, unit_id: UUID) -> Unit:
         try:
@@ -21,5 +28,17 @@ class UnitsInMemory:
         except KeyError:
             raise DoesNotExistError("Unit", "id", str(unit_id))
 
+    def read_by_name(self, name: str) -> Unit:
+        try:
+            return self.names[name]
+        except KeyError:
+            raise DoesNotExistError("Unit", "name", name)
+
     def read_all(self) -> list[Unit]:
         return list(self.units.values())
+
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Unit]:
+        return [self.units[unit_id] for unit_id in self.ids.page(limit, after)]
+
+    def version(self) -> int:
+        return self.catalog_version
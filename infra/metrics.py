@@ -0,0 +1,184 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, TypeVar, cast
+
+T = TypeVar("T")
+
+LATENCY_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(init=False)
+    sum: float = field(init=False, default=0)
+    _lock: Lock = field(init=False, default_factory=Lock)
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name: str, labels: Labels) -> list[str]:
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(
+                f"{name}_bucket{render_labels(labels + (('le', le),))} {cumulative}"
+            )
+        lines.append(f"{name}_sum{render_labels(labels)} {total}")
+        lines.append(f"{name}_count{render_labels(labels)} {cumulative}")
+        return lines
+
+
+@dataclass
+class Sample:
+    kind: str
+    help: str
+    read: Callable[[], float]
+
+
+@dataclass
+class Metrics:
+    requests: dict[tuple[str, str, int], int] = field(default_factory=dict)
+    in_flight: dict[tuple[str, str], int] = field(default_factory=dict)
+    request_latency: dict[tuple[str, str], Histogram] = field(default_factory=dict)
+    repository_latency: dict[str, Histogram] = field(default_factory=dict)
+    samples: dict[str, Sample] = field(default_factory=dict)
+
+    def register(
+        self, name: str, kind: str, help: str, read: Callable[[], float]
+    ) -> None:
+        self.samples[name] = Sample(kind, help, read)
+
+    def request_started(self, method: str, route: str) -> None:
+        key = (method, route)
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def request_finished(
+        self, method: str, route: str, status: int, elapsed: float
+    ) -> None:
+        key = (method, route)
+        self.in_flight[key] -= 1
+        counter = (method, route, status)
+        self.requests[counter] = self.requests.get(counter, 0) + 1
+        if key not in self.request_latency:
+            self.request_latency[key] = Histogram()
+        self.request_latency[key].observe(elapsed)
+
+    def repository_histogram(self, method: str) -> Histogram:
+        return self.repository_latency.setdefault(method, Histogram())
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_total HTTP requests served.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            counter: Labels = (
+                ("method", method),
+                ("route", route),
+                ("status", str(status)),
+            )
+            lines.append(f"http_requests_total{render_labels(counter)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests being served.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for (method, route), count in sorted(self.in_flight.items()):
+            labels = (("method", method), ("route", route))
+            lines.append(f"http_requests_in_flight{render_labels(labels)} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.request_latency.items()):
+            labels = (("method", method), ("route", route))
+            lines += histogram.render("http_request_duration_seconds", labels)
+
+        lines += [
+            "# HELP repository_call_duration_seconds Repository method latency.",
+            "# TYPE repository_call_duration_seconds histogram",
+        ]
+        for method, histogram in sorted(self.repository_latency.items()):
+            lines += histogram.render(
+                "repository_call_duration_seconds", (("method", method),)
+            )
+
+        for name, sample in sorted(self.samples.items()):
+            lines += [
+                f"# HELP {name} {sample.help}",
+                f"# TYPE {name} {sample.kind}",
+                f"{name} {sample.read()}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def render_labels(labels: Labels) -> str:
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class InstrumentedRepository:
+    repository: object
+    name: str
+    metrics: Metrics
+
+    def __getattr__(self, attribute: str) -> Any:
+        target = getattr(self.repository, attribute)
+        if not callable(target):
+            return target
+
+        histogram = self.metrics.repository_histogram(f"{self.name}.{attribute}")
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return target(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - start)
+
+        setattr(self, attribute, timed)
+        return timed
+
+
+def instrument(repository: T, name: str, metrics: Metrics) -> T:
+    return cast(T, InstrumentedRepository(repository, name, metrics))
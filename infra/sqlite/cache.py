@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from sqlite3 import Connection
+from threading import Lock
+from typing import Callable, Generic, Hashable, Iterator, TypeVar
+from uuid import UUID
+
+from core.product import Product, ProductError
+from core.unit import Unit
+from infra.constants import READ_CACHE_SIZE
+from infra.sqlite.connection_pool import MEMORY_DATABASE, ConnectionPool
+from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.units import UnitsDatabase
+from infra.sqlite.versions import read_catalog_version
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    capacity: int
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class ReadCache(Generic[V]):
+    pool: ConnectionPool
+    catalog: str
+    capacity: int = READ_CACHE_SIZE
+    _entries: OrderedDict[Hashable, V] = field(init=False, default_factory=OrderedDict)
+    _stats: CacheStats = field(init=False)
+    _lock: Lock = field(init=False, default_factory=Lock)
+    _watcher: Connection | None = field(init=False, default=None)
+    _data_version: int | None = field(init=False, default=None)
+    _catalog_version: int | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._stats = CacheStats(self.capacity)
+        if self.pool.database_name != MEMORY_DATABASE:
+            self._watcher = self.pool.open()
+
+    def get(self, key: Hashable, load: Callable[[], V]) -> V:
+        with self._lock:
+            version = self._validate()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return self._entries[key]
+            self._stats.misses += 1
+
+        value = load()
+        with self._lock:
+            if version == self._catalog_version:
+                self._entries[key] = value
+                if len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return value
+
+    def version(self) -> int:
+        with self._lock:
+            return self._validate()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+
+    def _validate(self) -> int:
+        if self._watcher is None:
+            with self.pool.connection() as con:
+                return self._refresh(read_catalog_version(con, self.catalog))
+
+        (data_version,) = self._watcher.execute("PRAGMA data_version").fetchone()
+        if self._catalog_version is not None and data_version == self._data_version:
+            return self._catalog_version
+        self._data_version = data_version
+        return self._refresh(read_catalog_version(self._watcher, self.catalog))
+
+    def _refresh(self, version: int) -> int:
+        if version != self._catalog_version:
+            if self._entries:
+                self._stats.invalidations += 1
+            self._entries.clear()
+            self._catalog_version = version
+        return version
+
+
+@dataclass
+class CachedUnitsDatabase:
+    units: UnitsDatabase
+    capacity: int = READ_CACHE_SIZE
+    cache: ReadCache[Unit] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cache = ReadCache(self.units.pool, "units", self.capacity)
+
+    def create(self, unit: Unit) -> None:
+        self.units.create(unit)
+
+    def read(self, unit_id: UUID) -> Unit:
+        return self.cache.get(("id", unit_id), lambda: self.units.read(unit_id))
+
+    def read_by_name(self, name: str) -> Unit:
+        return self.cache.get(("name", name), lambda: self.units.read_by_name(name))
+
+    def read_all(self) -> list[Unit]:
+        return self.units.read_all()
+
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Unit]:
+        return self.units.read_page(limit, after)
+
+    def version(self) -> int:
+        return self.cache.version()
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
+
+
+@dataclass
+class CachedProductsDatabase:
+    products: ProductsDatabase
+    capacity: int = READ_CACHE_SIZE
+    cache: ReadCache[Product] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cache = ReadCache(self.products.pool, "products", self.capacity)
+
+    def create(self, product: Product) -> None:
+        self.products.create(product)
+
+    def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        return self.products.create_many(products)
+
+    def read(self, product_id: UUID) -> Product:
+        return self.cache.get(
+            ("id", product_id), lambda: self.products.read(product_id)
+        )
+
+    def read_by_barcode(self, barcode: str) -> Product:
+        return self.cache.get(
+            ("barcode", barcode), lambda: self.products.read_by_barcode(barcode)
+        )
+
+    def read_all(self) -> list[Product]:
+        return self.products.read_all()
+
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        return self.products.read_page(limit, after)
+
+    def iterate(self) -> Iterator[Product]:
+        return self.products.iterate()
+
+    def update_price(self, product_id: UUID, new_price: float) -> None:
+        self.products.update_price(product_id, new_price)
+
+    def version(self) -> int:
+        return self.cache.version()
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
@@ -0,0 +1,91 @@
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from queue import Empty, LifoQueue
+from sqlite3 import Connection
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Iterator, TypeVar
+
+from infra.sqlite.profiles import DEFAULT_PROFILE, PROFILES, PerformanceProfile
+
+MEMORY_DATABASE = ":memory:"
+
+T = TypeVar("T")
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checkouts: int = 0
+    waits: int = 0
+    wait_time: float = 0
+    max_wait_time: float = 0
+
+
+@dataclass
+class ConnectionPool:
+    database_name: str
+    size: int = 1
+    profile: PerformanceProfile = PROFILES[DEFAULT_PROFILE]
+    _connections: LifoQueue[Connection] = field(init=False, default_factory=LifoQueue)
+    _stats: PoolStats = field(init=False)
+    _lock: Lock = field(init=False, default_factory=Lock)
+
+    def __post_init__(self) -> None:
+        if self.database_name == MEMORY_DATABASE:
+            self.size = 1
+        self._stats = PoolStats(self.size)
+        for _ in range(self.size):
+            self._connections.put(self._connect())
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        con = self._checkout()
+        try:
+            yield con
+        finally:
+            if con.in_transaction:
+                con.rollback()
+            self._connections.put(con)
+
+    def write(self, operation: Callable[[Connection], T]) -> T:
+        with self.connection() as con:
+            con.execute("begin immediate")
+            result = operation(con)
+            con.commit()
+        return result
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def open(self) -> Connection:
+        return self._connect()
+
+    def close(self) -> None:
+        for _ in range(self.size):
+            self._connections.get().close()
+
+    def _connect(self) -> Connection:
+        con = sqlite3.connect(self.database_name, check_same_thread=False)
+        con.execute("PRAGMA foreign_keys = 1")
+        self.profile.apply(con)
+        return con
+
+    def _checkout(self) -> Connection:
+        try:
+            con = self._connections.get_nowait()
+            wait_time = 0.0
+        except Empty:
+            start = perf_counter()
+            con = self._connections.get()
+            wait_time = perf_counter() - start
+
+        with self._lock:
+            self._stats.checkouts += 1
+            if wait_time > 0:
+                self._stats.waits += 1
+                self._stats.wait_time += wait_time
+                self._stats.max_wait_time = max(self._stats.max_wait_time, wait_time)
+        return con
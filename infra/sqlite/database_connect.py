@@ -1,31 +1,84 @@
-import sqlite3
+import os
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor
+from sqlite3 import Connection, complete_statement
 
-from infra.constants import SQL_FILE_TEST
+from infra.constants import MIGRATIONS_DIR_TEST, SQL_FILE_TEST
+from infra.sqlite.connection_pool import ConnectionPool
+from infra.sqlite.profiles import DEFAULT_PROFILE, PROFILES, PerformanceProfile
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+
+def load_migrations(migrations_dir: str) -> list[Migration]:
+    migrations = []
+    for file_name in sorted(os.listdir(migrations_dir)):
+        if not file_name.endswith(".sql"):
+            continue
+        with open(os.path.join(migrations_dir, file_name), "r") as sql_file:
+            sql = sql_file.read()
+        version, _, name = file_name.removesuffix(".sql").partition("_")
+        migrations.append(Migration(int(version), name, sql))
+    return migrations
+
+
+def split_statements(sql: str) -> list[str]:
+    statements = []
+    statement = ""
+    for part in sql.split(";"):
+        statement += part + ";"
+        if complete_statement(statement):
+            statements.append(statement.strip())
+            statement = ""
+    return [statement for statement in statements if statement != ";"]
 
 
 @dataclass
 class Database:
     database_name: str
     sql_file: str = SQL_FILE_TEST
+    migrations_dir: str = MIGRATIONS_DIR_TEST
+    pool_size: int = 1
+    profile: PerformanceProfile = PROFILES[DEFAULT_PROFILE]
 
     def __post_init__(self) -> None:
-        self.con = sqlite3.connect(self.database_name, check_same_thread=False)
-        self.con.execute("PRAGMA foreign_keys = 1")
-        self.cur = self.con.cursor()
+        self.pool = ConnectionPool(self.database_name, self.pool_size, self.profile)
 
     def initial(self) -> None:
         with open(self.sql_file, "r") as sql_file:
             sql = sql_file.read()
-        self.cur.executescript(sql)
-        self.con.commit()
+        with self.pool.connection() as con:
+            con.executescript(sql)
+            con.commit()
+        self.migrate()
+
+    def migrate(self) -> None:
+        for migration in load_migrations(self.migrations_dir):
+            if migration.version > self.schema_version():
+                self._apply(migration)
+
+    def schema_version(self) -> int:
+        with self.pool.connection() as con:
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+        return int(version)
 
     def close_database(self) -> None:
-        self.con.close()
+        self.pool.close()
+
+    def get_pool(self) -> ConnectionPool:
+        return self.pool
 
-    def get_connection(self) -> Connection:
-        return self.con
+    def _apply(self, migration: Migration) -> None:
+        def apply(con: Connection) -> None:
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+            if version >= migration.version:
+                return
+            for statement in split_statements(migration.sql):
+                con.execute(statement)
+            con.execute(f"PRAGMA user_version = {migration.version}")
 
-    def get_cursor(self) -> Cursor:
-        return self.cur
+        self.pool.write(apply)
@@ -0,0 +1,119 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from queue import Empty, SimpleQueue
+from sqlite3 import Connection
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, TypeVar
+
+from infra.constants import GROUP_COMMIT_BATCH_SIZE, GROUP_COMMIT_WINDOW
+from infra.sqlite.connection_pool import ConnectionPool
+
+T = TypeVar("T")
+
+
+@dataclass
+class GroupCommitStats:
+    window: float
+    batch_size: int
+    commits: int = 0
+    operations: int = 0
+    largest_batch: int = 0
+    commits_per_second: float = 0
+    mean_batch_size: float = 0
+
+
+@dataclass
+class PendingWrite:
+    operation: Callable[[Connection], Any]
+    future: Future[Any] = field(default_factory=Future)
+    result: Any = None
+    error: BaseException | None = None
+
+
+@dataclass
+class GroupCommitter:
+    pool: ConnectionPool
+    window: float = GROUP_COMMIT_WINDOW
+    batch_size: int = GROUP_COMMIT_BATCH_SIZE
+    _queue: SimpleQueue[PendingWrite | None] = field(
+        init=False, default_factory=SimpleQueue
+    )
+    _stats: GroupCommitStats = field(init=False)
+    _lock: Lock = field(init=False, default_factory=Lock)
+    _started: float = field(init=False, default_factory=perf_counter)
+    _thread: Thread = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._stats = GroupCommitStats(self.window, self.batch_size)
+        self._thread = Thread(target=self._run, name="pos-sqlite-commit", daemon=True)
+        self._thread.start()
+
+    def write(self, operation: Callable[[Connection], T]) -> T:
+        pending = PendingWrite(operation)
+        self._queue.put(pending)
+        result: T = pending.future.result()
+        return result
+
+    def stats(self) -> GroupCommitStats:
+        with self._lock:
+            stats = replace(self._stats)
+        elapsed = perf_counter() - self._started
+        stats.commits_per_second = stats.commits / elapsed
+        stats.mean_batch_size = stats.operations / max(stats.commits, 1)
+        return stats
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        running = True
+        while running and (pending := self._queue.get()) is not None:
+            running = self._commit(pending)
+
+    def _commit(self, first: PendingWrite) -> bool:
+        batch = [first]
+        running = True
+        try:
+            with self.pool.connection() as con:
+                con.execute("begin immediate")
+                self._apply(con, first)
+                deadline = perf_counter() + self.window
+                while len(batch) < self.batch_size:
+                    try:
+                        pending = self._queue.get(
+                            timeout=max(deadline - perf_counter(), 0)
+                        )
+                    except Empty:
+                        break
+                    if pending is None:
+                        running = False
+                        break
+                    batch.append(pending)
+                    self._apply(con, pending)
+                con.commit()
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return running
+
+        with self._lock:
+            self._stats.commits += 1
+            self._stats.operations += len(batch)
+            self._stats.largest_batch = max(self._stats.largest_batch, len(batch))
+        for pending in batch:
+            if pending.error is None:
+                pending.future.set_result(pending.result)
+            else:
+                pending.future.set_exception(pending.error)
+        return running
+
+    def _apply(self, con: Connection, pending: PendingWrite) -> None:
+        con.execute("savepoint operation")
+        try:
+            pending.result = pending.operation(con)
+        except Exception as e:
+            pending.error = e
+            con.execute("rollback to operation")
+        con.execute("release operation")
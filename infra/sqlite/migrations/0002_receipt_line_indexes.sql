@@ -0,0 +1,21 @@
+CREATE TABLE products_in_receipts_new
+(
+    id         INTEGER PRIMARY KEY autoincrement,
+    receipt_id UUID not null,
+    product_id UUID not null,
+    quantity   integer not null check ( quantity > 0 ),
+    foreign key (receipt_id) references receipts (id) on delete cascade,
+    foreign key (product_id) references products (id)
+);
+
+INSERT INTO products_in_receipts_new (id, receipt_id, product_id, quantity)
+SELECT id, receipt_id, product_id, quantity
+FROM products_in_receipts;
+
+DROP TABLE products_in_receipts;
+
+ALTER TABLE products_in_receipts_new RENAME TO products_in_receipts;
+
+CREATE INDEX products_in_receipts_receipt_id ON products_in_receipts (receipt_id);
+CREATE INDEX products_in_receipts_product_id ON products_in_receipts (product_id);
+CREATE INDEX receipts_status ON receipts (status);
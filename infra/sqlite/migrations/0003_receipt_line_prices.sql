@@ -0,0 +1,6 @@
+ALTER TABLE products_in_receipts ADD COLUMN price float not null default 0;
+ALTER TABLE products_in_receipts ADD COLUMN total float not null default 0;
+
+UPDATE products_in_receipts
+SET price = (SELECT price FROM products WHERE products.id = products_in_receipts.product_id),
+    total = quantity * (SELECT price FROM products WHERE products.id = products_in_receipts.product_id);
@@ -0,0 +1,23 @@
+CREATE TABLE IF NOT EXISTS catalog_versions (
+    name text primary key,
+    version integer not null
+);
+
+INSERT OR IGNORE INTO catalog_versions(name, version)
+VALUES ('units', CAST(strftime('%s', 'now') AS integer) * 1000000),
+       ('products', CAST(strftime('%s', 'now') AS integer) * 1000000);
+
+CREATE TRIGGER IF NOT EXISTS units_version_insert AFTER INSERT ON units
+BEGIN
+    UPDATE catalog_versions SET version = version + 1 WHERE name = 'units';
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_version_insert AFTER INSERT ON products
+BEGIN
+    UPDATE catalog_versions SET version = version + 1 WHERE name = 'products';
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_version_update AFTER UPDATE ON products
+BEGIN
+    UPDATE catalog_versions SET version = version + 1 WHERE name = 'products';
+END;
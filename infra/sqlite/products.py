@@ -1,65 +1,146 @@
+import json
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor, IntegrityError
+from sqlite3 import Connection, IntegrityError
+from typing import Callable, Iterator, TypeVar
 from uuid import UUID
 
 from core.errors import AlreadyExistError, DoesNotExistError
-from core.product import Product
+from core.product import Product, ProductError, check_new_products
+from infra.constants import ITERATE_BATCH_SIZE
+from infra.sqlite.connection_pool import ConnectionPool
+from infra.sqlite.group_commit import GroupCommitter
+from infra.sqlite.versions import read_catalog_version
+
+T = TypeVar("T")
+
+INSERT_PRODUCT = (
+    "insert into products(id, unit_id, name, barcode, price) values (?,?,?,?,?)"
+)
+
+
+def product_row(product: Product) -> tuple[str, str, str, str, float]:
+    return (
+        str(product.id),
+        str(product.unit_id),
+        product.name,
+        product.barcode,
+        product.price,
+    )
 
 
 @dataclass
 class ProductsDatabase:
-    con: Connection
-    cur: Cursor
+    pool: ConnectionPool
+    committer: GroupCommitter | None = None
 
     def create(self, product: Product) -> None:
-        try:
-            self.cur.executemany(
-                "insert into products(id, unit_id, name, barcode, price) "
-                "values (?,?,?,?,?)",
+        def insert(con: Connection) -> None:
+            try:
+                con.executemany(INSERT_PRODUCT, [product_row(product)])
+            except IntegrityError as e:
+                error_message = str(e)
+                if "FOREIGN KEY constraint failed" in error_message:
+                    raise DoesNotExistError("Unit", "id", str(product.unit_id))
+                elif (
+                    "UNIQUE constraint failed" in error_message
+                    and "barcode" in error_message
+                ):
+                    raise AlreadyExistError("Product", "barcode", product.barcode)
+
+        self._write(insert)
+
+    def create_many(self, products: list[Product]) -> list[ProductError | None]:
+        unit_ids = {str(product.unit_id) for product in products}
+        barcodes = {product.barcode for product in products}
+
+        def insert(con: Connection) -> list[ProductError | None]:
+            res = con.execute(
+                "select id from units where id in (select value from json_each(?))",
+                [json.dumps(list(unit_ids))],
+            )
+            missing_units = {UUID(id) for id in unit_ids - {id for (id,) in res}}
+            res = con.execute(
+                "select barcode from products"
+                " where barcode in (select value from json_each(?))",
+                [json.dumps(list(barcodes))],
+            )
+            taken_barcodes = {barcode for (barcode,) in res}
+            errors = check_new_products(products, missing_units, taken_barcodes)
+
+            con.executemany(
+                INSERT_PRODUCT,
                 [
-                    (
-                        str(product.id),
-                        str(product.unit_id),
-                        product.name,
-                        product.barcode,
-                        product.price,
-                    )
+                    product_row(product)
+                    for product, error in zip(products, errors)
+                    if error is None
                 ],
             )
-            self.con.commit()
-        except IntegrityError as e:
-            error_message = str(e)
-            if "FOREIGN KEY constraint failed" in error_message:
-                raise DoesNotExistError("Unit", "id", str(product.unit_id))
-            elif (
-                "UNIQUE constraint failed" in error_message
-                and "barcode" in error_message
-            ):
-                raise AlreadyExistError("Product", "barcode", product.barcode)
+            return errors
+
+        return self._write(insert)
 
     def read(self, product_id: UUID) -> Product:
-        res = self.cur.execute("select * from products where id = ?", [str(product_id)])
-        result = res.fetchone()
+        with self.pool.connection() as con:
+            res = con.execute("select * from products where id = ?", [str(product_id)])
+            result = res.fetchone()
         if result is not None and result[0] is not None:
             (id, unit_id, name, barcode, price) = result
             return Product(UUID(unit_id), name, barcode, price, UUID(id))
         else:
             raise DoesNotExistError("Product", "id", str(product_id))
 
+    def read_by_barcode(self, barcode: str) -> Product:
+        with self.pool.connection() as con:
+            res = con.execute("select * from products where barcode = ?", [barcode])
+            result = res.fetchone()
+        if result is not None:
+            (id, unit_id, name, barcode, price) = result
+            return Product(UUID(unit_id), name, barcode, price, UUID(id))
+        else:
+            raise DoesNotExistError("Product", "barcode", barcode)
+
     def read_all(self) -> list[Product]:
         products = []
-        res = self.cur.execute("select * from products")
-        for row in res.fetchall():
+        with self.pool.connection() as con:
+            res = con.execute("select * from products")
+            rows = res.fetchall()
+        for row in rows:
             (id, unit_id, name, barcode, price) = row
             products.append(Product(UUID(unit_id), name, barcode, price, UUID(id)))
         return products
 
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Product]:
+        with self.pool.connection() as con:
+            res = con.execute(
+                "select * from products where id > ? order by id limit ?",
+                [str(after or ""), limit],
+            )
+            rows = res.fetchall()
+        return [
+            Product(UUID(unit_id), name, barcode, price, UUID(id))
+            for id, unit_id, name, barcode, price in rows
+        ]
+
+    def iterate(self) -> Iterator[Product]:
+        after = None
+        while page := self.read_page(ITERATE_BATCH_SIZE, after):
+            yield from page
+            after = page[-1].id
+
     def update_price(self, product_id: UUID, new_price: float) -> None:
-        self.cur.executemany(
-            "update products set price=? where id = ?",
-            [(round(new_price, 2), str(product_id))],
-        )
-        if self.cur.rowcount <= 0:
-            raise DoesNotExistError("Product", "id", str(product_id))
+        def update(con: Connection) -> None:
+            cur = con.executemany(
+                "update products set price=? where id = ?",
+                [(round(new_price, 2), str(product_id))],
+            )
+            if cur.rowcount <= 0:
+                raise DoesNotExistError("Product", "id", str(product_id))
+
+        self._write(update)
+
+    def version(self) -> int:
+        with self.pool.connection() as con:
+            return read_catalog_version(con, "products")
 
-        self.con.commit()
+    def _write(self, operation: Callable[[Connection], T]) -> T:
+        return (self.committer or self.pool).write(operation)
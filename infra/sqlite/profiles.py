@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from sqlite3 import Connection
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    journal_mode: str
+    synchronous: str
+    mmap_size: int
+    cache_size: int
+    temp_store: str
+    busy_timeout: int
+
+    def apply(self, con: Connection) -> None:
+        con.execute(f"PRAGMA busy_timeout = {self.busy_timeout}")
+        con.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        con.execute(f"PRAGMA synchronous = {self.synchronous}")
+        con.execute(f"PRAGMA mmap_size = {self.mmap_size}")
+        con.execute(f"PRAGMA cache_size = {self.cache_size}")
+        con.execute(f"PRAGMA temp_store = {self.temp_store}")
+
+
+DEFAULT_PROFILE = "durable"
+
+PROFILES = {
+    "durable": PerformanceProfile("wal", "full", 0, -2_000, "default", 5_000),
+    "balanced": PerformanceProfile(
+        "wal", "normal", 256 * 1024 * 1024, -64_000, "memory", 5_000
+    ),
+    "fast": PerformanceProfile(
+        "wal", "off", 1024 * 1024 * 1024, -256_000, "memory", 5_000
+    ),
+}
+
+
+def get_profile(name: str) -> PerformanceProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown SQLite profile {name!r}; expected one of {', '.join(PROFILES)}."
+        )
@@ -1,118 +1,178 @@
+import json
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor, IntegrityError
+from sqlite3 import Connection, IntegrityError
+from typing import Callable, Iterator, TypeVar
 from uuid import UUID
 
 from core.errors import ClosedReceiptError, DoesNotExistError
-from core.receipt import ProductInReceipt, Receipt, Sales
-from infra.sqlite.products import ProductsDatabase
+from core.receipt import ProductInReceipt, Receipt, Sales, check_quantities
+from infra.constants import ITERATE_BATCH_SIZE
+from infra.sqlite.connection_pool import ConnectionPool
+from infra.sqlite.group_commit import GroupCommitter
+
+T = TypeVar("T")
+
+
+def add_line(
+    receipt: Receipt,
+    product_id: str | None,
+    quantity: int,
+    price: float,
+    total: float,
+) -> None:
+    if product_id is not None:
+        receipt.total += total
+        receipt.products.append(
+            ProductInReceipt(UUID(product_id), quantity, price, total)
+        )
 
 
 @dataclass
 class ReceiptsDatabase:
-    con: Connection
-    cur: Cursor
+    pool: ConnectionPool
+    committer: GroupCommitter | None = None
 
     def create(self, receipt: Receipt) -> None:
-        self.cur.executemany(
-            "insert into receipts(id, status) values (?,?)",
-            [(str(receipt.id), receipt.status)],
-        )
-        self.con.commit()
-
-    def add_product(self, receipt_id: UUID, product_id: UUID, quantity: int) -> Receipt:
-        try:
-            self.cur.executemany(
-                "insert into products_in_receipts(receipt_id, product_id, quantity)"
-                " values (?,?,?)",
-                [(str(receipt_id), str(product_id), quantity)],
+        def insert(con: Connection) -> None:
+            con.executemany(
+                "insert into receipts(id, status) values (?,?)",
+                [(str(receipt.id), receipt.status)],
             )
-        except IntegrityError as e:
-            error_message = str(e)
-            if "FOREIGN KEY constraint failed" in error_message:
-                ProductsDatabase(self.con, self.cur).read(product_id)
 
-        self.con.commit()
+        self._write(insert)
 
+    def add_product(self, receipt_id: UUID, product_id: UUID, quantity: int) -> Receipt:
+        return self.add_products(receipt_id, [(product_id, quantity)])
+
+    def add_products(
+        self, receipt_id: UUID, products: list[tuple[UUID, int]]
+    ) -> Receipt:
+        check_quantities(products)
+
+        def insert(con: Connection) -> None:
+            try:
+                cur = con.executemany(
+                    "insert into products_in_receipts"
+                    "(receipt_id, product_id, quantity, price, total)"
+                    " select ?, id, ?, price, price * ? from products where id = ?",
+                    [
+                        (str(receipt_id), quantity, quantity, str(product_id))
+                        for product_id, quantity in products
+                    ],
+                )
+            except IntegrityError as e:
+                if "FOREIGN KEY constraint failed" in str(e):
+                    raise DoesNotExistError("Receipt", "id", str(receipt_id))
+                raise
+            if cur.rowcount < len(products):
+                self._check_products(con, products)
+
+        self._write(insert)
         return self.read(receipt_id)
 
     def read(self, receipt_id: UUID) -> Receipt:
-        res_receipts = self.cur.execute(
-            "select * from receipts where id = ?", [(str(receipt_id))]
-        )
-        result_receipts = res_receipts.fetchone()
-        if result_receipts is None or result_receipts[0] is None:
+        with self.pool.connection() as con:
+            res = con.execute(
+                "select receipts.status, products_in_receipts.product_id,"
+                " products_in_receipts.quantity, products_in_receipts.price,"
+                " products_in_receipts.total"
+                " from receipts"
+                " left join products_in_receipts"
+                " on products_in_receipts.receipt_id = receipts.id"
+                " where receipts.id = ?"
+                " order by products_in_receipts.id",
+                [str(receipt_id)],
+            )
+            rows = res.fetchall()
+        if not rows:
             raise DoesNotExistError("Receipt", "id", str(receipt_id))
 
-        (
-            receipt_id,
-            status,
-        ) = result_receipts
+        receipt = Receipt(rows[0][0], id=receipt_id)
+        for _, product_id, quantity, price, total in rows:
+            add_line(receipt, product_id, quantity, price, total)
 
-        receipt_total = 0
-        products_in_receipts = []
-        res_products_in_receipts = self.cur.execute(
-            "select * from products_in_receipts where receipt_id = ?",
-            [(str(receipt_id))],
-        )
-        for row in res_products_in_receipts.fetchall():
-            (products_in_receipts_id, receipt_id, product_id, quantity) = row
-            product = ProductsDatabase(self.con, self.cur).read(product_id)
-            total = product.price * quantity
-            receipt_total += total
-            products_in_receipts.append(
-                ProductInReceipt(UUID(product_id), quantity, product.price, total)
-            )
+        return receipt
 
-        return Receipt(
-            status, receipt_total, products_in_receipts, UUID(str(receipt_id))
-        )
+    def iterate(self) -> Iterator[Receipt]:
+        after = None
+        while page := self._read_page(ITERATE_BATCH_SIZE, after):
+            yield from page
+            after = page[-1].id
 
     def update_status(self, receipt_id: UUID, new_status: str) -> None:
-        self.cur.executemany(
-            "update receipts set status=? where id = ?",
-            [(new_status, str(receipt_id))],
-        )
-        if self.cur.rowcount <= 0:
-            raise DoesNotExistError("Receipt", "id", str(receipt_id))
+        def update(con: Connection) -> None:
+            cur = con.executemany(
+                "update receipts set status=? where id = ?",
+                [(new_status, str(receipt_id))],
+            )
+            if cur.rowcount <= 0:
+                raise DoesNotExistError("Receipt", "id", str(receipt_id))
 
-        self.con.commit()
+        self._write(update)
 
     def delete(self, receipt_id: UUID) -> None:
-        receipt = self.read(receipt_id)
-        if receipt.status == "closed":
+        def delete(con: Connection) -> None:
+            cur = con.executemany(
+                "delete from receipts where id = ? and status != 'closed'",
+                [(str(receipt_id),)],
+            )
+            if cur.rowcount > 0:
+                return
+            res = con.execute("select 1 from receipts where id = ?", [str(receipt_id)])
+            if res.fetchone() is None:
+                raise DoesNotExistError("Receipt", "id", str(receipt_id))
             raise ClosedReceiptError("Receipt", "id", str(receipt_id))
-        self.cur.executemany(
-            "delete from receipts where id = ?",
-            [(str(receipt_id),)],
-        )
 
-        self.con.commit()
+        self._write(delete)
 
     def read_sales(self) -> Sales:
-        n_receipts = 0
-        revenue = 0
-
-        res_receipts = self.cur.execute(
-            "select id from receipts where status = 'closed'"
-        )
-        for row in res_receipts.fetchall():
-            (receipt_id,) = row
+        with self.pool.connection() as con:
+            res = con.execute(
+                "select (select count(*) from receipts where status = 'closed'),"
+                " coalesce(sum(products_in_receipts.total), 0)"
+                " from receipts"
+                " join products_in_receipts"
+                " on products_in_receipts.receipt_id = receipts.id"
+                " where receipts.status = 'closed'"
+            )
+            n_receipts, revenue = res.fetchone()
 
-            n_receipts += 1
+        return Sales(n_receipts, revenue)
 
-            res_products_in_receipts = self.cur.execute(
-                "select * from products_in_receipts where receipt_id = ?",
-                [(str(receipt_id))],
+    def _read_page(self, limit: int, after: UUID | None) -> list[Receipt]:
+        with self.pool.connection() as con:
+            res = con.execute(
+                "select receipts.id, receipts.status, products_in_receipts.product_id,"
+                " products_in_receipts.quantity, products_in_receipts.price,"
+                " products_in_receipts.total"
+                " from (select id, status from receipts where id > ?"
+                " order by id limit ?) as receipts"
+                " left join products_in_receipts"
+                " on products_in_receipts.receipt_id = receipts.id"
+                " order by receipts.id, products_in_receipts.id",
+                [str(after or ""), limit],
             )
-            for products_in_receipts_row in res_products_in_receipts.fetchall():
-                (
-                    products_in_receipts_id,
-                    receipt_id,
-                    product_id,
-                    quantity,
-                ) = products_in_receipts_row
-
-                product = ProductsDatabase(self.con, self.cur).read(product_id)
-                revenue += product.price * quantity
+            rows = res.fetchall()
+
+        receipts: list[Receipt] = []
+        for receipt_id, status, product_id, quantity, price, total in rows:
+            if not receipts or str(receipts[-1].id) != receipt_id:
+                receipts.append(Receipt(status, id=UUID(receipt_id)))
+            add_line(receipts[-1], product_id, quantity, price, total)
+        return receipts
+
+    def _check_products(
+        self, con: Connection, products: list[tuple[UUID, int]]
+    ) -> None:
+        product_ids = [str(product_id) for product_id, _ in products]
+        res = con.execute(
+            "select id from products where id in (select value from json_each(?))",
+            [json.dumps(product_ids)],
+        )
+        known_ids = {id for (id,) in res}
+        for product_id in product_ids:
+            if product_id not in known_ids:
+                raise DoesNotExistError("Product", "id", product_id)
 
-        return Sales(n_receipts, revenue)
+    def _write(self, operation: Callable[[Connection], T]) -> T:
+        return (self.committer or self.pool).write(operation)
@@ -1,41 +1,77 @@
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor, IntegrityError
+from sqlite3 import Connection, IntegrityError
+from typing import Callable, TypeVar
 from uuid import UUID
 
 from core.errors import AlreadyExistError, DoesNotExistError
 from core.unit import Unit
+from infra.sqlite.connection_pool import ConnectionPool
+from infra.sqlite.group_commit import GroupCommitter
+from infra.sqlite.versions import read_catalog_version
+
+T = TypeVar("T")
 
 
 @dataclass
 class UnitsDatabase:
-    con: Connection
-    cur: Cursor
+    pool: ConnectionPool
+    committer: GroupCommitter | None = None
 
     def create(self, unit: Unit) -> None:
-        try:
-            self.cur.executemany(
-                "insert into units(id, name) values (?,?)",
-                [(str(unit.id), unit.name)],
-            )
-        except IntegrityError:
-            raise AlreadyExistError("Unit", "name", unit.name)
-        self.con.commit()
+        def insert(con: Connection) -> None:
+            try:
+                con.executemany(
+                    "insert into units(id, name) values (?,?)",
+                    [(str(unit.id), unit.name)],
+                )
+            except IntegrityError:
+                raise AlreadyExistError("Unit", "name", unit.name)
+
+        self._write(insert)
 
     def read(self, unit_id: UUID) -> Unit:
-        res = self.cur.execute("select * from units where id = ?", [str(unit_id)])
-        result = res.fetchone()
+        with self.pool.connection() as con:
+            res = con.execute("select * from units where id = ?", [str(unit_id)])
+            result = res.fetchone()
         if result is not None and result[0] is not None:
             return Unit(result[1], UUID(result[0]))
         else:
             raise DoesNotExistError("Unit", "id", str(unit_id))
 
+    def read_by_name(self, name: str) -> Unit:
+        with self.pool.connection() as con:
+            res = con.execute("select * from units where name = ?", [name])
+            result = res.fetchone()
+        if result is not None:
+            return Unit(result[1], UUID(result[0]))
+        else:
+            raise DoesNotExistError("Unit", "name", name)
+
     def read_all(self) -> list[Unit]:
         units = []
-        res = self.cur.execute("select * from units")
-        for row in res.fetchall():
+        with self.pool.connection() as con:
+            res = con.execute("select * from units")
+            rows = res.fetchall()
+        for row in rows:
             (
                 id,
                 name,
             ) = row
             units.append(Unit(name, UUID(id)))
         return units
+
+    def read_page(self, limit: int, after: UUID | None = None) -> list[Unit]:
+        with self.pool.connection() as con:
+            res = con.execute(
+                "select * from units where id > ? order by id limit ?",
+                [str(after or ""), limit],
+            )
+            rows = res.fetchall()
+        return [Unit(name, UUID(id)) for id, name in rows]
+
+    def version(self) -> int:
+        with self.pool.connection() as con:
+            return read_catalog_version(con, "units")
+
+    def _write(self, operation: Callable[[Connection], T]) -> T:
+        return (self.committer or self.pool).write(operation)
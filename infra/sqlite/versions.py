@@ -0,0 +1,7 @@
+from sqlite3 import Connection
+
+
+def read_catalog_version(con: Connection, catalog: str) -> int:
+    res = con.execute("select version from catalog_versions where name = ?", [catalog])
+    (version,) = res.fetchone()
+    return int(version)
@@ -1,16 +1,63 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Optional
+
 import uvicorn
 from dotenv import load_dotenv
-from typer import Typer
+from typer import BadParameter, Typer
 
-from runner.setup import init_app
+from infra.sqlite.connection_pool import MEMORY_DATABASE
+from runner.load import LoadConfig, print_report, run_load
+from runner.setup import database_name, init_app, repository_kind
 
 cli = Typer(no_args_is_help=True, add_completion=False)
 
 
 @cli.command()
-def run(host: str = "127.0.0.1", port: int = 8000) -> None:
+def run(host: str = "127.0.0.1", port: int = 8000, workers: int = 1) -> None:
+    load_dotenv()
+
+    if workers == 1:
+        uvicorn.run(host=host, port=port, app=init_app())
+        return
+
+    if repository_kind() != "sqlite" or database_name() == MEMORY_DATABASE:
+        raise BadParameter(
+            "multiple workers need a shared database file;"
+            " set POS_REPOSITORY_KIND=sqlite and a file POS_DATABASE_NAME",
+            param_hint="--workers",
+        )
+    uvicorn.run(
+        "runner.setup:init_app", factory=True, host=host, port=port, workers=workers
+    )
+
+
+@cli.command()
+def load(
+    cashiers: int = 10,
+    duration: float = 10.0,
+    base_url: Optional[str] = None,
+    products: int = 200,
+    min_items: int = 1,
+    max_items: int = 20,
+    max_quantity: int = 5,
+    skew: float = 1.0,
+    sales_poll: float = 0.1,
+    seed: Optional[int] = None,
+) -> None:
     load_dotenv()
 
-    uvicorn.run(host=host, port=port, app=init_app())
+    config = LoadConfig(
+        cashiers,
+        duration,
+        base_url,
+        products,
+        min_items,
+        max_items,
+        max_quantity,
+        skew,
+        sales_poll,
+        seed,
+    )
+    print_report(asyncio.run(run_load(config)))
@@ -0,0 +1,219 @@
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from math import ceil
+from random import Random
+from time import perf_counter
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from faker import Faker
+
+from runner.setup import init_app
+
+IN_PROCESS_URL = "http://pos"
+BUCKETS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0]
+RETRY_BACKOFF = 0.01
+MAX_RETRY_BACKOFF = 1.0
+
+
+@dataclass
+class LoadConfig:
+    cashiers: int = 10
+    duration: float = 10.0
+    base_url: str | None = None
+    products: int = 200
+    min_items: int = 1
+    max_items: int = 20
+    max_quantity: int = 5
+    skew: float = 1.0
+    sales_poll: float = 0.1
+    seed: int | None = None
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[max(ceil(fraction * len(ordered)) - 1, 0)]
+
+    def histogram(self) -> list[int]:
+        counts = [0] * (len(BUCKETS) + 1)
+        for latency in self.latencies:
+            counts[bisect_left(BUCKETS, latency)] += 1
+        return counts
+
+
+@dataclass
+class LoadReport:
+    elapsed: float = 0
+    sessions: int = 0
+    endpoints: dict[str, EndpointStats] = field(default_factory=dict)
+
+    async def call(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        method: str,
+        url: str,
+        body: Any = None,
+    ) -> httpx.Response | None:
+        stats = self.endpoints.setdefault(endpoint, EndpointStats())
+        start = perf_counter()
+        try:
+            response = await client.request(method, url, json=body)
+        except httpx.HTTPError:
+            response = None
+        stats.latencies.append(perf_counter() - start)
+        if response is None or response.is_error:
+            stats.errors += 1
+            return None
+        return response
+
+
+def client_for(config: LoadConfig) -> httpx.AsyncClient:
+    if config.base_url is None:
+        transport = httpx.ASGITransport(app=init_app())
+        return httpx.AsyncClient(transport=transport, base_url=IN_PROCESS_URL)
+    return httpx.AsyncClient(base_url=config.base_url)
+
+
+async def seed_catalog(
+    client: httpx.AsyncClient, config: LoadConfig, faker: Faker
+) -> list[str]:
+    run_id = uuid4().hex[:8]
+    response = await client.post("/units", json={"name": f"{faker.word()}-{run_id}"})
+    response.raise_for_status()
+    unit_id = response.json()["unit"]["id"]
+
+    products = [
+        {
+            "unit_id": unit_id,
+            "name": faker.catch_phrase(),
+            "barcode": f"{run_id}-{faker.unique.ean13()}",
+            "price": round(faker.pyfloat(min_value=0.1, max_value=100), 2),
+        }
+        for _ in range(config.products)
+    ]
+    response = await client.post("/products/batch", json={"products": products})
+    response.raise_for_status()
+    product_ids = [
+        result["product"]["id"]
+        for result in response.json()["results"]
+        if result["status"] == 201
+    ]
+    if not product_ids:
+        statuses = sorted({result["status"] for result in response.json()["results"]})
+        raise RuntimeError(
+            f"None of the {len(products)} seeded products were created"
+            f" (statuses {statuses}); cashiers have nothing to sell."
+        )
+    return product_ids
+
+
+async def cashier(
+    client: httpx.AsyncClient,
+    config: LoadConfig,
+    report: LoadReport,
+    product_ids: list[str],
+    rng: Random,
+    deadline: float,
+) -> None:
+    weights = [1 / (rank + 1) ** config.skew for rank in range(len(product_ids))]
+    failures = 0
+    while perf_counter() < deadline:
+        response = await report.call(client, "POST /receipts", "POST", "/receipts")
+        if response is None:
+            backoff = min(RETRY_BACKOFF * 2**failures, MAX_RETRY_BACKOFF)
+            await asyncio.sleep(min(backoff, max(deadline - perf_counter(), 0)))
+            failures += 1
+            continue
+        failures = 0
+        receipt_id = response.json()["receipt"]["id"]
+
+        n_items = rng.randint(config.min_items, config.max_items)
+        for product_id in rng.choices(product_ids, weights, k=n_items):
+            await report.call(
+                client,
+                "POST /receipts/{id}/products",
+                "POST",
+                f"/receipts/{receipt_id}/products",
+                {"id": product_id, "quantity": rng.randint(1, config.max_quantity)},
+            )
+        await report.call(
+            client,
+            "PATCH /receipts/{id}",
+            "PATCH",
+            f"/receipts/{receipt_id}",
+            {"status": "closed"},
+        )
+        report.sessions += 1
+
+        if rng.random() < config.sales_poll:
+            await report.call(client, "GET /sales", "GET", "/sales")
+
+
+async def run_load(config: LoadConfig) -> LoadReport:
+    faker = Faker()
+    if config.seed is not None:
+        faker.seed_instance(config.seed)
+    seeds = Random(config.seed)
+
+    report = LoadReport()
+    async with client_for(config) as client:
+        product_ids = await seed_catalog(client, config, faker)
+        start = perf_counter()
+        deadline = start + config.duration
+        await asyncio.gather(
+            *(
+                cashier(
+                    client,
+                    config,
+                    report,
+                    product_ids,
+                    Random(seeds.random()),
+                    deadline,
+                )
+                for _ in range(config.cashiers)
+            )
+        )
+        report.elapsed = perf_counter() - start
+    return report
+
+
+def print_report(report: LoadReport) -> None:
+    requests = sum(len(stats.latencies) for stats in report.endpoints.values())
+    errors = sum(stats.errors for stats in report.endpoints.values())
+    print(
+        f"{report.sessions} sessions, {requests} requests in {report.elapsed:.1f}s:"
+        f" {requests / report.elapsed:.1f} req/s,"
+        f" {report.sessions / report.elapsed:.1f} sessions/s,"
+        f" {errors / max(requests, 1):.2%} errors"
+    )
+
+    print()
+    print(
+        f"{'endpoint':<30} {'requests':>9} {'req/s':>9} {'errors':>8}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for endpoint, stats in report.endpoints.items():
+        print(
+            f"{endpoint:<30} {len(stats.latencies):>9}"
+            f" {len(stats.latencies) / report.elapsed:>9.1f}"
+            f" {stats.errors / len(stats.latencies):>8.2%}"
+            f" {stats.percentile(0.50) * 1e3:>8.2f}"
+            f" {stats.percentile(0.95) * 1e3:>8.2f}"
+            f" {stats.percentile(0.99) * 1e3:>8.2f}"
+        )
+
+    print()
+    labels = [f"<={bucket * 1e3:g}ms" for bucket in BUCKETS] + [f">{BUCKETS[-1]:g}s"]
+    print(f"{'endpoint':<30}" + "".join(f" {label:>8}" for label in labels))
+    for endpoint, stats in report.endpoints.items():
+        print(
+            f"{endpoint:<30}" + "".join(f" {count:>8}" for count in stats.histogram())
+        )
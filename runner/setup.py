@@ -1,37 +1,167 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import FastAPI
 
-from infra.constants import DATABASE_NAME, SQL_FILE
+from core.product import ProductRepository
+from core.receipt import ReceiptRepository
+from core.unit import UnitRepository
+from infra.asynchronous.products import AsyncProducts
+from infra.asynchronous.receipts import AsyncReceipts
+from infra.asynchronous.runners import (
+    ExecutorRunner,
+    Runner,
+    run_in_threadpool,
+    run_inline,
+)
+from infra.asynchronous.units import AsyncUnits
+from infra.constants import (
+    DATABASE_NAME,
+    GROUP_COMMIT_BATCH_SIZE,
+    MIGRATIONS_DIR,
+    SNAPSHOT_INTERVAL,
+    SQL_FILE,
+)
+from infra.fastapi.export import export_api
+from infra.fastapi.metrics import MetricsMiddleware, metrics_api
 from infra.fastapi.products import product_api
 from infra.fastapi.receipts import receipt_api
 from infra.fastapi.sales import sales_api
 from infra.fastapi.units import unit_api
+from infra.in_memory.columnar import ColumnarProductsInMemory
+from infra.in_memory.persistence import MemoryStore, journaled
 from infra.in_memory.products import ProductsInMemory
 from infra.in_memory.receipts import ReceiptsInMemory
 from infra.in_memory.units import UnitsInMemory
+from infra.metrics import Metrics, instrument
+from infra.sqlite.cache import CachedProductsDatabase, CachedUnitsDatabase
+from infra.sqlite.connection_pool import ConnectionPool
 from infra.sqlite.database_connect import Database
+from infra.sqlite.group_commit import GroupCommitter
 from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.profiles import DEFAULT_PROFILE, get_profile
 from infra.sqlite.receipts import ReceiptsDatabase
 from infra.sqlite.units import UnitsDatabase
 
 
 def init_app() -> FastAPI:
     app = FastAPI()
+    metrics = Metrics()
+    app.state.metrics = metrics
+    app.add_middleware(MetricsMiddleware, metrics=metrics, schema=app.openapi)
     app.include_router(unit_api)
     app.include_router(product_api)
     app.include_router(receipt_api)
     app.include_router(sales_api)
+    app.include_router(export_api)
+    app.include_router(metrics_api)
 
-    if os.getenv("POS_REPOSITORY_KIND", "memory") == "sqlite":
-        db = Database(DATABASE_NAME, os.path.abspath(SQL_FILE))
-        # db.initial()    Uncomment this if you want to create initial db
-        app.state.units = UnitsDatabase(db.get_connection(), db.get_cursor())
-        app.state.products = ProductsDatabase(db.get_connection(), db.get_cursor())
-        app.state.receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    units: UnitRepository
+    products: ProductRepository
+    receipts: ReceiptRepository
+    run: Runner
+
+    if repository_kind() == "sqlite":
+        db = Database(
+            database_name(),
+            os.path.abspath(SQL_FILE),
+            os.path.abspath(MIGRATIONS_DIR),
+            int(os.getenv("POS_SQLITE_POOL_SIZE", "4")),
+            get_profile(os.getenv("POS_SQLITE_PROFILE", DEFAULT_PROFILE)),
+        )
+        db.migrate()
+        committer = init_group_committer(db.get_pool(), metrics)
+        units = UnitsDatabase(db.get_pool(), committer)
+        products = ProductsDatabase(db.get_pool(), committer)
+        cache_size = int(os.getenv("POS_SQLITE_CACHE_SIZE", "0"))
+        if cache_size > 0:
+            units = CachedUnitsDatabase(
+                UnitsDatabase(db.get_pool(), committer), cache_size
+            )
+            products = CachedProductsDatabase(
+                ProductsDatabase(db.get_pool(), committer), cache_size
+            )
+        receipts = ReceiptsDatabase(db.get_pool(), committer)
+        run = init_sqlite_runner(db.pool_size)
     else:
-        app.state.units = UnitsInMemory()
-        app.state.products = ProductsInMemory(app.state.units)
-        app.state.receipts = ReceiptsInMemory(app.state.products)
+        units_in_memory = UnitsInMemory()
+        units = units_in_memory
+        if repository_kind() == "columnar":
+            products = ColumnarProductsInMemory(units_in_memory)
+        else:
+            products = ProductsInMemory(units_in_memory)
+        receipts = ReceiptsInMemory(products)
+        run = run_inline
+
+        data_dir = os.getenv("POS_MEMORY_DATA_DIR")
+        if data_dir:
+            store = MemoryStore(
+                data_dir,
+                units_in_memory,
+                products,
+                receipts,
+                int(os.getenv("POS_MEMORY_SNAPSHOT_EVERY", str(SNAPSHOT_INTERVAL))),
+                os.getenv("POS_MEMORY_FSYNC", "0") == "1",
+            )
+            store.load()
+            units = journaled(units, "units", store)
+            products = journaled(products, "products", store)
+            receipts = journaled(receipts, "receipts", store)
+
+    units = instrument(units, "UnitRepository", metrics)
+    products = instrument(products, "ProductRepository", metrics)
+    receipts = instrument(receipts, "ReceiptRepository", metrics)
+    app.state.units = AsyncUnits(units, run)
+    app.state.products = AsyncProducts(products, run)
+    app.state.receipts = AsyncReceipts(receipts, run)
 
     return app
+
+
+def repository_kind() -> str:
+    return os.getenv("POS_REPOSITORY_KIND", "memory")
+
+
+def database_name() -> str:
+    return os.getenv("POS_DATABASE_NAME", DATABASE_NAME)
+
+
+def init_group_committer(
+    pool: ConnectionPool, metrics: Metrics
+) -> GroupCommitter | None:
+    window = float(os.getenv("POS_SQLITE_GROUP_COMMIT_MS", "0"))
+    if window <= 0:
+        return None
+
+    committer = GroupCommitter(
+        pool,
+        window / 1000,
+        int(os.getenv("POS_SQLITE_GROUP_COMMIT_BATCH", str(GROUP_COMMIT_BATCH_SIZE))),
+    )
+    metrics.register(
+        "sqlite_group_commits_total",
+        "counter",
+        "Group-commit transactions committed.",
+        lambda: committer.stats().commits,
+    )
+    metrics.register(
+        "sqlite_group_commit_operations_total",
+        "counter",
+        "Write operations processed in groups.",
+        lambda: committer.stats().operations,
+    )
+    metrics.register(
+        "sqlite_group_commit_largest_batch",
+        "gauge",
+        "Most write operations committed in one group.",
+        lambda: committer.stats().largest_batch,
+    )
+    return committer
+
+
+def init_sqlite_runner(workers: int) -> Runner:
+    if os.getenv("POS_SQLITE_MODE", "sync") == "async":
+        return ExecutorRunner(
+            ThreadPoolExecutor(workers, thread_name_prefix="pos-sqlite")
+        )
+    return run_in_threadpool
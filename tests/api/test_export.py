@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from runner.setup import init_app
+from tests.api.fixture_functions import (
+    create_product_and_get_id,
+    create_unit_and_get_id,
+    get_default_product,
+)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(init_app())
+
+
+def test_export_products_on_empty(client: TestClient) -> None:
+    response = client.get("/export/products.ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text == ""
+
+
+def test_export_products(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    products = [get_default_product(unit_id, barcode=str(i)) for i in range(3)]
+    for product in products:
+        client.post("/products", json=product)
+
+    response = client.get("/export/products.ndjson")
+
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(exported, key=lambda product: product["barcode"]) == [
+        {"id": exported_product["id"], **product}
+        for product, exported_product in zip(
+            products, sorted(exported, key=lambda product: product["barcode"])
+        )
+    ]
+
+
+def test_export_receipts(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    product_id = create_product_and_get_id(client, unit_id, 1.5)
+    response = client.post("/receipts")
+    receipt_id = response.json()["receipt"]["id"]
+    client.post(
+        f"/receipts/{receipt_id}/products", json={"id": product_id, "quantity": 3}
+    )
+
+    response = client.get("/export/receipts.ndjson")
+
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {
+            "id": receipt_id,
+            "status": "open",
+            "products": [{"id": product_id, "quantity": 3, "price": 1.5, "total": 4.5}],
+            "total": 4.5,
+        }
+    ]
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from runner.setup import init_app
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(init_app())
+
+
+def test_metrics_on_empty(client: TestClient) -> None:
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_requests_total counter" in response.text
+    assert "# TYPE repository_call_duration_seconds histogram" in response.text
+
+
+def test_metrics_count_requests_per_route_and_status(client: TestClient) -> None:
+    client.post("/units", json={"name": "kg"})
+    client.post("/units", json={"name": "kg"})
+    client.get("/no-such-route")
+
+    lines = client.get("/metrics").text.splitlines()
+
+    assert 'http_requests_total{method="POST",route="/units",status="201"} 1' in lines
+    assert 'http_requests_total{method="POST",route="/units",status="409"} 1' in lines
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in lines
+    assert 'http_requests_in_flight{method="POST",route="/units"} 0' in lines
+    assert (
+        'http_request_duration_seconds_count{method="POST",route="/units"} 2' in lines
+    )
+    assert (
+        'http_request_duration_seconds_bucket{method="POST",route="/units",le="+Inf"} 2'
+        in lines
+    )
+
+
+def test_metrics_time_repository_methods(client: TestClient) -> None:
+    receipt_id = client.post("/receipts").json()["receipt"]["id"]
+    client.get(f"/receipts/{receipt_id}")
+    client.get(f"/receipts/{receipt_id}")
+
+    lines = client.get("/metrics").text.splitlines()
+
+    assert (
+        'repository_call_duration_seconds_count{method="ReceiptRepository.create"} 1'
+        in lines
+    )
+    assert (
+        'repository_call_duration_seconds_count{method="ReceiptRepository.read"} 2'
+        in lines
+    )
+    assert (
+        'http_requests_total{method="GET",route="/receipts/{receipt_id}",status="200"}'
+        " 2" in lines
+    )
@@ -5,7 +5,11 @@ import pytest
 from fastapi.testclient import TestClient
 
 from runner.setup import init_app
-from tests.api.fixture_functions import create_unit_and_get_id, get_default_product
+from tests.api.fixture_functions import (
+    create_product_and_get_id,
+    create_unit_and_get_id,
+    get_default_product,
+)
 
 
 @pytest.fixture
@@ -76,7 +80,7 @@ def test_get_all_products_on_empty(client: TestClient) -> None:
     response = client.get("/products")
 
     assert response.status_code == 200
-    assert response.json() == {"products": []}
+    assert response.json() == {"products": [], "next": None}
 
 
 def test_get_all_products(client: TestClient) -> None:
@@ -89,7 +93,10 @@ def test_get_all_products(client: TestClient) -> None:
     response = client.get("/products")
 
     assert response.status_code == 200
-    assert response.json() == {"products": [{"id": product_id, **product}]}
+    assert response.json() == {
+        "products": [{"id": product_id, **product}],
+        "next": None,
+    }
 
 
 def test_update_product_price(client: TestClient) -> None:
@@ -121,3 +128,133 @@ def test_should_not_update_unknown_product(client: TestClient) -> None:
     assert response.json() == {
         "error": {"message": f"Product with id<{unknown_id}> does not exist."}
     }
+
+
+def test_read_product_by_barcode(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+
+    product = get_default_product(unit_id)
+    response = client.post("/products", json=product)
+    product_id = response.json()["product"]["id"]
+    client.post("/products", json=get_default_product(unit_id, "Pear", "1234"))
+
+    response = client.get("/products", params={"barcode": product["barcode"]})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "products": [{"id": product_id, **product}],
+        "next": None,
+    }
+
+
+def test_read_product_by_unknown_barcode(client: TestClient) -> None:
+    response = client.get("/products", params={"barcode": "6604876475937"})
+
+    assert response.status_code == 200
+    assert response.json() == {"products": [], "next": None}
+
+
+def test_create_product_batch(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    unknown_unit_id = str(uuid4())
+
+    existing = get_default_product(unit_id)
+    client.post("/products", json=existing)
+    pear = get_default_product(unit_id, "Pear", "1234")
+    plum = get_default_product(unknown_unit_id, "Plum", "5678")
+
+    response = client.post("/products/batch", json={"products": [pear, existing, plum]})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            {"status": 201, "product": {"id": ANY, **pear}, "error": None},
+            {
+                "status": 409,
+                "product": None,
+                "error": {
+                    "message": f"Product with barcode<{existing['barcode']}>"
+                    " already exists."
+                },
+            },
+            {
+                "status": 404,
+                "product": None,
+                "error": {
+                    "message": f"Unit with id<{unknown_unit_id}> does not exist."
+                },
+            },
+        ]
+    }
+
+    response = client.get("/products", params={"barcode": pear["barcode"]})
+    assert response.json()["products"][0]["name"] == "Pear"
+
+
+def test_product_batch_reports_non_positive_price(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    free = get_default_product(unit_id, "Free", "1111")
+    free["price"] = 0
+    pear = get_default_product(unit_id, "Pear", "1234")
+
+    response = client.post("/products/batch", json={"products": [free, pear]})
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {
+            "status": 422,
+            "product": None,
+            "error": {"message": "Product with price<0.0> is not valid."},
+        },
+        {"status": 201, "product": {"id": ANY, **pear}, "error": None},
+    ]
+
+
+def test_page_through_products(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    for barcode in ["1", "2", "3", "4", "5"]:
+        client.post("/products", json=get_default_product(unit_id, barcode=barcode))
+
+    barcodes = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = client.get("/products", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["products"]) <= 2
+        barcodes += [product["barcode"] for product in page["products"]]
+        if page["next"] is None:
+            break
+        params["after"] = page["next"]
+
+    assert sorted(barcodes) == ["1", "2", "3", "4", "5"]
+
+
+def test_should_not_read_products_page_above_limit(client: TestClient) -> None:
+    response = client.get("/products", params={"limit": 100_000})
+
+    assert response.status_code == 422
+
+
+def test_read_all_products_not_modified(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    client.post("/products", json=get_default_product(unit_id))
+
+    etag = client.get("/products").headers["ETag"]
+    response = client.get("/products", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_read_product_modified_after_price_update(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    product_id = create_product_and_get_id(client, unit_id, 1.5)
+
+    etag = client.get(f"/products/{product_id}").headers["ETag"]
+    client.patch(f"/products/{product_id}/2.5")
+    response = client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["product"]["price"] == 2.5
@@ -176,3 +176,75 @@ def test_should_not_delete_unknown_receipt(client: TestClient) -> None:
     assert response.json() == {
         "error": {"message": f"Receipt with id<{receipt_id}> does not exist."}
     }
+
+
+def test_should_add_products_in_receipt(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    product_id = create_product_and_get_id(client, unit_id, 1.5)
+
+    response = client.post("/receipts")
+    receipt_id = response.json()["receipt"]["id"]
+    response = client.post(
+        f"/receipts/{receipt_id}/products/batch",
+        json={
+            "products": [
+                {"id": product_id, "quantity": 3},
+                {"id": product_id, "quantity": 1},
+            ]
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {
+        "receipt": {
+            "id": receipt_id,
+            "status": "open",
+            "products": [
+                {"id": product_id, "quantity": 3, "price": 1.5, "total": 4.5},
+                {"id": product_id, "quantity": 1, "price": 1.5, "total": 1.5},
+            ],
+            "total": 6,
+        }
+    }
+
+
+def test_should_reject_products_batch_with_non_positive_quantity(
+    client: TestClient,
+) -> None:
+    unit_id = create_unit_and_get_id(client)
+    product_id = create_product_and_get_id(client, unit_id, 1.5)
+
+    response = client.post("/receipts")
+    receipt_id = response.json()["receipt"]["id"]
+    response = client.post(
+        f"/receipts/{receipt_id}/products/batch",
+        json={
+            "products": [
+                {"id": product_id, "quantity": 2},
+                {"id": product_id, "quantity": 0},
+            ]
+        },
+    )
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "error": {"message": "Product with quantity<0> is not valid."}
+    }
+    response = client.get(f"/receipts/{receipt_id}")
+    assert response.json()["receipt"]["products"] == []
+
+
+def test_should_not_add_products_in_unknown_receipt(client: TestClient) -> None:
+    unit_id = create_unit_and_get_id(client)
+    product_id = create_product_and_get_id(client, unit_id, 1.5)
+
+    receipt_id = uuid4()
+    response = client.post(
+        f"/receipts/{receipt_id}/products/batch",
+        json={"products": [{"id": product_id, "quantity": 3}]},
+    )
+
+    assert response.status_code == 404
+    assert response.json() == {
+        "error": {"message": f"Receipt with id<{receipt_id}> does not exist."}
+    }
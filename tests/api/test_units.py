@@ -60,7 +60,7 @@ def test_get_all_units_on_empty(client: TestClient) -> None:
     response = client.get("/units")
 
     assert response.status_code == 200
-    assert response.json() == {"units": []}
+    assert response.json() == {"units": [], "next": None}
 
 
 def test_get_all_units(client: TestClient) -> None:
@@ -72,4 +72,71 @@ def test_get_all_units(client: TestClient) -> None:
     response = client.get("/units")
 
     assert response.status_code == 200
-    assert response.json() == {"units": [{"id": unit_id, **unit}]}
+    assert response.json() == {"units": [{"id": unit_id, **unit}], "next": None}
+
+
+def test_read_unit_by_name(client: TestClient) -> None:
+    unit = {"name": "კგ"}
+
+    response = client.post("/units", json=unit)
+    unit_id = response.json()["unit"]["id"]
+    client.post("/units", json={"name": "ცალი"})
+
+    response = client.get("/units", params={"name": unit["name"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"units": [{"id": unit_id, **unit}], "next": None}
+
+
+def test_read_unit_by_unknown_name(client: TestClient) -> None:
+    response = client.get("/units", params={"name": "კგ"})
+
+    assert response.status_code == 200
+    assert response.json() == {"units": [], "next": None}
+
+
+def test_page_through_units(client: TestClient) -> None:
+    unit_ids = []
+    for name in ["კგ", "ცალი", "ლიტრი"]:
+        response = client.post("/units", json={"name": name})
+        unit_ids.append(response.json()["unit"]["id"])
+
+    response = client.get("/units", params={"limit": 2})
+    first_page = response.json()
+    response = client.get("/units", params={"limit": 2, "after": first_page["next"]})
+    second_page = response.json()
+
+    assert [unit["id"] for unit in first_page["units"]] == sorted(unit_ids)[:2]
+    assert [unit["id"] for unit in second_page["units"]] == sorted(unit_ids)[2:]
+    assert second_page["next"] is None
+
+
+def test_read_all_units_not_modified(client: TestClient) -> None:
+    client.post("/units", json={"name": "კგ"})
+
+    response = client.get("/units")
+    etag = response.headers["ETag"]
+    response = client.get("/units", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_read_all_units_modified_after_create(client: TestClient) -> None:
+    etag = client.get("/units").headers["ETag"]
+    client.post("/units", json={"name": "კგ"})
+
+    response = client.get("/units", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["units"]) == 1
+
+
+def test_read_unit_not_modified(client: TestClient) -> None:
+    unit_id = client.post("/units", json={"name": "კგ"}).json()["unit"]["id"]
+
+    etag = client.get(f"/units/{unit_id}").headers["ETag"]
+    response = client.get(f"/units/{unit_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
@@ -0,0 +1,82 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import get_ident
+from uuid import uuid4
+
+import pytest
+
+from core.errors import DoesNotExistError
+from core.product import Product
+from core.receipt import Receipt
+from core.unit import Unit
+from infra.asynchronous.products import AsyncProducts
+from infra.asynchronous.receipts import AsyncReceipts
+from infra.asynchronous.runners import ExecutorRunner, run_in_threadpool, run_inline
+from infra.asynchronous.units import AsyncUnits
+from infra.constants import SQL_FILE_TEST
+from infra.in_memory.units import UnitsInMemory
+from infra.sqlite.database_connect import Database
+from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.receipts import ReceiptsDatabase
+from infra.sqlite.units import UnitsDatabase
+
+
+def test_run_inline_stays_on_event_loop_thread() -> None:
+    async def scenario() -> None:
+        assert await run_inline(get_ident) == get_ident()
+
+    asyncio.run(scenario())
+
+
+def test_run_in_threadpool_leaves_event_loop_thread() -> None:
+    async def scenario() -> None:
+        assert await run_in_threadpool(get_ident) != get_ident()
+
+    asyncio.run(scenario())
+
+
+def test_executor_runner_uses_dedicated_executor() -> None:
+    executor = ThreadPoolExecutor(1, thread_name_prefix="test")
+    executor_thread = executor.submit(get_ident).result()
+
+    async def scenario() -> None:
+        assert await ExecutorRunner(executor)(get_ident) == executor_thread
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+
+def test_async_units_propagate_errors() -> None:
+    units = AsyncUnits(UnitsInMemory(), run_inline)
+
+    with pytest.raises(DoesNotExistError):
+        asyncio.run(units.read(uuid4()))
+
+
+def test_async_sqlite_receipt_flow() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+    run = ExecutorRunner(ThreadPoolExecutor(2))
+    units = AsyncUnits(UnitsDatabase(db.get_pool()), run)
+    products = AsyncProducts(ProductsDatabase(db.get_pool()), run)
+    receipts = AsyncReceipts(ReceiptsDatabase(db.get_pool()), run)
+
+    async def scenario() -> None:
+        unit = Unit("kg")
+        await units.create(unit)
+        product = Product(unit.id, "Apple", "123456789", 1.5)
+        await products.create(product)
+        receipt = Receipt()
+        await receipts.create(receipt)
+
+        await asyncio.gather(
+            *(receipts.add_product(receipt.id, product.id, 1) for _ in range(10))
+        )
+        await receipts.update_status(receipt.id, "closed")
+
+        assert len((await receipts.read(receipt.id)).products) == 10
+        assert (await receipts.read_sales()).revenue == 15
+
+    asyncio.run(scenario())
+    db.close_database()
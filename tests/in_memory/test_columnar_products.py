@@ -0,0 +1,140 @@
+from uuid import uuid4
+
+import pytest
+
+from core.errors import AlreadyExistError, DoesNotExistError
+from core.product import Product
+from core.unit import Unit
+from infra.in_memory.columnar import ColumnarProductsInMemory
+from infra.in_memory.ordering import BLOCK_SIZE
+from infra.in_memory.units import UnitsInMemory
+
+
+@pytest.fixture
+def unit() -> Unit:
+    return Unit("kg")
+
+
+@pytest.fixture
+def products(unit: Unit) -> ColumnarProductsInMemory:
+    units = UnitsInMemory()
+    units.create(unit)
+    return ColumnarProductsInMemory(units)
+
+
+def test_create_and_read_product_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    product = Product(unit.id, "ვაშლი", "123456789", 1.5)
+    products.create(product)
+
+    assert products.read(product.id) == product
+    assert products.read_by_barcode("123456789") == product
+
+
+def test_create_same_product_twice_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    with pytest.raises(AlreadyExistError):
+        products.create(product)
+
+
+def test_create_product_with_unknown_unit_columnar(
+    products: ColumnarProductsInMemory,
+) -> None:
+    with pytest.raises(DoesNotExistError):
+        products.create(Product(uuid4(), "Apple", "123456789", 1.5))
+
+
+def test_read_unknown_product_columnar(products: ColumnarProductsInMemory) -> None:
+    with pytest.raises(DoesNotExistError):
+        products.read(uuid4())
+    with pytest.raises(DoesNotExistError):
+        products.read_by_barcode("123456789")
+
+
+def test_update_product_price_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+    version = products.version()
+
+    products.update_price(product.id, 2.5)
+
+    assert products.read(product.id).price == 2.5
+    assert products.version() > version
+    with pytest.raises(DoesNotExistError):
+        products.update_price(uuid4(), 2.5)
+
+
+def test_create_many_products_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    existing = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(existing)
+
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    batch = [
+        pear,
+        Product(unit.id, "Apple", "123456789", 1.5),
+        Product(unit.id, "Pear", "987654321", 2),
+        Product(uuid4(), "Plum", "555", 3),
+    ]
+    errors = products.create_many(batch)
+
+    assert errors[0] is None
+    assert isinstance(errors[1], AlreadyExistError)
+    assert isinstance(errors[2], AlreadyExistError)
+    assert isinstance(errors[3], DoesNotExistError)
+    assert products.read_all() == [existing, pear]
+
+
+def test_indexes_survive_growth_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    created = [Product(unit.id, "Apple", str(barcode), 1.5) for barcode in range(500)]
+    products.create_many(created[:250])
+    for product in created[250:]:
+        products.create(product)
+
+    assert all(products.read(product.id) == product for product in created)
+    assert all(
+        products.read_by_barcode(product.barcode) == product for product in created
+    )
+    assert list(products.iterate()) == sorted(created, key=lambda product: product.id)
+
+
+def test_read_page_of_products_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    products.create(Product(unit.id, "Apple", "1", 1.5))
+    products.create_many(
+        [Product(unit.id, "Pear", "2", 2), Product(unit.id, "Plum", "3", 3)]
+    )
+    ordered = sorted(products.read_all(), key=lambda product: product.id)
+
+    assert products.read_page(2) == ordered[:2]
+    assert products.read_page(2, ordered[1].id) == ordered[2:]
+    assert products.read_page(2, ordered[2].id) == []
+
+
+def test_order_spans_blocks_columnar(
+    products: ColumnarProductsInMemory, unit: Unit
+) -> None:
+    created = [
+        Product(unit.id, "Apple", str(barcode), 1.5)
+        for barcode in range(3 * BLOCK_SIZE)
+    ]
+    first, second, rest = created[:1000], created[1000:1010], created[1010:]
+    products.create_many(first)
+    products.create_many(second)
+    for product in rest:
+        products.create(product)
+    ordered = sorted(created, key=lambda product: product.id)
+
+    assert list(products.iterate()) == ordered
+    assert products.read_page(3, ordered[1000].id) == ordered[1001:1004]
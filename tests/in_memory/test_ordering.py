@@ -0,0 +1,51 @@
+from random import Random
+
+from infra.in_memory.ordering import BLOCK_SIZE, SortedBlocks
+
+
+def test_add_keeps_values_sorted_across_blocks() -> None:
+    rng = Random(1)
+    values = [rng.random() for _ in range(5 * BLOCK_SIZE)]
+    blocks: SortedBlocks[float] = SortedBlocks()
+
+    for value in values:
+        blocks.add(value)
+
+    assert list(blocks) == sorted(values)
+    assert len(blocks) == len(values)
+    assert len(blocks.blocks) > 2
+    assert blocks.maxes == [block[-1] for block in blocks.blocks]
+
+
+def test_update_merges_small_and_large_batches() -> None:
+    rng = Random(2)
+    blocks: SortedBlocks[int] = SortedBlocks()
+    expected: list[int] = []
+
+    for size in [3 * BLOCK_SIZE, 10, 1, 2 * BLOCK_SIZE, 0]:
+        batch = [rng.randrange(10**9) for _ in range(size)]
+        blocks.update(batch)
+        expected += batch
+
+    assert list(blocks) == sorted(expected)
+    assert len(blocks) == len(expected)
+
+
+def test_page_after_key() -> None:
+    blocks: SortedBlocks[int] = SortedBlocks()
+    blocks.update(list(range(0, 6 * BLOCK_SIZE, 2)))
+
+    assert blocks.page(3) == [0, 2, 4]
+    assert blocks.page(3, 4) == [6, 8, 10]
+    assert blocks.page(3, 5) == [6, 8, 10]
+    assert blocks.page(BLOCK_SIZE, 0) == list(range(2, 2 * BLOCK_SIZE + 1, 2))
+    assert blocks.page(5, 6 * BLOCK_SIZE - 4) == [6 * BLOCK_SIZE - 2]
+    assert blocks.page(5, 6 * BLOCK_SIZE) == []
+
+
+def test_page_with_key_function() -> None:
+    blocks: SortedBlocks[str] = SortedBlocks(key=len)
+    for word in ["ccc", "a", "dddd", "bb"]:
+        blocks.add(word)
+
+    assert blocks.page(2, 1) == ["bb", "ccc"]
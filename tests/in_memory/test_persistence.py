@@ -0,0 +1,161 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from core.errors import AlreadyExistError
+from core.product import Product, ProductRepository
+from core.receipt import Receipt
+from core.unit import Unit
+from infra.in_memory.columnar import ColumnarProductsInMemory
+from infra.in_memory.persistence import MemoryStore, journaled
+from infra.in_memory.products import ProductsInMemory
+from infra.in_memory.receipts import ReceiptsInMemory
+from infra.in_memory.units import UnitsInMemory
+
+
+def open_store(
+    directory: Path, snapshot_every: int = 1_000, columnar: bool = False
+) -> tuple[MemoryStore, UnitsInMemory, ProductRepository, ReceiptsInMemory]:
+    units = UnitsInMemory()
+    products: ProductRepository = (
+        ColumnarProductsInMemory(units) if columnar else ProductsInMemory(units)
+    )
+    receipts = ReceiptsInMemory(products)
+    store = MemoryStore(str(directory), units, products, receipts, snapshot_every)
+    store.load()
+    return (
+        store,
+        journaled(units, "units", store),
+        journaled(products, "products", store),
+        journaled(receipts, "receipts", store),
+    )
+
+
+def fill(
+    units: UnitsInMemory, products: ProductRepository, receipts: ReceiptsInMemory
+) -> tuple[Product, list[Receipt]]:
+    unit = Unit("kg")
+    units.create(unit)
+    product = Product(unit.id, "Apple", "123", 2.5)
+    products.create(product)
+    created = []
+    for _ in range(3):
+        receipt = Receipt()
+        receipts.create(receipt)
+        receipts.add_product(receipt.id, product.id, 2)
+        created.append(receipt)
+    receipts.update_status(created[0].id, "closed")
+    receipts.delete(created[2].id)
+    products.update_price(product.id, 3)
+    return product, created
+
+
+@pytest.mark.parametrize("snapshot_every", [1_000, 4])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_restart_restores_state(
+    tmp_path: Path, snapshot_every: int, columnar: bool
+) -> None:
+    store, units, products, receipts = open_store(tmp_path, snapshot_every, columnar)
+    product, created = fill(units, products, receipts)
+    store.close()
+
+    store, units, products, receipts = open_store(tmp_path, snapshot_every, columnar)
+
+    assert units.read_by_name("kg").id == product.unit_id
+    assert products.read(product.id).price == 3
+    assert receipts.read(created[0].id) == created[0]
+    assert receipts.read(created[1].id).total == 5
+    assert [receipt.id for receipt in receipts.iterate()] == [
+        created[0].id,
+        created[1].id,
+    ]
+    assert receipts.read_sales().n_receipts == 1
+    assert receipts.read_sales().revenue == 5
+    store.close()
+
+
+def test_snapshot_compacts_journal(tmp_path: Path) -> None:
+    store, units, products, receipts = open_store(tmp_path, snapshot_every=4)
+    fill(units, products, receipts)
+    store.close()
+
+    journals = sorted(name for name in os.listdir(tmp_path) if "journal" in name)
+    assert "snapshot.bin" in os.listdir(tmp_path)
+    assert journals == [f"journal-{store.generation:08d}.bin"]
+    assert store.generation > 0
+
+
+def test_failed_operations_are_not_journaled(tmp_path: Path) -> None:
+    store, units, products, receipts = open_store(tmp_path)
+    units.create(Unit("kg"))
+    with pytest.raises(AlreadyExistError):
+        units.create(Unit("kg"))
+    store.close()
+
+    store, units, products, receipts = open_store(tmp_path)
+
+    assert store.pending == 1
+    assert len(units.read_all()) == 1
+    store.close()
+
+
+def test_torn_journal_tail_is_dropped(tmp_path: Path) -> None:
+    store, units, products, receipts = open_store(tmp_path)
+    units.create(Unit("kg"))
+    units.create(Unit("pcs"))
+    store.close()
+    journal = tmp_path / "journal-00000000.bin"
+    journal.write_bytes(journal.read_bytes()[:-5])
+
+    store, units, products, receipts = open_store(tmp_path)
+    units.create(Unit("l"))
+    store.close()
+    store, units, products, receipts = open_store(tmp_path)
+
+    assert [unit.name for unit in units.read_all()] == ["kg", "l"]
+    store.close()
+
+
+def test_batches_and_keyword_arguments_are_replayed(tmp_path: Path) -> None:
+    store, units, products, receipts = open_store(tmp_path)
+    unit = Unit("kg")
+    units.create(unit)
+    batch = [Product(unit.id, "Apple", "1", 1.5), Product(unit.id, "Pear", "2", 2)]
+    products.create_many(products=batch)
+    receipt = Receipt()
+    receipts.create(receipt=receipt)
+    receipts.add_products(receipt.id, products=[(batch[0].id, 2), (batch[1].id, 1)])
+    store.close()
+
+    store, units, products, receipts = open_store(tmp_path)
+
+    assert list(products.iterate()) == sorted(batch, key=lambda product: product.id)
+    assert receipts.read(receipt.id).total == 5
+    store.close()
+
+
+def test_corrupt_journal_record_is_rejected(tmp_path: Path) -> None:
+    store, units, products, receipts = open_store(tmp_path)
+    units.create(Unit("kg"))
+    units.create(Unit("pcs"))
+    store.close()
+    journal = tmp_path / "journal-00000000.bin"
+    data = bytearray(journal.read_bytes())
+    data[20] ^= 0xFF
+    journal.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="corrupt record"):
+        open_store(tmp_path)
+
+
+def test_snapshot_from_another_format_is_rejected(tmp_path: Path) -> None:
+    store, units, products, receipts = open_store(tmp_path)
+    units.create(Unit("kg"))
+    store.snapshot()
+    store.close()
+    snapshot = tmp_path / "snapshot.bin"
+    snapshot.write_bytes(b"\x80\x05" + snapshot.read_bytes())
+
+    with pytest.raises(ValueError, match="not a POSSNAP file"):
+        open_store(tmp_path)
@@ -64,6 +64,27 @@ def test_read_unknown_product_in_memory() -> None:
         products.read(uuid4())
 
 
+def test_read_product_by_barcode_in_memory() -> None:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsInMemory(units)
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    assert products.read_by_barcode("123456789") == product
+
+
+def test_read_product_by_unknown_barcode_in_memory() -> None:
+    units = UnitsInMemory()
+
+    products = ProductsInMemory(units)
+
+    with pytest.raises(DoesNotExistError):
+        products.read_by_barcode("123456789")
+
+
 def test_read_all_product_in_memory() -> None:
     units = UnitsInMemory()
     unit = Unit("kg")
@@ -97,3 +118,75 @@ def test_update_unknown_product_price_in_memory() -> None:
 
     with pytest.raises(DoesNotExistError):
         products.update_price(uuid4(), 20)
+
+
+def test_create_many_products_in_memory() -> None:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsInMemory(units)
+    existing = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(existing)
+
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    batch = [
+        pear,
+        Product(unit.id, "Apple", "123456789", 1.5),
+        Product(unit.id, "Pear", "987654321", 2),
+        Product(uuid4(), "Plum", "555", 3),
+    ]
+    errors = products.create_many(batch)
+
+    assert errors[0] is None
+    assert isinstance(errors[1], AlreadyExistError)
+    assert isinstance(errors[2], AlreadyExistError)
+    assert isinstance(errors[3], DoesNotExistError)
+    assert products.read_all() == [existing, pear]
+
+
+def test_read_page_of_products_in_memory() -> None:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsInMemory(units)
+    products.create(Product(unit.id, "Apple", "1", 1.5))
+    products.create_many(
+        [Product(unit.id, "Pear", "2", 2), Product(unit.id, "Plum", "3", 3)]
+    )
+    ordered = sorted(products.read_all(), key=lambda product: product.id)
+
+    assert products.read_page(2) == ordered[:2]
+    assert products.read_page(2, ordered[1].id) == ordered[2:]
+    assert products.read_page(2, ordered[2].id) == []
+
+
+def test_iterate_products_in_memory() -> None:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsInMemory(units)
+    products.create_many(
+        [Product(unit.id, "Apple", str(barcode), 1.5) for barcode in range(1200)]
+    )
+
+    assert list(products.iterate()) == sorted(
+        products.read_all(), key=lambda product: product.id
+    )
+
+
+def test_version_bumps_on_catalog_changes_in_memory() -> None:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+    products = ProductsInMemory(units)
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+
+    initial = products.version()
+    products.create(product)
+    created = products.version()
+    products.update_price(product.id, 2.5)
+
+    assert initial < created < products.version()
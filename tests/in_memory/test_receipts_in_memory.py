@@ -2,7 +2,7 @@ from uuid import uuid4
 
 import pytest
 
-from core.errors import ClosedReceiptError, DoesNotExistError
+from core.errors import ClosedReceiptError, DoesNotExistError, InvalidValueError
 from core.product import Product
 from core.receipt import Receipt
 from core.unit import Unit
@@ -149,3 +149,168 @@ def test_read_sales_in_memory() -> None:
 
     assert receipts.read_sales().n_receipts == 1
     assert receipts.read_sales().revenue == 7.5
+
+
+def test_add_products_accumulates_total_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    products.create(apple)
+    products.create(pear)
+
+    receipts.add_product(receipt.id, apple.id, 5)
+    result_receipt = receipts.add_product(receipt.id, pear.id, 2)
+
+    assert result_receipt.total == 11.5
+
+
+def test_read_sales_follows_status_transitions_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products, verify_sales=True)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    first = Receipt()
+    second = Receipt()
+    receipts.create(first)
+    receipts.create(second)
+    receipts.add_product(first.id, product.id, 5)
+    receipts.add_product(second.id, product.id, 2)
+
+    receipts.update_status(first.id, "closed")
+    receipts.update_status(first.id, "closed")
+    receipts.update_status(second.id, "closed")
+    assert receipts.read_sales().n_receipts == 2
+    assert receipts.read_sales().revenue == 10.5
+
+    receipts.add_product(second.id, product.id, 1)
+    assert receipts.read_sales().revenue == 12
+
+    receipts.update_status(second.id, "open")
+    receipts.delete(second.id)
+    assert receipts.read_sales().n_receipts == 1
+    assert receipts.read_sales().revenue == 7.5
+
+
+def test_read_sales_detects_counter_drift_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products, verify_sales=True)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+    receipt.status = "closed"
+
+    with pytest.raises(AssertionError):
+        receipts.read_sales()
+
+
+def test_add_products_in_receipt_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    products.create(apple)
+    products.create(pear)
+
+    result_receipt = receipts.add_products(receipt.id, [(apple.id, 5), (pear.id, 2)])
+
+    assert [product.id for product in result_receipt.products] == [apple.id, pear.id]
+    assert result_receipt.total == 11.5
+
+
+def test_add_products_with_unknown_product_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(apple)
+
+    with pytest.raises(DoesNotExistError):
+        receipts.add_products(receipt.id, [(apple.id, 5), (uuid4(), 2)])
+
+    assert receipts.read(receipt.id).products == []
+
+
+def test_add_products_with_non_positive_quantity_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products)
+
+    receipt = Receipt("closed")
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(apple)
+
+    with pytest.raises(InvalidValueError):
+        receipts.add_products(receipt.id, [(apple.id, 2), (apple.id, 0)])
+
+    assert receipts.read(receipt.id).products == []
+    assert receipts.read_sales().revenue == 0
+
+
+def test_iterate_receipts_in_memory() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products)
+
+    created = [Receipt() for _ in range(3)]
+    for receipt in created:
+        receipts.create(receipt)
+
+    assert list(receipts.iterate()) == created
+
+
+def test_iterate_receipts_in_memory_while_deleting() -> None:
+    units = UnitsInMemory()
+    products = ProductsInMemory(units)
+    receipts = ReceiptsInMemory(products)
+
+    created = [Receipt() for _ in range(6)]
+    for receipt in created:
+        receipts.create(receipt)
+
+    iterated = []
+    for receipt in receipts.iterate():
+        iterated.append(receipt)
+        if len(iterated) == 2:
+            for deleted in created[:5]:
+                receipts.delete(deleted.id)
+            receipts.create(Receipt())
+
+    assert iterated == created[:2] + created[5:]
+    assert list(receipts.iterate())[0] == created[5]
+    assert len(receipts.order) < len(created)
@@ -38,9 +38,34 @@ def test_read_unknown_unit_in_memory() -> None:
         units.read(uuid4())
 
 
+def test_read_unit_by_name_in_memory() -> None:
+    units = UnitsInMemory()
+    unit = Unit("kg")
+    units.create(unit)
+
+    assert units.read_by_name("kg") == unit
+
+
+def test_read_unit_by_unknown_name_in_memory() -> None:
+    units = UnitsInMemory()
+
+    with pytest.raises(DoesNotExistError):
+        units.read_by_name("kg")
+
+
 def test_read_all_unit_in_memory() -> None:
     units = UnitsInMemory()
     unit = Unit("kg")
     units.create(unit)
 
     assert units.read_all() == [unit]
+
+
+def test_read_page_of_units_in_memory() -> None:
+    units = UnitsInMemory()
+    for name in ["kg", "pcs", "l"]:
+        units.create(Unit(name))
+    ordered = sorted(units.read_all(), key=lambda unit: unit.id)
+
+    assert units.read_page(2) == ordered[:2]
+    assert units.read_page(2, ordered[1].id) == ordered[2:]
@@ -0,0 +1,118 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from core.errors import DoesNotExistError
+from core.product import Product
+from core.unit import Unit
+from infra.constants import MIGRATIONS_DIR_TEST, SQL_FILE_TEST
+from infra.sqlite.cache import CachedProductsDatabase, CachedUnitsDatabase
+from infra.sqlite.database_connect import Database
+from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.units import UnitsDatabase
+
+
+def open_database(name: str) -> Database:
+    return Database(
+        name, os.path.abspath(SQL_FILE_TEST), os.path.abspath(MIGRATIONS_DIR_TEST)
+    )
+
+
+@pytest.fixture
+def db() -> Database:
+    db = open_database(":memory:")
+    db.initial()
+    return db
+
+
+def test_cached_read_counts_hits_and_misses(db: Database) -> None:
+    units = CachedUnitsDatabase(UnitsDatabase(db.get_pool()))
+    unit = Unit("kg")
+    units.create(unit)
+
+    assert units.read(unit.id) == unit
+    assert units.read(unit.id) == unit
+    assert units.read_by_name("kg") == unit
+
+    stats = units.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+    db.close_database()
+
+
+def test_cache_is_bounded(db: Database) -> None:
+    units = CachedUnitsDatabase(UnitsDatabase(db.get_pool()), capacity=2)
+    created = [Unit(name) for name in ["kg", "g", "l"]]
+    for unit in created:
+        units.create(unit)
+
+    for unit in created:
+        units.read(unit.id)
+    units.read(created[0].id)
+
+    stats = units.stats()
+    assert (stats.hits, stats.misses, stats.size) == (0, 4, 2)
+    db.close_database()
+
+
+def test_cache_does_not_keep_missing_products(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+    products = CachedProductsDatabase(ProductsDatabase(db.get_pool()))
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+
+    with pytest.raises(DoesNotExistError):
+        products.read_by_barcode(product.barcode)
+    products.create(product)
+
+    assert products.read_by_barcode(product.barcode) == product
+    db.close_database()
+
+
+def test_write_from_another_process_invalidates_cache(tmp_path: Path) -> None:
+    name = str(tmp_path / "pos.db")
+    first = open_database(name)
+    first.initial()
+    second = open_database(name)
+
+    units = UnitsDatabase(first.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    ProductsDatabase(first.get_pool()).create(product)
+
+    cached = CachedProductsDatabase(ProductsDatabase(second.get_pool()))
+    assert cached.read(product.id).price == 1.5
+    assert cached.read(product.id).price == 1.5
+
+    ProductsDatabase(first.get_pool()).update_price(product.id, 2.5)
+
+    assert cached.read(product.id).price == 2.5
+    assert cached.stats().invalidations == 1
+    assert cached.version() == ProductsDatabase(first.get_pool()).version()
+
+    cached.cache.close()
+    first.close_database()
+    second.close_database()
+
+
+def test_unrelated_writes_keep_cache(tmp_path: Path) -> None:
+    db = open_database(str(tmp_path / "pos.db"))
+    db.initial()
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    cached = CachedProductsDatabase(ProductsDatabase(db.get_pool()))
+    cached.create(product)
+
+    cached.read(product.id)
+    units.create(Unit("g"))
+    cached.read(product.id)
+
+    stats = cached.stats()
+    assert (stats.hits, stats.misses, stats.invalidations) == (1, 1, 0)
+
+    cached.cache.close()
+    db.close_database()
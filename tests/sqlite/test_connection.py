@@ -1,10 +1,119 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
 
-from infra.constants import SQL_FILE_TEST
-from infra.sqlite.database_connect import Database
+from core.unit import Unit
+from infra.constants import MIGRATIONS_DIR_TEST, SQL_FILE_TEST
+from infra.sqlite.database_connect import Database, load_migrations
+from infra.sqlite.units import UnitsDatabase
 
 
 def test_database_initial_and_close_successful() -> None:
     db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
     db.initial()
     db.close_database()
+
+
+def test_initial_applies_every_migration() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+
+    latest = load_migrations(os.path.abspath(MIGRATIONS_DIR_TEST))[-1]
+    assert db.schema_version() == latest.version
+
+    db.close_database()
+
+
+def test_migrate_creates_hot_path_indexes() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.migrate()
+
+    with db.get_pool().connection() as con:
+        res = con.execute("select name from sqlite_master where type='index'")
+        indexes = {name for (name,) in res.fetchall()}
+    assert {
+        "products_in_receipts_receipt_id",
+        "products_in_receipts_product_id",
+        "receipts_status",
+    } <= indexes
+
+    db.close_database()
+
+
+def test_migrate_is_idempotent_and_keeps_data(tmp_path: Path) -> None:
+    database_name = str(tmp_path / "pos.db")
+    db = Database(database_name, os.path.abspath(SQL_FILE_TEST))
+    db.migrate()
+    unit = Unit("kg")
+    UnitsDatabase(db.get_pool()).create(unit)
+    db.close_database()
+
+    db = Database(database_name, os.path.abspath(SQL_FILE_TEST))
+    version = db.schema_version()
+    db.migrate()
+
+    assert db.schema_version() == version
+    assert UnitsDatabase(db.get_pool()).read_all() == [unit]
+
+    db.close_database()
+
+
+def test_concurrent_migrations_apply_once(tmp_path: Path) -> None:
+    migrations_dir = os.path.abspath(MIGRATIONS_DIR_TEST)
+    latest = load_migrations(migrations_dir)[-1]
+    for attempt in range(5):
+        database_name = str(tmp_path / f"pos-{attempt}.db")
+        databases = [
+            Database(database_name, migrations_dir=migrations_dir) for _ in range(2)
+        ]
+        barrier = Barrier(len(databases))
+
+        def migrate(db: Database) -> None:
+            barrier.wait()
+            db.migrate()
+
+        with ThreadPoolExecutor(len(databases)) as pool:
+            list(pool.map(migrate, databases))
+
+        assert all(db.schema_version() == latest.version for db in databases)
+        with databases[0].get_pool().connection() as con:
+            columns = [row[1] for row in con.execute("PRAGMA table_info(products)")]
+            (triggers,) = con.execute(
+                "select count(*) from sqlite_master where type = 'trigger'"
+            ).fetchone()
+        assert columns == ["id", "unit_id", "name", "barcode", "price"]
+        assert triggers == 3
+        for db in databases:
+            db.close_database()
+
+
+def test_price_snapshot_migration_backfills_lines(tmp_path: Path) -> None:
+    migrations = load_migrations(os.path.abspath(MIGRATIONS_DIR_TEST))
+    old_migrations_dir = tmp_path / "migrations"
+    old_migrations_dir.mkdir()
+    for migration in migrations[:2]:
+        file_name = f"{migration.version:04d}_{migration.name}.sql"
+        (old_migrations_dir / file_name).write_text(migration.sql)
+
+    database_name = str(tmp_path / "pos.db")
+    db = Database(database_name, migrations_dir=str(old_migrations_dir))
+    db.migrate()
+    with db.get_pool().connection() as con:
+        con.execute("insert into units(id, name) values ('u', 'kg')")
+        con.execute("insert into products values ('p', 'u', 'Apple', '1', 1.5)")
+        con.execute("insert into receipts(id) values ('r')")
+        con.execute(
+            "insert into products_in_receipts(receipt_id, product_id, quantity)"
+            " values ('r', 'p', 4)"
+        )
+        con.commit()
+    db.close_database()
+
+    db = Database(database_name, migrations_dir=os.path.abspath(MIGRATIONS_DIR_TEST))
+    db.migrate()
+    with db.get_pool().connection() as con:
+        res = con.execute("select price, total from products_in_receipts")
+        assert res.fetchall() == [(1.5, 6.0)]
+
+    db.close_database()
@@ -0,0 +1,98 @@
+from pathlib import Path
+from threading import Thread
+from time import sleep
+
+import pytest
+
+from infra.sqlite.connection_pool import ConnectionPool
+from infra.sqlite.profiles import PROFILES, get_profile
+
+
+def test_memory_pool_has_single_connection() -> None:
+    pool = ConnectionPool(":memory:", 4)
+
+    assert pool.stats().size == 1
+
+    pool.close()
+
+
+def test_pool_reuses_connections(tmp_path: Path) -> None:
+    pool = ConnectionPool(str(tmp_path / "pos.db"), 2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert pool.stats().checkouts == 2
+    assert pool.stats().waits == 0
+
+    pool.close()
+
+
+def test_pool_rolls_back_unfinished_transaction(tmp_path: Path) -> None:
+    pool = ConnectionPool(str(tmp_path / "pos.db"), 1)
+    with pool.connection() as con:
+        con.execute("create table items (id integer)")
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as con:
+            con.execute("insert into items values (1)")
+            raise RuntimeError()
+
+    with pool.connection() as con:
+        assert not con.in_transaction
+        assert con.execute("select count(*) from items").fetchone() == (0,)
+
+    pool.close()
+
+
+def test_pool_records_wait_time(tmp_path: Path) -> None:
+    pool = ConnectionPool(str(tmp_path / "pos.db"), 1)
+
+    def hold_connection() -> None:
+        with pool.connection():
+            sleep(0.05)
+
+    threads = [Thread(target=hold_connection) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert stats.checkouts == 3
+    assert stats.waits >= 1
+    assert stats.max_wait_time > 0
+    assert stats.wait_time >= stats.max_wait_time
+
+    pool.close()
+
+
+@pytest.mark.parametrize("name", PROFILES)
+def test_pool_applies_performance_profile(tmp_path: Path, name: str) -> None:
+    profile = PROFILES[name]
+    pool = ConnectionPool(str(tmp_path / "pos.db"), 2, profile)
+
+    with pool.connection() as con:
+        assert con.execute("PRAGMA journal_mode").fetchone() == (profile.journal_mode,)
+        assert con.execute("PRAGMA cache_size").fetchone() == (profile.cache_size,)
+        assert con.execute("PRAGMA busy_timeout").fetchone() == (profile.busy_timeout,)
+
+    pool.close()
+
+
+def test_fast_profile_disables_sync(tmp_path: Path) -> None:
+    pool = ConnectionPool(str(tmp_path / "pos.db"), 1, PROFILES["fast"])
+
+    with pool.connection() as con:
+        assert con.execute("PRAGMA synchronous").fetchone() == (0,)
+        assert con.execute("PRAGMA temp_store").fetchone() == (2,)
+
+    pool.close()
+
+
+def test_unknown_profile_lists_valid_names() -> None:
+    with pytest.raises(ValueError, match="durable, balanced, fast"):
+        get_profile("durabel")
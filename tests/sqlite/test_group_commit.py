@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
+from uuid import uuid4
+
+import pytest
+
+from core.errors import AlreadyExistError, DoesNotExistError
+from core.product import Product
+from core.receipt import Receipt
+from core.unit import Unit
+from infra.constants import MIGRATIONS_DIR_TEST, SQL_FILE_TEST
+from infra.sqlite.database_connect import Database
+from infra.sqlite.group_commit import GroupCommitter
+from infra.sqlite.products import ProductsDatabase
+from infra.sqlite.receipts import ReceiptsDatabase
+from infra.sqlite.units import UnitsDatabase
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Database:
+    db = Database(
+        str(tmp_path / "pos.db"),
+        os.path.abspath(SQL_FILE_TEST),
+        os.path.abspath(MIGRATIONS_DIR_TEST),
+        pool_size=4,
+    )
+    db.initial()
+    return db
+
+
+def create_concurrently(units: UnitsDatabase, names: list[str]) -> list[bool]:
+    barrier = Barrier(len(names))
+
+    def create(name: str) -> bool:
+        barrier.wait()
+        try:
+            units.create(Unit(name))
+        except AlreadyExistError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(len(names)) as pool:
+        return list(pool.map(create, names))
+
+
+def test_concurrent_writes_share_a_commit(db: Database) -> None:
+    committer = GroupCommitter(db.get_pool(), window=0.2)
+    units = UnitsDatabase(db.get_pool(), committer)
+
+    created = create_concurrently(units, [f"unit-{i}" for i in range(8)])
+
+    assert all(created)
+    assert len(UnitsDatabase(db.get_pool()).read_all()) == 8
+    stats = committer.stats()
+    assert stats.operations == 8
+    assert stats.commits < 8
+    assert stats.largest_batch > 1
+    assert stats.mean_batch_size == 8 / stats.commits
+
+    committer.close()
+    db.close_database()
+
+
+def test_failed_write_does_not_roll_back_its_group(db: Database) -> None:
+    committer = GroupCommitter(db.get_pool(), window=0.2)
+    units = UnitsDatabase(db.get_pool(), committer)
+
+    created = create_concurrently(units, ["kg", "kg", "pcs", "l"])
+
+    assert sorted(created) == [False, True, True, True]
+    names = {unit.name for unit in UnitsDatabase(db.get_pool()).read_all()}
+    assert names == {"kg", "pcs", "l"}
+
+    committer.close()
+    db.close_database()
+
+
+def test_group_is_capped_by_batch_size(db: Database) -> None:
+    committer = GroupCommitter(db.get_pool(), window=0.2, batch_size=2)
+    units = UnitsDatabase(db.get_pool(), committer)
+
+    create_concurrently(units, [f"unit-{i}" for i in range(6)])
+
+    stats = committer.stats()
+    assert stats.operations == 6
+    assert stats.largest_batch <= 2
+    assert stats.commits >= 3
+
+    committer.close()
+    db.close_database()
+
+
+def test_receipt_writes_through_committer(db: Database) -> None:
+    committer = GroupCommitter(db.get_pool(), window=0)
+    units = UnitsDatabase(db.get_pool(), committer)
+    products = ProductsDatabase(db.get_pool(), committer)
+    receipts = ReceiptsDatabase(db.get_pool(), committer)
+    unit = Unit("kg")
+    units.create(unit)
+    product = Product(unit.id, "Apple", "123", 2.5)
+    products.create(product)
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    with pytest.raises(DoesNotExistError):
+        receipts.add_products(receipt.id, [(product.id, 1), (uuid4(), 1)])
+    added = receipts.add_product(receipt.id, product.id, 2)
+    receipts.update_status(receipt.id, "closed")
+
+    assert len(added.products) == 1
+    assert added.total == 5
+    assert receipts.read(receipt.id).status == "closed"
+    assert committer.stats().operations == 6
+
+    committer.close()
+    db.close_database()
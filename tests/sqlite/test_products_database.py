@@ -3,7 +3,7 @@ from uuid import uuid4
 
 import pytest
 
-from core.errors import AlreadyExistError, DoesNotExistError
+from core.errors import AlreadyExistError, DoesNotExistError, InvalidValueError
 from core.product import Product
 from core.unit import Unit
 from infra.constants import SQL_FILE_TEST
@@ -20,11 +20,11 @@ def db() -> Database:
 
 
 def test_create_product(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
     product = Product(unit.id, "Apple", "123456789", 1.5)
     products.create(product)
 
@@ -32,11 +32,11 @@ def test_create_product(db: Database) -> None:
 
 
 def test_create_same_product_twice(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
     product = Product(unit.id, "Apple", "123456789", 1.5)
     products.create(product)
 
@@ -47,7 +47,7 @@ def test_create_same_product_twice(db: Database) -> None:
 
 
 def test_create_product_with_unknown_unit(db: Database) -> None:
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
     product = Product(uuid4(), "Apple", "123456789", 1.5)
 
     with pytest.raises(DoesNotExistError):
@@ -57,11 +57,11 @@ def test_create_product_with_unknown_unit(db: Database) -> None:
 
 
 def test_read_product(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
     product = Product(unit.id, "Apple", "123456789", 1.5)
     products.create(product)
 
@@ -72,18 +72,41 @@ def test_read_product(db: Database) -> None:
 
 
 def test_read_unknown_product(db: Database) -> None:
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         products.read(uuid4())
 
 
+def test_read_product_by_barcode(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsDatabase(db.get_pool())
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    assert products.read_by_barcode("123456789") == product
+
+    db.close_database()
+
+
+def test_read_product_by_unknown_barcode(db: Database) -> None:
+    products = ProductsDatabase(db.get_pool())
+
+    with pytest.raises(DoesNotExistError):
+        products.read_by_barcode("123456789")
+
+    db.close_database()
+
+
 def test_read_all_product(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
     product = Product(unit.id, "Apple", "123456789", 1.5)
     products.create(product)
 
@@ -93,11 +116,11 @@ def test_read_all_product(db: Database) -> None:
 
 
 def test_update_product_price(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    products = ProductsDatabase(db.get_pool())
     product = Product(unit.id, "Apple", "123456789", 1.5)
     products.create(product)
 
@@ -110,10 +133,113 @@ def test_update_product_price(db: Database) -> None:
 
 
 def test_update_unknown_product_price(db: Database) -> None:
-    UnitsDatabase(db.get_connection(), db.get_cursor())
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
+    UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         products.update_price(uuid4(), 20)
 
     db.close_database()
+
+
+def test_create_many_products(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsDatabase(db.get_pool())
+    existing = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(existing)
+
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    batch = [
+        pear,
+        Product(unit.id, "Apple", "123456789", 1.5),
+        Product(unit.id, "Pear", "987654321", 2),
+        Product(uuid4(), "Plum", "555", 3),
+    ]
+    errors = products.create_many(batch)
+
+    assert errors[0] is None
+    assert isinstance(errors[1], AlreadyExistError)
+    assert isinstance(errors[2], AlreadyExistError)
+    assert isinstance(errors[3], DoesNotExistError)
+    assert products.read_all() == [existing, pear]
+
+    db.close_database()
+
+
+def test_create_many_rejects_non_positive_prices(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsDatabase(db.get_pool())
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    errors = products.create_many(
+        [
+            Product(unit.id, "Free", "1", 0),
+            pear,
+            Product(unit.id, "Refund", "2", -1.5),
+        ]
+    )
+
+    assert isinstance(errors[0], InvalidValueError)
+    assert errors[1] is None
+    assert isinstance(errors[2], InvalidValueError)
+    assert products.read_all() == [pear]
+
+    db.close_database()
+
+
+def test_read_page_of_products(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsDatabase(db.get_pool())
+    for barcode in ["1", "2", "3"]:
+        products.create(Product(unit.id, "Apple", barcode, 1.5))
+    ordered = sorted(products.read_all(), key=lambda product: product.id)
+
+    assert products.read_page(2) == ordered[:2]
+    assert products.read_page(2, ordered[1].id) == ordered[2:]
+    assert products.read_page(2, ordered[2].id) == []
+
+    db.close_database()
+
+
+def test_iterate_products(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+
+    products = ProductsDatabase(db.get_pool())
+    products.create_many(
+        [Product(unit.id, "Apple", str(barcode), 1.5) for barcode in range(1200)]
+    )
+
+    assert list(products.iterate()) == sorted(
+        products.read_all(), key=lambda product: product.id
+    )
+
+    db.close_database()
+
+
+def test_version_bumps_on_catalog_changes(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+    products = ProductsDatabase(db.get_pool())
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+
+    initial = products.version()
+    products.create(product)
+    created = products.version()
+    products.update_price(product.id, 2.5)
+    updated = products.version()
+    products.read(product.id)
+
+    assert initial < created < updated == products.version()
+
+    db.close_database()
@@ -1,18 +1,23 @@
 import os
+import re
+from sqlite3 import Connection
+from typing import Callable, TypeVar
 from uuid import uuid4
 
 import pytest
 
-from core.errors import ClosedReceiptError, DoesNotExistError
+from core.errors import ClosedReceiptError, DoesNotExistError, InvalidValueError
 from core.product import Product
 from core.receipt import Receipt
 from core.unit import Unit
-from infra.constants import SQL_FILE_TEST
+from infra.constants import ITERATE_BATCH_SIZE, SQL_FILE_TEST
 from infra.sqlite.database_connect import Database
 from infra.sqlite.products import ProductsDatabase
 from infra.sqlite.receipts import ReceiptsDatabase
 from infra.sqlite.units import UnitsDatabase
 
+T = TypeVar("T")
+
 
 @pytest.fixture
 def db() -> Database:
@@ -22,7 +27,7 @@ def db() -> Database:
 
 
 def test_create_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -31,9 +36,9 @@ def test_create_receipt(db: Database) -> None:
 
 
 def test_add_product_in_receipt(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -55,7 +60,7 @@ def test_add_product_in_receipt(db: Database) -> None:
 
 
 def test_add_unknown_product(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -67,7 +72,7 @@ def test_add_unknown_product(db: Database) -> None:
 
 
 def test_add_product_unknown_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         receipts.add_product(uuid4(), uuid4(), 10)
@@ -76,7 +81,7 @@ def test_add_product_unknown_receipt(db: Database) -> None:
 
 
 def test_read_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -87,7 +92,7 @@ def test_read_receipt(db: Database) -> None:
 
 
 def test_read_unknown_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         receipts.read(uuid4())
@@ -96,7 +101,7 @@ def test_read_unknown_receipt(db: Database) -> None:
 
 
 def test_update_status_of_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -108,7 +113,7 @@ def test_update_status_of_receipt(db: Database) -> None:
 
 
 def test_update_status_of_unknown_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         receipts.update_status(uuid4(), "closed")
@@ -117,7 +122,7 @@ def test_update_status_of_unknown_receipt(db: Database) -> None:
 
 
 def test_delete_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -130,7 +135,7 @@ def test_delete_receipt(db: Database) -> None:
 
 
 def test_delete_unknown_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         receipts.delete(uuid4())
@@ -139,7 +144,7 @@ def test_delete_unknown_receipt(db: Database) -> None:
 
 
 def test_delete_closed_receipt(db: Database) -> None:
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -151,10 +156,33 @@ def test_delete_closed_receipt(db: Database) -> None:
     db.close_database()
 
 
+def test_delete_checks_status_inside_its_write(
+    db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    receipts = ReceiptsDatabase(db.get_pool())
+    other_worker = ReceiptsDatabase(db.get_pool())
+
+    receipt = Receipt()
+    receipts.create(receipt)
+    write = receipts._write
+
+    def close_then_write(operation: Callable[[Connection], T]) -> T:
+        other_worker.update_status(receipt.id, "closed")
+        return write(operation)
+
+    monkeypatch.setattr(receipts, "_write", close_then_write)
+
+    with pytest.raises(ClosedReceiptError):
+        receipts.delete(receipt.id)
+    assert other_worker.read(receipt.id).status == "closed"
+
+    db.close_database()
+
+
 def test_read_sales(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
-    products = ProductsDatabase(db.get_connection(), db.get_cursor())
-    receipts = ReceiptsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
 
     receipt = Receipt()
     receipts.create(receipt)
@@ -170,3 +198,254 @@ def test_read_sales(db: Database) -> None:
 
     assert receipts.read_sales().n_receipts == 1
     assert receipts.read_sales().revenue == 7.5
+
+
+def test_read_sales_counts_only_closed_receipts(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    products.create(apple)
+    products.create(pear)
+
+    closed = Receipt()
+    empty = Receipt()
+    opened = Receipt()
+    for receipt in (closed, empty, opened):
+        receipts.create(receipt)
+
+    receipts.add_product(closed.id, apple.id, 5)
+    receipts.add_product(closed.id, pear.id, 2)
+    receipts.add_product(opened.id, pear.id, 3)
+    receipts.update_status(closed.id, "closed")
+    receipts.update_status(empty.id, "closed")
+
+    assert receipts.read_sales().n_receipts == 2
+    assert receipts.read_sales().revenue == 11.5
+
+    db.close_database()
+
+
+def test_read_receipt_with_single_query(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    products.create(apple)
+    products.create(pear)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+    receipts.add_product(receipt.id, apple.id, 5)
+    receipts.add_product(receipt.id, pear.id, 2)
+    receipts.add_product(receipt.id, apple.id, 1)
+
+    statements: list[str] = []
+    with db.get_pool().connection() as con:
+        con.set_trace_callback(statements.append)
+    result_receipt = receipts.read(receipt.id)
+    with db.get_pool().connection() as con:
+        con.set_trace_callback(None)
+
+    assert len(statements) == 1
+    assert [product.id for product in result_receipt.products] == [
+        apple.id,
+        pear.id,
+        apple.id,
+    ]
+    assert result_receipt.total == 13
+
+    db.close_database()
+
+
+def test_delete_receipt_with_products(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+    receipts.add_product(receipt.id, product.id, 5)
+    receipts.delete(receipt.id)
+
+    with pytest.raises(DoesNotExistError):
+        receipts.read(receipt.id)
+
+    with db.get_pool().connection() as con:
+        res = con.execute("select count(*) from products_in_receipts")
+        assert res.fetchone() == (0,)
+
+    db.close_database()
+
+
+def test_add_products_in_receipt(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    pear = Product(unit.id, "Pear", "987654321", 2)
+    products.create(apple)
+    products.create(pear)
+
+    result_receipt = receipts.add_products(receipt.id, [(apple.id, 5), (pear.id, 2)])
+
+    assert [product.id for product in result_receipt.products] == [apple.id, pear.id]
+    assert result_receipt.total == 11.5
+
+    db.close_database()
+
+
+def test_add_products_with_unknown_product(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(apple)
+
+    with pytest.raises(DoesNotExistError):
+        receipts.add_products(receipt.id, [(apple.id, 5), (uuid4(), 2)])
+
+    assert receipts.read(receipt.id).products == []
+
+    db.close_database()
+
+
+def test_add_products_with_non_positive_quantity(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    receipt = Receipt()
+    receipts.create(receipt)
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    apple = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(apple)
+
+    with pytest.raises(InvalidValueError):
+        receipts.add_products(receipt.id, [(apple.id, 2), (apple.id, 0)])
+
+    assert receipts.read(receipt.id).products == []
+
+    db.close_database()
+
+
+def test_receipt_keeps_price_at_time_of_sale(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    receipt = Receipt()
+    receipts.create(receipt)
+    receipts.add_product(receipt.id, product.id, 5)
+    receipts.update_status(receipt.id, "closed")
+    products.update_price(product.id, 2.5)
+
+    statements: list[str] = []
+    with db.get_pool().connection() as con:
+        con.set_trace_callback(statements.append)
+    result_receipt = receipts.read(receipt.id)
+    sales = receipts.read_sales()
+    with db.get_pool().connection() as con:
+        con.set_trace_callback(None)
+
+    assert result_receipt.products[0].price == 1.5
+    assert result_receipt.total == 7.5
+    assert sales.revenue == 7.5
+    assert not any(re.search(r"\bproducts\b", sql) for sql in statements)
+
+    db.close_database()
+
+
+def test_iterate_receipts(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    unit = Unit("kg")
+    units.create(unit)
+
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    created = [Receipt() for _ in range(3)]
+    for receipt in created:
+        receipts.create(receipt)
+    receipts.add_products(created[0].id, [(product.id, 1), (product.id, 2)])
+    receipts.add_product(created[2].id, product.id, 4)
+
+    expected = sorted(
+        (receipts.read(receipt.id) for receipt in created),
+        key=lambda receipt: str(receipt.id),
+    )
+    assert list(receipts.iterate()) == expected
+
+    db.close_database()
+
+
+def test_iterate_receipts_releases_connection_between_pages(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    products = ProductsDatabase(db.get_pool())
+    receipts = ReceiptsDatabase(db.get_pool())
+
+    unit = Unit("kg")
+    units.create(unit)
+    product = Product(unit.id, "Apple", "123456789", 1.5)
+    products.create(product)
+
+    created = [Receipt() for _ in range(ITERATE_BATCH_SIZE + 2)]
+    for receipt in created:
+        receipts.create(receipt)
+        receipts.add_products(receipt.id, [(product.id, 1), (product.id, 2)])
+
+    iterated = []
+    for receipt in receipts.iterate():
+        receipts.update_status(receipt.id, "closed")
+        iterated.append(receipt)
+
+    assert len(iterated) == len(created)
+    assert [receipt.id for receipt in iterated] == sorted(
+        (receipt.id for receipt in created), key=str
+    )
+    assert all(receipt.total == 4.5 for receipt in iterated)
+    assert receipts.read_sales().n_receipts == len(created)
+
+    db.close_database()
@@ -18,14 +18,14 @@ def db() -> Database:
 
 
 def test_insert_unit(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
     db.close_database()
 
 
 def test_create_same_unit_twice(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
@@ -35,7 +35,7 @@ def test_create_same_unit_twice(db: Database) -> None:
 
 
 def test_read_unit(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
     assert units.read(unit.id) == unit
@@ -43,7 +43,7 @@ def test_read_unit(db: Database) -> None:
 
 
 def test_read_unknown_unit(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
 
     with pytest.raises(DoesNotExistError):
         units.read(uuid4())
@@ -51,11 +51,50 @@ def test_read_unknown_unit(db: Database) -> None:
     db.close_database()
 
 
+def test_read_unit_by_name(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    unit = Unit("kg")
+    units.create(unit)
+    assert units.read_by_name("kg") == unit
+    db.close_database()
+
+
+def test_read_unit_by_unknown_name(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+
+    with pytest.raises(DoesNotExistError):
+        units.read_by_name("kg")
+
+    db.close_database()
+
+
 def test_read_all_unit_in_memory(db: Database) -> None:
-    units = UnitsDatabase(db.get_connection(), db.get_cursor())
+    units = UnitsDatabase(db.get_pool())
     unit = Unit("kg")
     units.create(unit)
 
     assert units.read_all() == [unit]
 
     db.close_database()
+
+
+def test_read_page_of_units(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+    for name in ["kg", "pcs", "l"]:
+        units.create(Unit(name))
+    ordered = sorted(units.read_all(), key=lambda unit: unit.id)
+
+    assert units.read_page(2) == ordered[:2]
+    assert units.read_page(2, ordered[1].id) == ordered[2:]
+
+    db.close_database()
+
+
+def test_version_bumps_on_create(db: Database) -> None:
+    units = UnitsDatabase(db.get_pool())
+
+    initial = units.version()
+    units.create(Unit("kg"))
+
+    assert units.version() > initial
+    db.close_database()